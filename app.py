@@ -4,16 +4,23 @@ Main Streamlit application for Blog to Podcast Platform.
 
 import streamlit as st
 import os
-from config import APP_NAME, APP_VERSION, SHOW_LEGAL_DISCLAIMER
+import shutil
+import time
+from config import (
+    APP_NAME, APP_VERSION, SHOW_LEGAL_DISCLAIMER, ENABLE_JOB_QUEUE, JOB_POLL_SECONDS,
+    ENABLE_BATCH_PROCESSING
+)
 from blog_fetcher import fetch_blog_content, fetch_from_text
-from podcast_generator import generate_podcast
+from podcast_generator import generate_podcast, get_cached_podcast, stream_podcast
 from audio_processor import get_audio_duration
 from ui_components import (
     create_sidebar_settings, display_result_card, display_attribution,
     display_legal_disclaimer, display_error_message, display_success_message,
-    display_warning_message, display_loading_spinner
+    display_warning_message, display_loading_spinner, display_generation_progress
 )
 from legal_compliance import apply_excerpt_limits, get_legal_disclaimer
+from job_queue import JobQueue, DONE, FAILED, QUEUED, CANCELLED
+from batch import run_batch
 
 # Page configuration
 st.set_page_config(
@@ -53,6 +60,76 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Job queue shared by every session of this app process."""
+    return JobQueue()
+
+def enqueue_podcast_job(blog_url, blog_text, settings: dict) -> str:
+    """Queue fetching and generating a podcast for the worker processes."""
+    return get_job_queue().enqueue({
+        'url': blog_url,
+        'text': blog_text,
+        'language': settings['language'],
+        'speed': settings['voice_speed'],
+        'audio_format': settings['audio_format'],
+        'quality': settings['quality'],
+        'tts_backend': settings['tts_backend']
+    })
+
+def poll_podcast_job():
+    """Show the state of the session's queued job, and its podcast once it is done."""
+    job = get_job_queue().status(st.session_state['job_id'])
+    if job is None:
+        del st.session_state['job_id']
+        return
+    
+    if job['status'] == DONE:
+        del st.session_state['job_id']
+        result = job['result']
+        st.session_state['blog_content'] = result['content']
+        st.session_state['blog_metadata'] = result['metadata']
+        st.session_state['podcast_path'] = result['podcast_path']
+        st.rerun()
+    elif job['status'] == FAILED:
+        del st.session_state['job_id']
+        display_error_message(Exception(job['error']), "Podcast Generation")
+    elif job['status'] == CANCELLED:
+        del st.session_state['job_id']
+        display_warning_message("Podcast generation cancelled.")
+    else:
+        message = "Waiting for a worker..." if job['status'] == QUEUED else "🎙️ Generating podcast..."
+        st.progress(job['progress'], text=message)
+        if st.button("✖ Cancel"):
+            get_job_queue().cancel(job['id'])
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+def run_batch_conversion(urls: list, settings: dict):
+    """Convert a list of URLs with the batch engine and show the outcome of each."""
+    bar = st.progress(0.0, text=f"Converting {len(urls)} posts...")
+    finished = []
+    
+    def on_result(entry):
+        finished.append(entry)
+        bar.progress(len(finished) / len(urls), text=f"Converted {len(finished)} of {len(urls)} posts")
+    
+    summary = run_batch(
+        urls,
+        language=settings['language'],
+        speed=settings['voice_speed'],
+        audio_format=settings['audio_format'],
+        quality=settings['quality'],
+        tts_backend=settings['tts_backend'],
+        on_result=on_result
+    )
+    bar.progress(1.0, text="Done")
+    display_success_message(f"{summary[DONE]} converted, {summary[FAILED]} failed, "
+                            f"{summary['skipped']} already converted")
+    if finished:
+        st.dataframe([{'URL': e['url'], 'Status': e['status'], 'Podcast': e['podcast_path'] or e['error']}
+                      for e in finished])
+
 def main_page():
     """Main application page."""
     st.markdown(f'<p class="main-header">🎙️ {APP_NAME}</p>', unsafe_allow_html=True)
@@ -64,11 +141,20 @@ def main_page():
         st.header("📝 Input Options")
         input_method = st.radio(
             "Choose input method:",
-            ["URL", "Paste Text"],
+            ["URL", "Paste Text"] + (["Batch URLs"] if ENABLE_BATCH_PROCESSING else []),
             help="Select how you want to provide the blog content"
         )
         
-        if input_method == "URL":
+        batch_urls = []
+        if input_method == "Batch URLs":
+            blog_url = None
+            blog_text = None
+            batch_urls = [line.strip() for line in st.text_area(
+                "Blog URLs (one per line):",
+                height=200,
+                help="Posts already converted with the same settings are skipped"
+            ).splitlines() if line.strip()]
+        elif input_method == "URL":
             blog_url = st.text_input(
                 "Enter Forrester Blog URL:",
                 placeholder="https://www.forrester.com/blog/...",
@@ -99,7 +185,12 @@ def main_page():
         st.header("📄 Blog Content")
         
         if st.button("🚀 Generate Podcast", type="primary"):
-            if (input_method == "URL" and blog_url) or (input_method == "Paste Text" and blog_text):
+            if batch_urls:
+                run_batch_conversion(batch_urls, settings)
+            elif ENABLE_JOB_QUEUE and ((input_method == "URL" and blog_url) or (input_method == "Paste Text" and blog_text)):
+                # Workers fetch and generate; this session only polls for the result
+                st.session_state['job_id'] = enqueue_podcast_job(blog_url, blog_text, settings)
+            elif (input_method == "URL" and blog_url) or (input_method == "Paste Text" and blog_text):
                 try:
                     # Fetch or use blog content
                     with display_loading_spinner("Processing your blog post..."):
@@ -123,23 +214,67 @@ def main_page():
                     st.session_state['blog_content'] = content
                     st.session_state['blog_metadata'] = metadata
                     
-                    # Generate podcast
-                    with display_loading_spinner("🎙️ Generating podcast..."):
-                        podcast_path = generate_podcast(
-                            content,
-                            language=settings['language'],
-                            speed=settings['voice_speed'],
-                            title=metadata.get('title'),
-                            author=metadata.get('author')
-                        )
+                    # Reuse a finished podcast for this content and settings if there is one
+                    podcast_path = get_cached_podcast(
+                        content,
+                        language=settings['language'],
+                        speed=settings['voice_speed'],
+                        title=metadata.get('title'),
+                        author=metadata.get('author'),
+                        metadata=metadata,
+                        audio_format=settings['audio_format'],
+                        quality=settings['quality'],
+                        tts_backend=settings['tts_backend']
+                    )
+                    
+                    # Opus is encoded in one pass over the whole podcast
+                    if not podcast_path and settings['audio_format'] != 'mp3':
+                        progress = display_generation_progress()
+                        with display_loading_spinner("🎙️ Generating podcast..."):
+                            podcast_path = generate_podcast(
+                                content,
+                                language=settings['language'],
+                                speed=settings['voice_speed'],
+                                title=metadata.get('title'),
+                                author=metadata.get('author'),
+                                metadata=metadata,
+                                audio_format=settings['audio_format'],
+                                quality=settings['quality'],
+                                progress=progress,
+                                tts_backend=settings['tts_backend']
+                            )
+                    # Generate podcast, playing the first part as soon as it is ready
+                    elif not podcast_path:
+                        preview = col2.empty()
+                        progress = display_generation_progress()
+                        # Any click reruns the script, which closes the stream and drops pending TTS calls
+                        st.button("✖ Cancel")
+                        with display_loading_spinner("🎙️ Generating podcast..."):
+                            for part in stream_podcast(
+                                content,
+                                language=settings['language'],
+                                speed=settings['voice_speed'],
+                                title=metadata.get('title'),
+                                author=metadata.get('author'),
+                                metadata=metadata,
+                                quality=settings['quality'],
+                                progress=progress,
+                                tts_backend=settings['tts_backend']
+                            ):
+                                if part['path'] and not podcast_path:
+                                    with open(part['path'], 'rb') as f:
+                                        preview.audio(f.read(), format='audio/mp3')
+                                if part['path']:
+                                    podcast_path = part['output_path']
+                        preview.empty()
                     
                     if podcast_path and os.path.exists(podcast_path):
                         st.session_state['podcast_path'] = podcast_path
                         audio_duration = get_audio_duration(podcast_path)
                         display_success_message(f"Podcast generated successfully (Duration: {audio_duration:.1f}s)")
-                        # Check if this might be a partial podcast (merge may have failed)
-                        if len(content) > 4500:
-                            st.info("ℹ️ **Note**: For long content, installing ffmpeg may be required for full audio merging. Install with: `brew install ffmpeg` (macOS) or `apt-get install ffmpeg` (Linux)")
+                        # Chunks are merged without ffmpeg, but speed and volume processing need it
+                        if not shutil.which("ffmpeg"):
+                            st.info("ℹ️ **Note**: Installing ffmpeg is required for voice speed adjustment and volume normalization. Install with: `brew install ffmpeg` (macOS) or `apt-get install ffmpeg` (Linux)")
                         st.rerun()
                     else:
                         error_msg = "Podcast generation failed. Note: gTTS requires an internet connection."
@@ -158,6 +293,9 @@ def main_page():
             else:
                 display_warning_message("Please provide a blog URL or paste the blog content.")
         
+        if st.session_state.get('job_id'):
+            poll_podcast_job()
+        
         # Display blog content
         if 'blog_content' in st.session_state:
             st.text_area(
@@ -1,27 +1,537 @@
 """
 Audio post-processing utilities.
+
+numpy and pydub are imported by the functions that use them, so importing
+this module (and everything built on it) stays fast.
 """
 
+from __future__ import annotations
+
 import os
+import shutil
+import struct
+import subprocess
 import tempfile
-from typing import Optional
-from pydub import AudioSegment
-from pydub.effects import normalize
+import threading
+import wave
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+import loudness
+from config import AUDIO_BITRATES, AUDIO_FORMAT, AUDIO_QUALITY, TARGET_LOUDNESS_LUFS
+from mp3_frames import concat_mp3_files, read_mp3_info
+from progress import CancellationToken, ProgressCallback, PROCESSING, ENCODING, report
+from id3_tags import chapter_frames, format_recording_date, text_frame, url_frame, write_tag
+
+if TYPE_CHECKING:
+    import numpy as np
+    from pydub import AudioSegment
+
+# Info for files written by AudioPipeline, keyed by file identity, so
+# callers can read duration and format without decoding the file again.
+# Only the most recently written files are kept.
+_KNOWN_INFO_MAX = 256
+_known_info: 'OrderedDict[Tuple[int, int, int, int], dict]' = OrderedDict()
+_known_info_lock = threading.Lock()
+
+def _file_identity(path: str) -> Tuple[int, int, int, int]:
+    """Identify a file's current contents by inode, size and modification time."""
+    stat = os.stat(path)
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def _remember_info(path: str, info: dict) -> None:
+    """Record info for a freshly written audio file."""
+    try:
+        identity = _file_identity(path)
+    except OSError:
+        return
+    with _known_info_lock:
+        _known_info[identity] = info
+        _known_info.move_to_end(identity)
+        while len(_known_info) > _KNOWN_INFO_MAX:
+            _known_info.popitem(last=False)
+
+def _lookup_info(path: str) -> Optional[dict]:
+    """Info recorded for this exact file, if it has not changed since."""
+    try:
+        identity = _file_identity(path)
+    except OSError:
+        return None
+    with _known_info_lock:
+        info = _known_info.get(identity)
+        if info:
+            _known_info.move_to_end(identity)
+    return dict(info) if info else None
+
+def _read_header_info(path: str) -> Optional[dict]:
+    """Audio info from a pipeline record or the MP3 headers, without decoding."""
+    info = _lookup_info(path)
+    if info:
+        return info
+    try:
+        info = read_mp3_info(path)
+    except (OSError, struct.error):
+        return None
+    if info:
+        _remember_info(path, info)
+    return info
+
+class EncodingProfile(NamedTuple):
+    """How finished audio is encoded."""
+    format: str  # 'mp3' or 'opus'
+    quality: str  # 'low', 'medium' or 'high'
+    container: str  # ffmpeg output format
+    codec: str
+    bitrate: str
+    channels: int
+    extension: str
+    
+    @property
+    def id(self) -> str:
+        """Short identifier used in cache keys."""
+        return f"{self.format}-{self.quality}"
+
+_CODECS = {
+    'mp3': ('mp3', 'libmp3lame', 'mp3'),
+    'opus': ('ogg', 'libopus', 'ogg')
+}
+
+def get_encoding_profile(audio_format: str = AUDIO_FORMAT,
+                         quality: str = AUDIO_QUALITY) -> EncodingProfile:
+    """
+    Speech encoding profile for an output format and quality.
+    
+    Speech needs neither stereo nor music bitrates: every profile is mono,
+    at the bitrate configured in AUDIO_BITRATES.
+    
+    Raises:
+        ValueError: If the format or quality is not configured
+    """
+    if audio_format not in _CODECS or quality not in AUDIO_BITRATES.get(audio_format, {}):
+        raise ValueError(f"Unsupported audio format or quality: {audio_format}/{quality}")
+    container, codec, extension = _CODECS[audio_format]
+    return EncodingProfile(audio_format, quality, container, codec,
+                           f"{AUDIO_BITRATES[audio_format][quality]}k", 1, extension)
+
+def ffmpeg_available() -> bool:
+    """Whether pydub can find ffmpeg to decode and encode MP3."""
+    from pydub import AudioSegment
+    return shutil.which(AudioSegment.converter) is not None
+
+def _to_samples(audio: AudioSegment) -> np.ndarray:
+    """Decoded PCM of a segment as a float32 array of shape (frames, channels)."""
+    import numpy as np
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    return samples.reshape(-1, audio.channels)
 
-def normalize_audio(audio_path: str, output_path: Optional[str] = None) -> str:
+def _from_samples(audio: AudioSegment, samples: np.ndarray) -> AudioSegment:
+    """Build a segment in the format of `audio` from a float32 sample array."""
+    import numpy as np
+    dtype = _PCM_DTYPES[audio.sample_width]
+    limit = float(np.iinfo(dtype).max)
+    clipped = np.clip(np.round(samples), -limit - 1, limit)
+    return audio._spawn(clipped.astype(dtype).tobytes())
+
+def time_stretch(samples: np.ndarray, speed_factor: float, frame_rate: int,
+                 frame_ms: float = 40.0, tolerance_ms: float = 10.0) -> np.ndarray:
     """
-    Normalize audio volume.
+    Change the tempo of PCM audio without changing its pitch (WSOLA).
+    
+    Overlapping Hann-windowed frames are read from the input at the new
+    tempo; each frame is shifted by up to `tolerance_ms` to the position
+    most similar to the natural continuation of the previous frame, so the
+    waveforms line up when they are overlap-added. The similarity search
+    runs on a decimated copy of the signal and the overlap-add is fully
+    vectorized.
+    
+    Args:
+        samples: Float PCM samples of shape (frames,) or (frames, channels)
+        speed_factor: Tempo multiplier (0.5 to 2.0); 2.0 halves the duration
+        frame_rate: Sample rate in Hz
+        frame_ms: Analysis frame length in milliseconds
+        tolerance_ms: Maximum alignment shift in milliseconds
+        
+    Returns:
+        Stretched samples with the same number of dimensions as the input
+    """
+    import numpy as np
+    mono_input = samples.ndim == 1
+    x = samples.reshape(len(samples), -1).astype(np.float32, copy=False)
+    n_input = len(x)
+    if speed_factor == 1.0 or n_input == 0:
+        return samples
+    
+    frame_length = max(4, int(frame_rate * frame_ms / 1000) // 2 * 2)
+    synthesis_hop = frame_length // 2
+    analysis_hop = synthesis_hop * speed_factor
+    tolerance = max(1, int(frame_rate * tolerance_ms / 1000))
+    
+    output_length = int(round(n_input / speed_factor))
+    n_frames = output_length // synthesis_hop + 2
+    
+    # Pad so every frame (and its search window) stays inside the signal;
+    # frame k is centered on input sample k * analysis_hop
+    front = tolerance + synthesis_hop
+    back = frame_length + tolerance + int(analysis_hop) + synthesis_hop
+    padded = np.pad(x, ((front, back), (0, 0)))
+    nominal = front - synthesis_hop + np.round(np.arange(n_frames) * analysis_hop).astype(np.int64)
+    
+    # Align on a mono mixdown, decimated to roughly 8 kHz
+    step = max(1, frame_rate // 8000)
+    guide = padded.mean(axis=1)
+    guide_windows = np.lib.stride_tricks.sliding_window_view(guide, frame_length)
+    offsets = np.arange(-tolerance, tolerance + 1, step)
+    
+    positions = nominal.copy()
+    for k in range(1, n_frames):
+        reference = guide[positions[k - 1] + synthesis_hop:
+                          positions[k - 1] + synthesis_hop + frame_length:step]
+        candidates = guide_windows[nominal[k] + offsets, ::step]
+        positions[k] = nominal[k] + offsets[np.argmax(candidates @ reference)]
+    
+    # Overlap-add windowed frames at the synthesis hop (periodic Hann sums to one)
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame_length) / frame_length)).astype(np.float32)
+    frames = padded[positions[:, None] + np.arange(frame_length)] * window[None, :, None]
+    channels = x.shape[1]
+    output = np.zeros(((n_frames + 1) * synthesis_hop, channels), dtype=np.float32)
+    output[:n_frames * synthesis_hop] += frames[:, :synthesis_hop].reshape(-1, channels)
+    output[synthesis_hop:(n_frames + 1) * synthesis_hop] += frames[:, synthesis_hop:].reshape(-1, channels)
+    
+    # Frame 0 starts half a frame before the first input sample
+    output = output[synthesis_hop:synthesis_hop + output_length]
+    return output[:, 0] if mono_input else output
+
+def _change_speed(audio: AudioSegment, speed_factor: float) -> AudioSegment:
+    """Change playback speed while keeping the pitch."""
+    stretched = time_stretch(_to_samples(audio), speed_factor, audio.frame_rate)
+    return _from_samples(audio, stretched)
+
+def measure_loudness(audio: AudioSegment) -> dict:
+    """Loudness statistics of a decoded segment (see loudness.measure_chunk)."""
+    return loudness.measure_chunk(_to_samples(audio), audio.frame_rate, audio.sample_width)
+
+def _apply_loudness_gain(audio: AudioSegment, stats: dict, target_lufs: float) -> AudioSegment:
+    """Apply the gain that brings audio with these statistics to the target loudness."""
+    gain_db = loudness.normalization_gain(stats, target_lufs)
+    if gain_db is None or abs(gain_db) < 0.05:
+        return audio
+    return audio.apply_gain(gain_db)
+
+def _concatenate(segments: List[AudioSegment], gap_ms: int = 500) -> AudioSegment:
+    """Join segments with a silent gap between them in a single copy."""
+    from pydub import AudioSegment
+    first = segments[0]
+    parts = []
+    silence = AudioSegment.silent(duration=gap_ms, frame_rate=first.frame_rate)
+    silence = silence.set_channels(first.channels).set_sample_width(first.sample_width)
+    
+    for i, segment in enumerate(segments):
+        # Bring every segment to the format of the first one
+        segment = (segment.set_frame_rate(first.frame_rate)
+                   .set_channels(first.channels)
+                   .set_sample_width(first.sample_width))
+        if i > 0 and gap_ms > 0:
+            parts.append(silence.raw_data)
+        parts.append(segment.raw_data)
+    
+    return first._spawn(b''.join(parts))
+
+def _trim_silence(audio: AudioSegment, silence_thresh: float = -50.0,
+                  chunk_size: int = 10) -> AudioSegment:
+    """Remove silence at the beginning and end of a segment."""
+    from pydub.silence import detect_leading_silence
+    start = detect_leading_silence(audio, silence_threshold=silence_thresh,
+                                   chunk_size=chunk_size)
+    end = detect_leading_silence(audio.reverse(), silence_threshold=silence_thresh,
+                                 chunk_size=chunk_size)
+    if start + end >= len(audio):
+        return audio
+    return audio[start:len(audio) - end]
+
+_PCM_FORMATS = {1: 's8', 2: 's16le', 4: 's32le'}
+_PCM_DTYPES = {1: 'int8', 2: 'int16', 4: 'int32'}
+
+def _iter_pcm_blocks(source, sample_width: int, channels: int, gain_db: float = 0.0,
+                     block_frames: int = 65536):
+    """Read raw PCM from a file object in blocks, applying a gain."""
+    import numpy as np
+    factor = 10 ** (gain_db / 20.0)
+    dtype = _PCM_DTYPES[sample_width]
+    limit = np.iinfo(dtype)
+    while True:
+        block = source.read(block_frames * sample_width * channels)
+        if not block:
+            return
+        if factor != 1.0:
+            samples = np.frombuffer(block, dtype=dtype).astype(np.float32) * factor
+            block = np.clip(np.round(samples), limit.min, limit.max).astype(dtype).tobytes()
+        yield block
+
+def _encode_pcm_stream(source, frame_rate: int, channels: int, sample_width: int,
+                       output_path: str, format: str = "mp3", gain_db: float = 0.0,
+                       profile: Optional[EncodingProfile] = None) -> None:
+    """Encode raw PCM read from a file object without loading it all into memory."""
+    from pydub import AudioSegment
+    blocks = _iter_pcm_blocks(source, sample_width, channels, gain_db)
+    if format == 'wav':
+        with wave.open(output_path, 'wb') as out:
+            out.setnchannels(channels)
+            out.setsampwidth(sample_width)
+            out.setframerate(frame_rate)
+            for block in blocks:
+                out.writeframes(block)
+        return
+    
+    command = [
+        AudioSegment.converter, '-y', '-loglevel', 'error',
+        '-f', _PCM_FORMATS[sample_width], '-ar', str(frame_rate), '-ac', str(channels),
+        '-i', 'pipe:0'
+    ]
+    if profile:
+        command += ['-c:a', profile.codec, '-b:a', profile.bitrate]
+    command += ['-f', format, output_path]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        for block in blocks:
+            process.stdin.write(block)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        raise RuntimeError(f"Encoding failed: {stderr.decode('utf-8', errors='replace').strip()}")
+
+class AudioPipeline:
+    """
+    Merge and post-process audio chunks with a single decode and encode.
+    
+    Each input file is decoded once, the merge, speed, normalize and trim
+    stages run on the decoded audio in the order they were added, and the
+    result is encoded exactly once by run().
+    
+    When every stage can work chunk by chunk (speed, loudness normalization
+    and trimming can; peak normalization cannot), run() streams: each chunk
+    is decoded, processed and appended to a PCM spill file, and the spill
+    file is fed to the encoder in blocks. Peak memory is then one decoded
+    chunk, no matter how many chunks there are.
+    
+    Loudness statistics are measured per chunk while it is decoded (or taken
+    from `chunk_stats` when the caller has them cached) and are available in
+    `chunk_stats` after processing.
+    
+    Example:
+        info = AudioPipeline(chunk_files).speed(1.25).normalize_loudness().run(output_path)
+    """
+    
+    def __init__(self, audio_files: List[str], gap_ms: int = 500,
+                 chunk_stats: Optional[List[Optional[dict]]] = None):
+        self.audio_files = list(audio_files)
+        self.gap_ms = gap_ms
+        self.chunk_stats = list(chunk_stats) if chunk_stats else [None] * len(self.audio_files)
+        self._stages = []
+    
+    def speed(self, speed_factor: float) -> 'AudioPipeline':
+        """Add a speed change stage (0.5 to 2.0)."""
+        if speed_factor != 1.0:
+            self._stages.append(('speed', speed_factor))
+        return self
+    
+    def normalize(self) -> 'AudioPipeline':
+        """Add a peak volume normalization stage."""
+        self._stages.append(('normalize', None))
+        return self
+    
+    def normalize_loudness(self, target_lufs: float = TARGET_LOUDNESS_LUFS) -> 'AudioPipeline':
+        """Add a stage that applies the gain reaching the target integrated loudness."""
+        self._stages.append(('loudness', target_lufs))
+        return self
+    
+    def trim_silence(self, silence_thresh: float = -50.0) -> 'AudioPipeline':
+        """Add a stage that trims leading and trailing silence."""
+        self._stages.append(('trim', silence_thresh))
+        return self
+    
+    @property
+    def can_stream(self) -> bool:
+        """Whether every stage can be applied chunk by chunk."""
+        return all(name != 'normalize' for name, _ in self._stages)
+    
+    def _stage_values(self, name: str) -> list:
+        return [value for stage, value in self._stages if stage == name]
+    
+    def _decode(self, index: int) -> AudioSegment:
+        """Decode one input, measuring its loudness if a loudness stage needs it."""
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(self.audio_files[index])
+        if self._stage_values('loudness') and self.chunk_stats[index] is None:
+            self.chunk_stats[index] = measure_loudness(segment)
+        return segment
+    
+    def _loudness_gain(self) -> float:
+        """Gain in dB from the loudness stage (0 if there is none or the audio is silent)."""
+        targets = self._stage_values('loudness')
+        if not targets:
+            return 0.0
+        gain_db = loudness.normalization_gain(loudness.combine(self.chunk_stats), targets[-1])
+        return gain_db if gain_db is not None and abs(gain_db) >= 0.05 else 0.0
+    
+    def process(self) -> AudioSegment:
+        """Decode and merge the inputs and apply every stage in memory."""
+        from pydub.effects import normalize
+        if not self.audio_files:
+            raise ValueError("No audio files to process")
+        
+        segments = [self._decode(i) for i in range(len(self.audio_files))]
+        audio = _concatenate(segments, self.gap_ms)
+        for name, value in self._stages:
+            if name == 'speed':
+                audio = _change_speed(audio, value)
+            elif name == 'normalize':
+                audio = normalize(audio)
+            elif name == 'loudness':
+                audio = _apply_loudness_gain(audio, loudness.combine(self.chunk_stats), value)
+            elif name == 'trim':
+                audio = _trim_silence(audio, value)
+        return audio
+    
+    def _run_streaming(self, output_path: str, format: str,
+                       profile: Optional[EncodingProfile],
+                       progress: Optional[ProgressCallback],
+                       cancel: Optional[CancellationToken]) -> dict:
+        """Process chunk by chunk through a PCM spill file and encode it in blocks."""
+        from pydub import AudioSegment
+        from pydub.silence import detect_leading_silence
+        speed_factor = 1.0
+        for value in self._stage_values('speed'):
+            speed_factor *= value
+        trim_thresholds = self._stage_values('trim')
+        last = len(self.audio_files) - 1
+        reference = None
+        total_frames = 0
+        
+        with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(output_path))) as spill:
+            for i in range(len(self.audio_files)):
+                if cancel:
+                    cancel.raise_if_cancelled()
+                segment = self._decode(i)
+                if reference is None:
+                    if profile:
+                        segment = segment.set_channels(profile.channels)
+                    reference = segment
+                else:
+                    # Bring every segment to the format of the first one
+                    segment = (segment.set_frame_rate(reference.frame_rate)
+                               .set_channels(reference.channels)
+                               .set_sample_width(reference.sample_width))
+                
+                for threshold in trim_thresholds:
+                    if i == 0:
+                        segment = segment[detect_leading_silence(segment, silence_threshold=threshold):]
+                    if i == last:
+                        end = detect_leading_silence(segment.reverse(), silence_threshold=threshold)
+                        segment = segment[:len(segment) - end]
+                if speed_factor != 1.0:
+                    segment = _change_speed(segment, speed_factor)
+                
+                if i > 0 and self.gap_ms > 0:
+                    # The pause is stretched along with the speech around it
+                    silence = AudioSegment.silent(duration=int(round(self.gap_ms / speed_factor)),
+                                                  frame_rate=reference.frame_rate)
+                    silence = silence.set_channels(reference.channels).set_sample_width(reference.sample_width)
+                    spill.write(silence.raw_data)
+                    total_frames += int(silence.frame_count())
+                spill.write(segment.raw_data)
+                total_frames += int(segment.frame_count())
+                del segment
+                report(progress, PROCESSING, i + 1, len(self.audio_files))
+            
+            if cancel:
+                cancel.raise_if_cancelled()
+            report(progress, ENCODING)
+            spill.seek(0)
+            _encode_pcm_stream(spill, reference.frame_rate, reference.channels,
+                               reference.sample_width, output_path, format,
+                               gain_db=self._loudness_gain(), profile=profile)
+        
+        return {
+            'duration': total_frames / float(reference.frame_rate),
+            'frame_rate': reference.frame_rate,
+            'channels': reference.channels,
+            'sample_width': reference.sample_width,
+            'file_size': os.path.getsize(output_path)
+        }
+    
+    def run(self, output_path: str, format: str = "mp3",
+            streaming: Optional[bool] = None,
+            profile: Optional[EncodingProfile] = None,
+            progress: Optional[ProgressCallback] = None,
+            cancel: Optional[CancellationToken] = None) -> dict:
+        """
+        Run the pipeline and encode the result once.
+        
+        Args:
+            output_path: Path to save the processed audio
+            format: Output container format
+            streaming: Process chunk by chunk with bounded memory (default:
+                whenever the stages allow it)
+            profile: Encoding profile (codec, bitrate and channels); its
+                container replaces `format`
+            progress: Called with 'processing' and 'encoding' progress events
+            cancel: Token checked between chunks and before encoding
+            
+        Returns:
+            Dictionary with audio information (same keys as get_audio_info)
+        """
+        if not self.audio_files:
+            raise ValueError("No audio files to process")
+        if streaming is None:
+            streaming = self.can_stream
+        elif streaming and not self.can_stream:
+            raise ValueError("Peak normalization needs the whole merged audio in memory")
+        
+        if profile:
+            format = profile.container
+        
+        if streaming:
+            info = self._run_streaming(output_path, format, profile, progress, cancel)
+        else:
+            report(progress, PROCESSING, 0)
+            audio = self.process()
+            if cancel:
+                cancel.raise_if_cancelled()
+            report(progress, ENCODING)
+            if profile:
+                audio = audio.set_channels(profile.channels)
+                audio.export(output_path, format=format, codec=profile.codec, bitrate=profile.bitrate)
+            else:
+                audio.export(output_path, format=format)
+            info = {
+                'duration': len(audio) / 1000.0,
+                'frame_rate': audio.frame_rate,
+                'channels': audio.channels,
+                'sample_width': audio.sample_width,
+                'file_size': os.path.getsize(output_path)
+            }
+        _remember_info(output_path, info)
+        return info
+
+def normalize_audio(audio_path: str, output_path: Optional[str] = None,
+                    target_lufs: float = TARGET_LOUDNESS_LUFS) -> str:
+    """
+    Normalize audio volume to a target integrated loudness.
     
     Args:
         audio_path: Path to input audio file
         output_path: Path to save normalized audio (optional)
+        target_lufs: Target loudness in LUFS
         
     Returns:
         Path to normalized audio file
     """
+    from pydub import AudioSegment
     try:
         audio = AudioSegment.from_file(audio_path)
-        normalized = normalize(audio)
+        normalized = _apply_loudness_gain(audio, measure_loudness(audio), target_lufs)
         
         if output_path is None:
             output_path = audio_path
@@ -45,6 +555,7 @@ def remove_silence(audio_path: str, silence_thresh: float = -50.0,
     Returns:
         Path to processed audio file
     """
+    from pydub import AudioSegment
     try:
         audio = AudioSegment.from_file(audio_path)
         
@@ -73,16 +584,15 @@ def adjust_speed(audio_path: str, speed_factor: float,
     Returns:
         Path to processed audio file
     """
+    from pydub import AudioSegment
     try:
         if speed_factor == 1.0:
             return audio_path
         
         audio = AudioSegment.from_file(audio_path)
         
-        # Change speed by changing frame rate
-        new_sample_rate = int(audio.frame_rate * speed_factor)
-        audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_sample_rate})
-        audio = audio.set_frame_rate(audio.frame_rate)
+        # Time-stretch with WSOLA, so the pitch stays the same
+        audio = _change_speed(audio, speed_factor)
         
         if output_path is None:
             output_path = os.path.join(tempfile.gettempdir(), 
@@ -94,32 +604,35 @@ def adjust_speed(audio_path: str, speed_factor: float,
         print(f"Error adjusting speed: {e}")
         return audio_path
 
-def merge_audio_files(audio_files: list, output_path: str) -> str:
+def merge_audio_files(audio_files: list, output_path: str, method: str = 'auto') -> Optional[str]:
     """
     Merge multiple audio files into one.
     
     Args:
         audio_files: List of audio file paths
         output_path: Path to save merged audio
+        method: 'frames' to concatenate MP3 frames without re-encoding,
+            'decode' to decode and re-encode, or 'auto' to try 'frames' first
         
     Returns:
-        Path to merged audio file
+        Path to merged audio file; with 'frames', None if the frames
+        cannot be joined
     """
+    # Small pause (0.5 second) between chunks
+    existing_files = [f for f in audio_files if os.path.exists(f)]
+    
+    if method in ('auto', 'frames'):
+        try:
+            info = concat_mp3_files(existing_files, output_path, gap_ms=500)
+            _remember_info(output_path, info)
+            return output_path
+        except Exception as e:
+            print(f"Frame-level merge not possible: {e}")
+            if method == 'frames':
+                return None
+    
     try:
-        combined = AudioSegment.empty()
-        
-        for audio_file in audio_files:
-            if os.path.exists(audio_file):
-                try:
-                    audio = AudioSegment.from_file(audio_file)
-                    combined += audio
-                    # Add small pause between chunks
-                    combined += AudioSegment.silent(duration=500)  # 0.5 second pause
-                except Exception as e:
-                    print(f"Error loading audio file {audio_file}: {e}")
-                    raise
-        
-        combined.export(output_path, format="mp3")
+        AudioPipeline(existing_files, gap_ms=500).run(output_path)
         return output_path
     except Exception as e:
         print(f"Error merging audio files: {e}")
@@ -129,24 +642,43 @@ def merge_audio_files(audio_files: list, output_path: str) -> str:
         return output_path
 
 def add_metadata(audio_path: str, title: str, artist: str = "Blog to Podcast", 
-                 album: str = "Generated Podcasts") -> str:
+                 album: str = "Generated Podcasts", source_url: Optional[str] = None,
+                 date: Optional[str] = None,
+                 chapters: Optional[List[Tuple[str, int, int]]] = None) -> str:
     """
     Add metadata to audio file.
     
+    Writes an ID3v2.4 tag in place at the start of the file; the audio is
+    never decoded.
+    
     Args:
         audio_path: Path to audio file
         title: Title of the podcast
         artist: Artist name
         album: Album name
+        source_url: URL of the original blog post
+        date: Publication date of the blog post
+        chapters: (title, start_ms, end_ms) for each chapter, in order
         
     Returns:
         Path to audio file with metadata
     """
     try:
-        audio = AudioSegment.from_file(audio_path)
-        # Note: pydub doesn't support ID3 tags directly
-        # For full metadata support, would need mutagen or similar
-        # For now, just return the file path
+        frames = [
+            text_frame('TIT2', title),
+            text_frame('TPE1', artist),
+            text_frame('TALB', album)
+        ]
+        if source_url and source_url.startswith(('http://', 'https://')):
+            frames.append(url_frame('WOAS', source_url))
+        if date:
+            recording_date = format_recording_date(date)
+            if recording_date:
+                frames.append(text_frame('TDRC', recording_date))
+        if chapters:
+            frames.extend(chapter_frames(chapters))
+        
+        write_tag(audio_path, frames)
         return audio_path
     except Exception as e:
         print(f"Error adding metadata: {e}")
@@ -162,6 +694,12 @@ def get_audio_duration(audio_path: str) -> float:
     Returns:
         Duration in seconds
     """
+    # Read the headers first; decode only files they cannot describe
+    info = _read_header_info(audio_path)
+    if info:
+        return info['duration']
+    
+    from pydub import AudioSegment
     try:
         audio = AudioSegment.from_file(audio_path)
         return len(audio) / 1000.0  # Convert milliseconds to seconds
@@ -179,6 +717,12 @@ def get_audio_info(audio_path: str) -> dict:
     Returns:
         Dictionary with audio information
     """
+    # Read the headers first; decode only files they cannot describe
+    info = _read_header_info(audio_path)
+    if info:
+        return info
+    
+    from pydub import AudioSegment
     try:
         audio = AudioSegment.from_file(audio_path)
         return {
@@ -0,0 +1,284 @@
+"""
+Bulk conversion of blog posts into podcasts.
+
+    python batch.py urls.txt --workers 4
+
+Posts are fetched by a pool of threads that waits BATCH_HOST_DELAY between
+requests to the same host, and converted by a pool of worker processes that
+share the on-disk caches. Every finished URL is appended to a JSONL manifest
+in the output directory, so running the same batch again skips the URLs
+already done and an interrupted batch resumes where it stopped.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+)
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from config import (
+    DEFAULT_LANGUAGE, DEFAULT_VOICE_SPEED, AUDIO_FORMAT, AUDIO_QUALITY, TTS_BACKEND,
+    BATCH_OUTPUT_DIR, BATCH_WORKERS, BATCH_FETCH_WORKERS, BATCH_HOST_DELAY
+)
+from blog_fetcher import fetch_blog_content
+from job_queue import DONE, FAILED
+from legal_compliance import apply_excerpt_limits
+from podcast_generator import generate_podcast
+from utils import ensure_directory
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+class HostThrottle:
+    """
+    Spaces out requests to the same host.
+
+    Thread-safe: each caller reserves the next free slot for its host and
+    sleeps until then, so requests to different hosts are not held up.
+    """
+
+    def __init__(self, delay: float = BATCH_HOST_DELAY):
+        self.delay = delay
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the URL's host is allowed."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+def read_url_list(path: str) -> List[str]:
+    """
+    Read URLs from a file, one per line.
+
+    Blank lines and lines starting with '#' are skipped, as are repeats.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+
+def batch_job_id(url: str) -> str:
+    """Stable job ID for a URL, so a resumed batch reuses its names."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a batch manifest.
+
+    Returns:
+        The latest entry for each URL; a line cut short by an interruption
+        is ignored
+    """
+    entries = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['url']] = entry
+    except OSError:
+        pass
+    return entries
+
+def _append_manifest(path: str, entry: Dict[str, Any]) -> None:
+    """Append an entry and flush it to disk before moving on."""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def _failure(url: str, error: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {'url': url, 'status': FAILED, 'podcast_path': None, 'title': None,
+            'error': error, 'settings': settings, 'finished_at': time.time()}
+
+def _fetch(throttle: HostThrottle, url: str) -> Dict:
+    """Fetch a post politely; raises RuntimeError if it cannot be fetched."""
+    throttle.wait(url)
+    blog_data = fetch_blog_content(url, delay=0)
+    if not blog_data or not blog_data.get('content'):
+        raise RuntimeError("Failed to fetch or process blog content")
+    return blog_data
+
+def convert_post(url: str, blog_data: Dict, settings: Dict[str, Any],
+                 output_dir: str) -> Dict[str, Any]:
+    """
+    Generate the podcast of a fetched post and move it to the batch output.
+
+    Runs in a worker process.
+
+    Returns:
+        Manifest entry for the URL
+    """
+    content = apply_excerpt_limits(blog_data['content'])
+    metadata = blog_data.get('metadata', {})
+    podcast_path = generate_podcast(
+        content,
+        language=settings['language'],
+        speed=settings['speed'],
+        title=metadata.get('title'),
+        author=metadata.get('author'),
+        metadata=metadata,
+        audio_format=settings['audio_format'],
+        quality=settings['quality'],
+        job_id=batch_job_id(url),
+        tts_backend=settings['tts_backend']
+    )
+    if not podcast_path:
+        return _failure(url, "Podcast generation failed", settings)
+
+    output_path = os.path.join(output_dir, os.path.basename(podcast_path))
+    shutil.move(podcast_path, output_path)
+    return {'url': url, 'status': DONE, 'podcast_path': os.path.abspath(output_path),
+            'title': metadata.get('title'), 'error': None, 'settings': settings,
+            'finished_at': time.time()}
+
+def _converter_pool(workers: int) -> Executor:
+    """Pool that runs convert_post (a single worker runs in this process)."""
+    if workers <= 1:
+        return ThreadPoolExecutor(max_workers=1)
+    # Spawn rather than fork: the fetch threads may hold locks a fork would copy
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def run_batch(urls: List[str], output_dir: str = BATCH_OUTPUT_DIR,
+              workers: int = BATCH_WORKERS,
+              fetch_workers: int = BATCH_FETCH_WORKERS,
+              host_delay: float = BATCH_HOST_DELAY,
+              language: str = DEFAULT_LANGUAGE,
+              speed: float = DEFAULT_VOICE_SPEED,
+              audio_format: str = AUDIO_FORMAT,
+              quality: str = AUDIO_QUALITY,
+              tts_backend: str = TTS_BACKEND,
+              retry_failed: bool = True,
+              on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+    """
+    Convert many blog posts into podcasts.
+
+    Fetching and conversion overlap: a post is handed to the conversion
+    pool as soon as it has been fetched.
+
+    Args:
+        urls: Blog post URLs
+        output_dir: Directory for the podcasts and the manifest
+        workers: Conversion processes
+        fetch_workers: Pages fetched at the same time
+        host_delay: Seconds between requests to the same host
+        language: Language code (e.g., 'en', 'es', 'fr')
+        speed: Speech speed multiplier (0.5 to 2.0)
+        audio_format: Output format ('mp3' or 'opus')
+        quality: Encoding quality ('low', 'medium' or 'high')
+        tts_backend: Name of the TTS backend
+        retry_failed: Try URLs the manifest records as failed again (URLs
+            recorded with other settings are always converted again)
+        on_result: Called with each manifest entry as it is written
+
+    Returns:
+        Number of URLs 'done', 'failed' and 'skipped' (already done)
+    """
+    ensure_directory(output_dir)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous = load_manifest(manifest_path)
+    summary = {DONE: 0, FAILED: 0, 'skipped': 0}
+    settings = {'language': language, 'speed': speed,
+                'audio_format': audio_format, 'quality': quality, 'tts_backend': tts_backend}
+
+    pending = []
+    for url in dict.fromkeys(urls):
+        entry = previous.get(url)
+        if entry and entry.get('settings') != settings:
+            entry = None
+        if entry and entry['status'] == DONE and os.path.exists(entry['podcast_path'] or ''):
+            summary['skipped'] += 1
+        elif entry and entry['status'] == FAILED and not retry_failed:
+            summary['skipped'] += 1
+        else:
+            pending.append(url)
+    if not pending:
+        return summary
+
+    def record(entry: Dict[str, Any]) -> None:
+        _append_manifest(manifest_path, entry)
+        summary[entry['status']] += 1
+        if on_result:
+            on_result(entry)
+
+    throttle = HostThrottle(host_delay)
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as fetchers, \
+            _converter_pool(workers) as converters:
+        running: Dict[Future, tuple] = {
+            fetchers.submit(_fetch, throttle, url): ('fetch', url) for url in pending
+        }
+        try:
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, url = running.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        record(_failure(url, str(e) or type(e).__name__, settings))
+                        continue
+                    if stage == 'fetch':
+                        future = converters.submit(convert_post, url, value, settings, output_dir)
+                        running[future] = ('convert', url)
+                    else:
+                        record(value)
+        except KeyboardInterrupt:
+            # Finished URLs are in the manifest; the rest are redone on resume
+            for future in running:
+                future.cancel()
+            raise
+    return summary
+
+def main(argv: Optional[list] = None) -> None:
+    """Convert the URLs listed in a file (or given on the command line)."""
+    parser = argparse.ArgumentParser(description="Convert blog posts into podcasts in bulk.")
+    parser.add_argument('urls', nargs='+', help="URL list file(s) or URLs")
+    parser.add_argument('--output-dir', default=BATCH_OUTPUT_DIR,
+                        help="directory for the podcasts and manifest")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                        help="number of conversion processes")
+    parser.add_argument('--fetch-workers', type=int, default=BATCH_FETCH_WORKERS,
+                        help="number of pages fetched at the same time")
+    parser.add_argument('--host-delay', type=float, default=BATCH_HOST_DELAY,
+                        help="seconds between requests to the same host")
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE)
+    parser.add_argument('--speed', type=float, default=DEFAULT_VOICE_SPEED)
+    parser.add_argument('--format', dest='audio_format', default=AUDIO_FORMAT)
+    parser.add_argument('--quality', default=AUDIO_QUALITY)
+    parser.add_argument('--tts-backend', default=TTS_BACKEND,
+                        help="TTS backend ('gtts', or 'offline' for silent test audio)")
+    parser.add_argument('--skip-failed', action='store_true',
+                        help="don't retry URLs that failed in an earlier run")
+    args = parser.parse_args(argv)
+
+    urls = []
+    for source in args.urls:
+        urls.extend(read_url_list(source) if os.path.isfile(source) else [source])
+
+    def on_result(entry):
+        if entry['status'] == DONE:
+            print(f"Done: {entry['url']} -> {entry['podcast_path']}")
+        else:
+            print(f"Failed: {entry['url']}: {entry['error']}")
+
+    summary = run_batch(urls, args.output_dir, args.workers, args.fetch_workers, args.host_delay,
+                        args.language, args.speed, args.audio_format, args.quality,
+                        args.tts_backend, retry_failed=not args.skip_failed, on_result=on_result)
+    print(f"{summary[DONE]} done, {summary[FAILED]} failed, {summary['skipped']} skipped; "
+          f"manifest: {os.path.join(args.output_dir, MANIFEST_NAME)}")
+
+if __name__ == '__main__':
+    main()
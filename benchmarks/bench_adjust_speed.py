@@ -0,0 +1,61 @@
+"""
+Benchmark for adjust_speed: pitch-preserving WSOLA vs. frame-rate relabeling.
+
+Runs on synthetic speech-like audio, so no TTS, network or ffmpeg is needed.
+
+Usage:
+    python benchmarks/bench_adjust_speed.py [--minutes 30] [--frame-rate 24000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_processor import _change_speed  # noqa: E402
+
+def make_speech_like(minutes: float, frame_rate: int) -> AudioSegment:
+    """Harmonic tones with a syllable-rate envelope and pauses, as 16-bit mono."""
+    rng = np.random.default_rng(0)
+    n = int(minutes * 60 * frame_rate)
+    t = np.arange(n, dtype=np.float32) / frame_rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / frame_rate
+    voiced = sum(np.sin(h * phase) / h for h in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.7)
+    signal = voiced * envelope + 0.01 * rng.standard_normal(n)
+    samples = (signal / np.abs(signal).max() * 20000).astype(np.int16)
+    return AudioSegment(samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=1)
+
+def legacy_change_speed(audio: AudioSegment, speed_factor: float) -> AudioSegment:
+    """The previous adjust_speed: relabel the frame rate (shifts pitch), then resample."""
+    new_sample_rate = int(audio.frame_rate * speed_factor)
+    relabeled = audio._spawn(audio.raw_data, overrides={"frame_rate": new_sample_rate})
+    return relabeled.set_frame_rate(audio.frame_rate)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--minutes', type=float, default=30.0, help="Length of the test audio")
+    parser.add_argument('--frame-rate', type=int, default=24000, help="Sample rate (gTTS uses 24000)")
+    args = parser.parse_args()
+
+    audio = make_speech_like(args.minutes, args.frame_rate)
+    audio_seconds = len(audio) / 1000.0
+    print(f"Test audio: {audio_seconds / 60:.1f} min at {args.frame_rate} Hz mono")
+    print(f"{'speed':>6} {'implementation':>16} {'seconds':>9} {'x realtime':>11} {'output':>9}")
+
+    for speed in (0.5, 0.75, 1.25, 1.5, 2.0):
+        for name, func in (('legacy relabel', legacy_change_speed), ('wsola', _change_speed)):
+            start = time.perf_counter()
+            result = func(audio, speed)
+            elapsed = time.perf_counter() - start
+            print(f"{speed:>6.2f} {name:>16} {elapsed:>9.2f} {audio_seconds / elapsed:>11.0f} "
+                  f"{len(result) / 1000.0 / 60:>7.1f}m")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark for the podcast pipeline against the offline TTS backend.
+
+Synthesis runs at a simulated service latency instead of over the network,
+so chunking, worker-pool sizing and the merge can be measured and compared
+in CI. Caches are bypassed so every run does the full work.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--words 3000] [--latency 0.3] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import podcast_generator  # noqa: E402
+from audio_processor import get_audio_duration  # noqa: E402
+from tts_backends import OfflineBackend, register_backend  # noqa: E402
+
+class _NoCache:
+    """Stands in for the audio caches: every lookup misses, nothing is stored."""
+    enabled = False
+
+    def get(self, key):
+        return None
+
+    def get_meta(self, key):
+        return None
+
+    def put(self, key, path, meta=None):
+        return None
+
+    def set_meta(self, key, meta):
+        return None
+
+def make_post(words: int) -> str:
+    """Blog-like text of about `words` words."""
+    sentence = "The quick brown fox reviews the quarterly analyst report before lunch. "
+    return sentence * max(1, words // 11)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--words', type=int, default=3000, help="Length of the test post")
+    parser.add_argument('--latency', type=float, default=0.3, help="Simulated seconds per TTS call")
+    parser.add_argument('--per-1000-chars', type=float, default=0.5,
+                        help="Simulated extra seconds per 1000 characters")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="Concurrent TTS calls to compare (up to MAX_TTS_WORKERS)")
+    args = parser.parse_args()
+
+    text = make_post(args.words)
+    print(f"Test post: {len(text.split())} words, {len(text)} characters")
+    print(f"{'workers':>8} {'seconds':>9} {'audio':>9}")
+
+    for workers in args.workers:
+        register_backend(OfflineBackend(latency=args.latency,
+                                        seconds_per_1000_chars=args.per_1000_chars,
+                                        max_concurrency=workers))
+        with mock.patch.object(podcast_generator, 'chunk_audio_cache', _NoCache()), \
+                mock.patch.object(podcast_generator, 'podcast_cache', _NoCache()):
+            start = time.perf_counter()
+            path = podcast_generator.generate_podcast(text, tts_backend='offline')
+            elapsed = time.perf_counter() - start
+        if not path:
+            print(f"{workers:>8} {'failed':>9}")
+            continue
+        print(f"{workers:>8} {elapsed:>9.2f} {get_audio_duration(path) / 60:>7.1f}m")
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
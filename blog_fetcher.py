@@ -1,23 +1,30 @@
 """
 Enhanced blog content extraction from Forrester blog posts.
+
+requests and BeautifulSoup are imported when a page is fetched, so pasted
+text never pays for them.
 """
 
-import requests
-from bs4 import BeautifulSoup
+from __future__ import annotations
+
 import re
 import time
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 from urllib.parse import urlparse, urljoin
 from config import REQUEST_TIMEOUT, REQUEST_DELAY, MAX_CONTENT_LENGTH
 from utils import validate_url, is_forrester_url, sanitize_text, extract_domain
 from cache_manager import cache_manager
 from legal_compliance import create_attribution_metadata
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 def check_robots_txt(url: str) -> bool:
     """
     Check robots.txt to see if scraping is allowed.
     Returns True if allowed, False if disallowed.
     """
+    import requests
     try:
         parsed = urlparse(url)
         robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
@@ -101,14 +108,8 @@ def extract_metadata(soup: BeautifulSoup, url: str) -> Dict:
     
     return metadata
 
-def extract_content(soup: BeautifulSoup) -> str:
-    """Extract main content from blog post."""
-    # Remove unwanted elements
-    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 
-                        'advertisement', 'ad', '.ad', '.sidebar', '.comments']):
-        element.decompose()
-    
-    # Try to find main content area
+def _find_content_root(soup: BeautifulSoup):
+    """Find the element holding the main content of a blog post."""
     content_selectors = [
         'article',
         '.post-content',
@@ -131,6 +132,18 @@ def extract_content(soup: BeautifulSoup) -> str:
     if not content:
         content = soup.find('body')
     
+    return content
+
+def extract_content(soup: BeautifulSoup) -> str:
+    """Extract main content from blog post."""
+    # Remove unwanted elements
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 
+                        'advertisement', 'ad', '.ad', '.sidebar', '.comments']):
+        element.decompose()
+    
+    # Try to find main content area
+    content = _find_content_root(soup)
+    
     if not content:
         return ""
     
@@ -154,13 +167,37 @@ def extract_content(soup: BeautifulSoup) -> str:
     
     return full_text
 
-def fetch_blog_content(url: str, use_cache: bool = True) -> Optional[Dict]:
+def extract_headings(soup: BeautifulSoup) -> list:
+    """
+    Extract the section headings that extract_content keeps, in document order.
+    
+    Args:
+        soup: Parsed blog post (after extract_content has cleaned it)
+        
+    Returns:
+        List of heading texts
+    """
+    content = _find_content_root(soup)
+    if not content:
+        return []
+    
+    headings = []
+    for element in content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        text = sanitize_text(element.get_text(separator=' ', strip=True))
+        if text and len(text) > 10:  # Same filter as extract_content
+            headings.append(text)
+    return headings
+
+def fetch_blog_content(url: str, use_cache: bool = True,
+                       delay: float = REQUEST_DELAY) -> Optional[Dict]:
     """
     Fetch and extract content from a Forrester blog post URL.
     
     Args:
         url: The URL of the blog post
         use_cache: Whether to use cached content if available
+        delay: Seconds to wait before the request (callers that throttle
+            requests themselves pass 0)
         
     Returns:
         Dictionary with 'content', 'metadata', and 'raw_html' keys, or None if failed
@@ -174,8 +211,12 @@ def fetch_blog_content(url: str, use_cache: bool = True) -> Optional[Dict]:
         if cached:
             return cached
     
+    import requests
+    from bs4 import BeautifulSoup
+    
     # Respect rate limiting
-    time.sleep(REQUEST_DELAY)
+    if delay:
+        time.sleep(delay)
     
     try:
         headers = {
@@ -194,6 +235,7 @@ def fetch_blog_content(url: str, use_cache: bool = True) -> Optional[Dict]:
         
         # Extract content
         content = extract_content(soup)
+        metadata['headings'] = extract_headings(soup)
         
         # Limit content length
         if len(content) > MAX_CONTENT_LENGTH:
@@ -4,10 +4,15 @@ Caching system for blog content and podcasts.
 
 import os
 import json
+import uuid
+import shutil
 import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from config import CACHE_ENABLED, CACHE_EXPIRY_HOURS, CACHE_DIR
+from config import (
+    CACHE_ENABLED, CACHE_EXPIRY_HOURS, CACHE_DIR,
+    AUDIO_CACHE_MAX_MB, PODCAST_CACHE_MAX_MB, HLS_CACHE_MAX_MB
+)
 from utils import ensure_directory, save_json, load_json, generate_hash
 
 class CacheManager:
@@ -17,7 +22,6 @@ class CacheManager:
         self.cache_dir = CACHE_DIR
         self.enabled = CACHE_ENABLED
         self.expiry_hours = CACHE_EXPIRY_HOURS
-        ensure_directory(self.cache_dir)
     
     def _get_cache_key(self, identifier: str) -> str:
         """Generate cache key from identifier."""
@@ -141,5 +145,153 @@ class CacheManager:
         
         return stats
 
+class AudioCache:
+    """
+    Content-addressed store for audio files with size-based LRU eviction.
+    
+    Files are named after their key and `extension`; a cache holding more
+    than one format passes the file's extension to get, put and set_meta.
+    Metadata is found by key alone.
+    """
+    
+    def __init__(self, namespace: str, max_size_mb: float, extension: str = 'mp3'):
+        self.cache_dir = os.path.join(CACHE_DIR, namespace)
+        self.enabled = CACHE_ENABLED
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.extension = extension
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a content address from the given key parts."""
+        joined = '\x1f'.join(str(part) for part in parts)
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+    
+    def _get_path(self, key: str, extension: Optional[str] = None) -> str:
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, f"{key}.{extension or self.extension}")
+    
+    def _get_meta_path(self, audio_path: str) -> str:
+        """Get the sidecar metadata path for a cached file."""
+        return os.path.splitext(audio_path)[0] + '.json'
+    
+    def get(self, key: str, extension: Optional[str] = None) -> Optional[str]:
+        """Get the path of a cached file, or None on a miss."""
+        if not self.enabled:
+            return None
+        
+        path = self._get_path(key, extension)
+        try:
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+            return path
+        except OSError:
+            return None
+    
+    def get_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata stored alongside a cached file."""
+        if not self.enabled:
+            return None
+        return load_json(self._get_meta_path(self._get_path(key)))
+    
+    def set_meta(self, key: str, meta: Dict[str, Any], extension: Optional[str] = None) -> bool:
+        """Store metadata alongside a file that is already cached."""
+        if not self.enabled:
+            return False
+        path = self._get_path(key, extension)
+        if not os.path.exists(path):
+            return False
+        return save_json(meta, self._get_meta_path(path))
+    
+    def put(self, key: str, source_path: str, meta: Optional[Dict[str, Any]] = None,
+            extension: Optional[str] = None) -> Optional[str]:
+        """Copy a file (and optional metadata) into the cache. Returns the cached path, or None if not stored."""
+        if not self.enabled:
+            return None
+        
+        path = self._get_path(key, extension)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        # Created on first write, so importing the module touches no files
+        ensure_directory(self.cache_dir)
+        if meta is not None:
+            # Metadata goes first so a visible file always has its sidecar
+            save_json(meta, self._get_meta_path(path))
+        try:
+            shutil.copyfile(source_path, temp_path)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error caching audio: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None
+        
+        self.evict()
+        return path
+    
+    def _list_entries(self) -> list:
+        """List (mtime, size, path) for every cached file."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    # Every file but metadata sidecars and copies still being written
+                    if entry.is_file() and not entry.name.endswith(('.json', '.tmp')):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+    
+    def evict(self, max_size_bytes: Optional[int] = None) -> int:
+        """Remove least recently used files until the cache fits. Returns files removed."""
+        limit = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        entries = self._list_entries()
+        total_size = sum(size for _, size, _ in entries)
+        removed = 0
+        
+        for _, size, path in sorted(entries):
+            if total_size <= limit:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+            try:
+                os.remove(self._get_meta_path(path))
+            except OSError:
+                pass
+            total_size -= size
+        
+        return removed
+    
+    def clear(self) -> int:
+        """Remove every cached file. Returns number of files removed."""
+        return self.evict(0)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        entries = self._list_entries()
+        return {
+            'enabled': self.enabled,
+            'total_files': len(entries),
+            'cache_size_mb': round(sum(size for _, size, _ in entries) / (1024 * 1024), 2),
+            'max_size_mb': round(self.max_size_bytes / (1024 * 1024), 2)
+        }
+
 # Global cache manager instance
 cache_manager = CacheManager()
+
+# Synthesized TTS audio per chunk, keyed by chunk text, language and TTS backend
+chunk_audio_cache = AudioCache('audio_chunks', AUDIO_CACHE_MAX_MB)
+
+# Finished podcasts, keyed by content and render settings
+podcast_cache = AudioCache('podcasts', PODCAST_CACHE_MAX_MB)
+
+# HLS segments, keyed by the content up to and including their chunk
+hls_segment_cache = AudioCache('hls_segments', HLS_CACHE_MAX_MB)
@@ -0,0 +1,101 @@
+"""
+Per-chunk checkpoints, so a failed or interrupted render can resume.
+
+The manifest lives in the job's workspace next to the chunk audio. Every
+chunk is recorded as soon as its TTS call finishes. A later render with
+the same job ID and settings reuses the chunk plan and the chunks
+recorded as done, and synthesizes only the ones that are missing or failed.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from cache_manager import AudioCache
+
+CHECKPOINT_NAME = 'checkpoint.json'
+
+# Status of a chunk in the manifest
+CHUNK_DONE = 'done'
+CHUNK_FAILED = 'failed'
+
+class ChunkCheckpoint:
+    """
+    Manifest of the chunks of one render.
+
+    A manifest written for different content or settings (another
+    `render_key`) is ignored, so stale audio is never reused.
+
+    Example:
+        checkpoint = ChunkCheckpoint(workspace.dir, cache_key)
+        path = checkpoint.completed_path(0, chunks[0])  # None: synthesize it
+        checkpoint.record(0, chunks[0], chunk_path, error=None)
+    """
+
+    def __init__(self, directory: str, render_key: str):
+        self.directory = directory
+        self.path = os.path.join(directory, CHECKPOINT_NAME)
+        self.render_key = render_key
+        self._chunks: Dict[str, Dict[str, Any]] = {}
+        self._plan: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('render_key') == render_key:
+                self._chunks = data.get('chunks', {})
+                self._plan = data.get('plan')
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def plan(self) -> Optional[List[str]]:
+        """Chunks the render was cut into, or None if not recorded yet."""
+        return self._plan
+
+    def set_plan(self, chunks: List[str]) -> None:
+        """
+        Record the chunks of the render.
+
+        A resumed render reuses them, since the chunk planner may cut the
+        same text differently once it has measured more TTS calls.
+        """
+        with self._lock:
+            self._plan = list(chunks)
+            self._write()
+
+    def completed_path(self, index: int, chunk: str) -> Optional[str]:
+        """Audio of a chunk recorded as done for the same text, or None."""
+        with self._lock:
+            entry = self._chunks.get(str(index))
+        if (not entry or entry['status'] != CHUNK_DONE
+                or entry['text'] != AudioCache.make_key(chunk)):
+            return None
+        path = os.path.join(self.directory, entry['file'])
+        try:
+            return path if os.path.getsize(path) > 0 else None
+        except OSError:
+            return None
+
+    def record(self, index: int, chunk: str, path: Optional[str], error: Optional[str]) -> None:
+        """Record the outcome of a chunk and write the manifest to disk."""
+        entry = {'status': CHUNK_DONE if path else CHUNK_FAILED, 'text': AudioCache.make_key(chunk),
+                 'file': os.path.basename(path) if path else None, 'error': error}
+        with self._lock:
+            self._chunks[str(index)] = entry
+            self._write()
+
+    def _write(self) -> None:
+        """Write the manifest to disk; the caller holds the lock."""
+        data = {'render_key': self.render_key, 'plan': self._plan, 'chunks': self._chunks}
+        # Replace the manifest in one step, so a crash never leaves it half written
+        temp_path = f"{self.path}.part"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of chunks recorded as 'done' and 'failed'."""
+        with self._lock:
+            statuses = [entry['status'] for entry in self._chunks.values()]
+        return {status: statuses.count(status) for status in (CHUNK_DONE, CHUNK_FAILED)}
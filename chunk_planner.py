@@ -0,0 +1,209 @@
+"""
+Chunk planning for TTS: how a post is cut into the pieces sent to the backend.
+
+A post used to be cut into MAX_AUDIO_CHUNK_SIZE pieces: the first audio
+waited for a full-size chunk, and a short post was a single chunk with
+nothing to parallelize. The planner instead
+
+- makes the first chunk short (TTS_FIRST_CHUNK_CHARS), so streaming can
+  start playing sooner;
+- cuts the rest into about one chunk per concurrent TTS call, so they are
+  synthesized in a single wave, but never into chunks so small that the
+  fixed cost of a call outweighs the speech in it.
+
+Both depend on how long the backend takes: a fixed cost per call plus a
+cost per character. LatencyModel fits these from every synthesized chunk
+and keeps them in a SQLite database, so later runs (and other processes)
+plan with what was learned.
+
+The measurements only pick the smallest chunk worth a call from a few
+fixed sizes (CHUNK_FLOORS), and the pick only moves once the measured
+cost is off by more than a factor of two. So the same post is cut the
+same way from run to run, and its chunks keep hitting the audio cache.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+import config
+from config import (
+    TTS_FIRST_CHUNK_CHARS, TTS_LATENCY_PRIOR_SECONDS, TTS_LATENCY_PRIOR_SECONDS_PER_1000_CHARS,
+    TTS_LATENCY_DECAY, TTS_LATENCY_MIN_SAMPLES
+)
+from utils import chunk_text_by_sentences, ensure_directory
+
+# Chunk sizes are rounded up to a multiple of this, so the chunks of the
+# same text come out the same
+_SIZE_STEP = 250
+
+# Sizes the smallest chunk worth a TTS call is chosen from
+CHUNK_FLOORS = (250, 500, 1000, 2000, 4000)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS latency_models (
+    name TEXT PRIMARY KEY,
+    weight REAL NOT NULL DEFAULT 0,
+    sum_chars REAL NOT NULL DEFAULT 0,
+    sum_seconds REAL NOT NULL DEFAULT 0,
+    sum_chars_squared REAL NOT NULL DEFAULT 0,
+    sum_chars_seconds REAL NOT NULL DEFAULT 0,
+    observed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS chunk_floors (
+    name TEXT PRIMARY KEY,
+    chars INTEGER NOT NULL
+);
+"""
+
+class LatencyModel:
+    """
+    Latency of a TTS backend as `base_seconds + seconds_per_char * chars`.
+
+    Fitted by least squares over the observed calls, with older calls
+    weighted down by `decay` per new call so the model follows the service.
+    Until `min_samples` calls are observed (or if every call had the same
+    length) the prior from config is used.
+
+    Example:
+        model = LatencyModel('gtts')
+        model.observe(chars=1200, seconds=1.4)
+        base_seconds, seconds_per_char = model.estimate()
+    """
+
+    def __init__(self, name: str, db_path: str = config.TTS_LATENCY_MODEL_DB,
+                 decay: float = TTS_LATENCY_DECAY, min_samples: int = TTS_LATENCY_MIN_SAMPLES):
+        self.name = name
+        self.db_path = db_path
+        self.decay = decay
+        self.min_samples = min_samples
+        self._ready = False
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements under the database write lock, committed together."""
+        if not self._ready:
+            ensure_directory(os.path.dirname(os.path.abspath(self.db_path)))
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            if not self._ready:
+                conn.executescript(_SCHEMA)
+                self._ready = True
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def observe(self, chars: int, seconds: float) -> None:
+        """Record how long synthesizing `chars` characters took."""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO latency_models (name) VALUES (?)", (self.name,))
+            conn.execute(
+                "UPDATE latency_models SET weight = weight * ? + 1, "
+                "sum_chars = sum_chars * ? + ?, sum_seconds = sum_seconds * ? + ?, "
+                "sum_chars_squared = sum_chars_squared * ? + ?, "
+                "sum_chars_seconds = sum_chars_seconds * ? + ?, observed = observed + 1 "
+                "WHERE name = ?",
+                (self.decay, self.decay, chars, self.decay, seconds, self.decay, chars * chars,
+                 self.decay, chars * seconds, self.name)
+            )
+
+    def estimate(self) -> Tuple[float, float]:
+        """
+        Current fit of the model.
+
+        Returns:
+            (base_seconds, seconds_per_char)
+        """
+        prior = (TTS_LATENCY_PRIOR_SECONDS, TTS_LATENCY_PRIOR_SECONDS_PER_1000_CHARS / 1000)
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM latency_models WHERE name = ?", (self.name,)).fetchone()
+        if not row or row['observed'] < self.min_samples:
+            return prior
+
+        weight, sx, sy = row['weight'], row['sum_chars'], row['sum_seconds']
+        spread = weight * row['sum_chars_squared'] - sx * sx
+        if spread <= 1e-6 * weight * row['sum_chars_squared']:
+            # Every call had about the same length: keep the prior's split between the two costs
+            per_char = prior[1]
+        else:
+            per_char = (weight * row['sum_chars_seconds'] - sx * sy) / spread
+        per_char = max(per_char, 1e-6)
+        base = max(0.0, (sy - per_char * sx) / weight)
+        return base, per_char
+
+    def predict(self, chars: int) -> float:
+        """Expected seconds to synthesize `chars` characters."""
+        base, per_char = self.estimate()
+        return base + per_char * chars
+
+    def chunk_floor(self) -> int:
+        """
+        Smallest chunk worth a TTS call, one of CHUNK_FLOORS.
+
+        A shorter chunk spends more time on the call's fixed cost than on its
+        speech. The size is kept with the model and only changes once the
+        measured break-even is more than twice or less than half of it.
+        """
+        base, per_char = self.estimate()
+        break_even = max(1.0, base / per_char)
+        with self._transaction() as conn:
+            row = conn.execute("SELECT chars FROM chunk_floors WHERE name = ?", (self.name,)).fetchone()
+            if row and row['chars'] / 2 <= break_even <= row['chars'] * 2:
+                return row['chars']
+            floor = min(CHUNK_FLOORS, key=lambda size: abs(math.log(break_even / size)))
+            conn.execute("INSERT OR REPLACE INTO chunk_floors (name, chars) VALUES (?, ?)",
+                         (self.name, floor))
+            return floor
+
+_models: Dict[Tuple[str, str], LatencyModel] = {}
+_models_lock = threading.Lock()
+
+def get_latency_model(name: str) -> LatencyModel:
+    """Latency model of a TTS backend, stored in TTS_LATENCY_MODEL_DB."""
+    key = (name, config.TTS_LATENCY_MODEL_DB)
+    with _models_lock:
+        if key not in _models:
+            _models[key] = LatencyModel(name, db_path=config.TTS_LATENCY_MODEL_DB)
+        return _models[key]
+
+def plan_chunks(text: str, max_chars: int, concurrency: int, min_chars: int,
+                first_chunk_chars: int = TTS_FIRST_CHUNK_CHARS) -> List[str]:
+    """
+    Cut text into chunks for TTS at sentence boundaries.
+
+    The plan depends only on the arguments, so the same text is always cut
+    into the same chunks.
+
+    Args:
+        text: Cleaned text of the post
+        max_chars: Longest chunk the backend accepts
+        concurrency: TTS calls that run at the same time
+        min_chars: Smallest chunk worth a TTS call (LatencyModel.chunk_floor)
+        first_chunk_chars: Target length of the first chunk
+
+    Returns:
+        Chunks in playback order (a sentence longer than a chunk stays whole)
+    """
+    first_chunk_chars = min(first_chunk_chars, max_chars)
+    if len(text) <= first_chunk_chars:
+        return [text]
+
+    first = chunk_text_by_sentences(text, first_chunk_chars)[0]
+    rest = text[text.find(first) + len(first):].strip()
+    if not rest:
+        return [first]
+
+    min_chars = min(max_chars, max(first_chunk_chars, min_chars))
+    count = max(math.ceil(len(rest) / max_chars), min(concurrency, int(len(rest) // min_chars)), 1)
+    size = min(max_chars, math.ceil(len(rest) / count / _SIZE_STEP) * _SIZE_STEP)
+    return [first] + chunk_text_by_sentences(rest, size)
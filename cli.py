@@ -0,0 +1,146 @@
+"""
+Command-line podcast generation without the Streamlit app.
+
+    python -m cli https://www.forrester.com/blogs/some-post/ -o episode.mp3
+    python -m cli --text post.txt --speed 1.25
+    cat post.txt | python -m cli --text -
+
+Only argparse and config are imported at startup; the fetcher and the audio
+pipeline are imported when a run needs them, so `--help` and argument errors
+return at once and cron or batch invocations don't pay for Streamlit.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from typing import Dict, Optional
+from config import (
+    DEFAULT_LANGUAGE, DEFAULT_VOICE_SPEED, AUDIO_FORMAT, AUDIO_QUALITY, AUDIO_BITRATES,
+    SUPPORTED_LANGUAGES, TTS_BACKEND
+)
+
+def _read_text(source: str) -> str:
+    """Read pasted content from a file, or from stdin for '-'."""
+    if source == '-':
+        return sys.stdin.read()
+    with open(source, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _load_post(blog_fetcher, args: argparse.Namespace) -> Optional[Dict]:
+    """Fetch the blog post (or wrap the given text) as blog data."""
+    if args.text is not None:
+        return blog_fetcher.fetch_from_text(_read_text(args.text), url=args.url)
+    return blog_fetcher.fetch_blog_content(args.url, use_cache=not args.no_cache)
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line arguments of the CLI."""
+    parser = argparse.ArgumentParser(prog='python -m cli',
+                                     description="Convert a blog post into a podcast.")
+    parser.add_argument('url', nargs='?', help="blog post URL (the source URL with --text)")
+    parser.add_argument('--text', metavar='FILE',
+                        help="convert the text in FILE ('-' for stdin) instead of fetching")
+    parser.add_argument('-o', '--output', help="where to write the podcast (default: OUTPUT_DIR)")
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE, choices=sorted(SUPPORTED_LANGUAGES))
+    parser.add_argument('--speed', type=float, default=DEFAULT_VOICE_SPEED)
+    parser.add_argument('--format', dest='audio_format', default=AUDIO_FORMAT,
+                        choices=sorted(AUDIO_BITRATES))
+    parser.add_argument('--quality', default=AUDIO_QUALITY,
+                        choices=sorted(AUDIO_BITRATES[AUDIO_FORMAT]))
+    parser.add_argument('--tts-backend', default=TTS_BACKEND,
+                        help="TTS backend ('gtts', or 'offline' for silent test audio)")
+    parser.add_argument('--job-id',
+                        help="job ID; give the ID of a failed run to synthesize only its missing chunks")
+    parser.add_argument('--allow-partial', action='store_true',
+                        help="produce the podcast even if some chunks fail, leaving them out")
+    parser.add_argument('--hls', action='store_true',
+                        help="write HLS segments and a playlist instead of one file")
+    parser.add_argument('--no-cache', action='store_true', help="fetch the page even if cached")
+    parser.add_argument('--timings', action='store_true',
+                        help="print how long startup, fetching and generation took, and TTS rate limiter, "
+                             "hedging and circuit breaker metrics")
+    return parser
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Run one conversion.
+
+    Returns:
+        Exit status: 0 on success, 1 if fetching or generation failed
+    """
+    started = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.url is None and args.text is None:
+        parser.error("give a URL or --text FILE")
+
+    timings = {}
+
+    def finish(status: int) -> int:
+        if args.timings:
+            timings['total'] = time.perf_counter() - started
+            print(', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()),
+                  file=sys.stderr)
+            if 'import' in timings:
+                from tts_backends import tts_rate_limiter
+                metrics = tts_rate_limiter.metrics()
+                print(f"TTS rate {metrics['rate']:.2f}/s, {metrics['acquired']} requests, "
+                      f"{metrics['throttled']} throttled, {metrics['retried']} retried, "
+                      f"{metrics['waited_seconds']:.1f}s waiting", file=sys.stderr)
+                from resilience import get_breaker, get_hedger
+                hedges = get_hedger(args.tts_backend).metrics()
+                breaker = get_breaker(args.tts_backend).metrics()
+                print(f"TTS hedging: {hedges['hedged']} of {hedges['calls']} calls hedged "
+                      f"({hedges['hedge_rate']:.0%}), {hedges['hedge_wins']} hedges won "
+                      f"({hedges['win_rate']:.0%}); circuit {breaker['state']}, "
+                      f"opened {breaker['opened']} times, {breaker['rejected']} calls failed fast",
+                      file=sys.stderr)
+        return status
+
+    # Heavy modules load only once the arguments are known to be valid
+    mark = time.perf_counter()
+    import blog_fetcher
+    from legal_compliance import apply_excerpt_limits
+    from podcast_generator import generate_podcast
+    timings['import'] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    blog_data = _load_post(blog_fetcher, args)
+    timings['fetch'] = time.perf_counter() - mark
+    if not blog_data or not blog_data.get('content'):
+        print("Failed to fetch or process blog content", file=sys.stderr)
+        return finish(1)
+
+    mark = time.perf_counter()
+    content = apply_excerpt_limits(blog_data['content'])
+    metadata = blog_data.get('metadata', {})
+    podcast_path = generate_podcast(
+        content,
+        language=args.language,
+        speed=args.speed,
+        title=metadata.get('title'),
+        author=metadata.get('author'),
+        metadata=metadata,
+        audio_format=args.audio_format,
+        quality=args.quality,
+        hls=args.hls,
+        job_id=args.job_id,
+        tts_backend=args.tts_backend,
+        allow_partial=args.allow_partial
+    )
+    timings['generate'] = time.perf_counter() - mark
+    if not podcast_path:
+        print("Podcast generation failed. Note: gTTS requires an internet connection.",
+              file=sys.stderr)
+        return finish(1)
+
+    # A playlist refers to its segments by relative path, so it stays where it is
+    if args.output and not args.hls:
+        shutil.move(podcast_path, args.output)
+        podcast_path = args.output
+    print(os.path.abspath(podcast_path))
+    return finish(0)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,7 +9,12 @@ APP_VERSION = "1.0.0"
 APP_DESCRIPTION = "Transform Forrester blog posts into engaging podcasts"
 
 # TTS Engine Selection
-# Using Google Text-to-Speech (gTTS) as the only TTS engine
+TTS_BACKEND = 'gtts'  # 'gtts' (Google Text-to-Speech) or 'offline' (silent audio, no network)
+# Offline backend: simulated service latency per request, plus per 1000 characters
+OFFLINE_TTS_LATENCY_SECONDS = 0.0
+OFFLINE_TTS_SECONDS_PER_1000_CHARS = 0.0
+OFFLINE_TTS_WORDS_PER_MINUTE = 150  # Sets the duration of the audio produced
+OFFLINE_TTS_MAX_CONCURRENCY = 16
 
 # TTS Settings
 DEFAULT_LANGUAGE = 'en'
@@ -26,9 +31,47 @@ SUPPORTED_LANGUAGES = {
 }
 
 # Audio Settings
-AUDIO_FORMAT = 'mp3'
+AUDIO_FORMAT = 'mp3'  # 'mp3', 'opus'
 AUDIO_QUALITY = 'high'  # 'low', 'medium', 'high'
-MAX_AUDIO_CHUNK_SIZE = 4500  # Characters per chunk for TTS
+# Mono speech bitrates (kbps) by output format and quality
+AUDIO_BITRATES = {
+    'mp3': {'low': 32, 'medium': 48, 'high': 64},
+    'opus': {'low': 16, 'medium': 24, 'high': 32}
+}
+MAX_AUDIO_CHUNK_SIZE = 4500  # Longest chunk sent to TTS
+MAX_TTS_WORKERS = 4  # Chunks synthesized concurrently
+GTTS_PARALLEL_REQUESTS = 4  # gTTS sub-requests (about one per sentence) sent at once per chunk
+GTTS_BASE_URL = 'https://translate.google.com'  # Endpoint gTTS requests are sent to
+TARGET_LOUDNESS_LUFS = -16.0  # Integrated loudness of the finished podcast
+HLS_SEGMENT_SECONDS = 6  # Target duration of HLS segments
+
+# TTS Rate Limiting (shared by every thread and process on the machine)
+TTS_RATE_LIMIT_DB = './cache/rate_limits.db'
+TTS_RATE_PER_SECOND = 3.0  # Starting request rate; adapts between the bounds below
+TTS_RATE_MIN_PER_SECOND = 0.2
+TTS_RATE_MAX_PER_SECOND = 10.0
+TTS_RATE_STEP = 0.05  # Rate increase after each successful request
+TTS_RATE_BURST = 6  # Requests allowed back to back
+TTS_MAX_RETRIES = 3  # Retries of throttled, server and network errors
+TTS_BACKOFF_BASE_SECONDS = 0.5
+TTS_BACKOFF_MAX_SECONDS = 8.0
+
+# TTS Tail Latency (per backend, per process)
+TTS_HEDGE_PERCENTILE = 95  # Start a duplicate call once a chunk is slower than this percentile
+TTS_HEDGE_MIN_SAMPLES = 20  # Calls observed before hedging starts
+TTS_HEDGE_MAX_FRACTION = 0.1  # Largest share of calls that may be hedged
+TTS_HEDGE_WINDOW = 200  # Recent calls the percentile is taken over
+TTS_BREAKER_FAILURES = 5  # Failures in a row that stop calls to a backend
+TTS_BREAKER_RESET_SECONDS = 30  # How long calls are stopped before a trial call
+
+# TTS Chunk Planning
+TTS_FIRST_CHUNK_CHARS = 400  # A short first chunk, so streamed audio starts sooner
+TTS_LATENCY_MODEL_DB = './cache/tts_latency.db'  # Measured TTS latency per backend, kept across runs
+# Latency assumed until TTS_LATENCY_MIN_SAMPLES calls are measured: per call, plus per 1000 characters
+TTS_LATENCY_PRIOR_SECONDS = 0.5
+TTS_LATENCY_PRIOR_SECONDS_PER_1000_CHARS = 1.0
+TTS_LATENCY_MIN_SAMPLES = 5
+TTS_LATENCY_DECAY = 0.98  # Weight kept by older measurements at each new one
 
 # Blog Scraping Settings
 REQUEST_TIMEOUT = 10  # seconds
@@ -36,6 +79,9 @@ REQUEST_DELAY = 1  # seconds between requests
 MAX_CONTENT_LENGTH = 50000  # Maximum characters to process
 CACHE_ENABLED = True
 CACHE_EXPIRY_HOURS = 24
+AUDIO_CACHE_MAX_MB = 500  # Size cap for cached TTS chunk audio
+PODCAST_CACHE_MAX_MB = 1000  # Size cap for cached finished podcasts
+HLS_CACHE_MAX_MB = 1000  # Size cap for cached HLS segments
 
 # Legal Compliance Settings
 ENABLE_EXCERPT_LIMITS = False  # Set to True to limit content
@@ -47,6 +93,24 @@ SHOW_LEGAL_DISCLAIMER = True
 TEMP_DIR = './temp'
 OUTPUT_DIR = './output'
 CACHE_DIR = './cache'
+WORKSPACE_DIR = './temp/jobs'  # One working directory per generation job
+WORKSPACE_MAX_AGE_HOURS = 6  # Workspaces idle this long are treated as abandoned
+OUTPUT_MAX_AGE_HOURS = 24  # Finished podcasts are removed after this long
+WORKSPACE_GC_INTERVAL_SECONDS = 600
+
+# Background Job Queue
+JOB_QUEUE_DB = './jobs/jobs.db'  # SQLite database shared by the app and workers
+JOB_WORKERS = 2  # Worker processes started by worker.py
+JOB_POLL_SECONDS = 1.0  # How often idle workers and the app check the queue
+JOB_HEARTBEAT_SECONDS = 10
+JOB_STALE_SECONDS = 120  # Running jobs without a heartbeat this long are recovered
+JOB_MAX_ATTEMPTS = 3
+
+# Batch Processing
+BATCH_OUTPUT_DIR = './batch'  # Podcasts and manifest of batch runs (kept until removed)
+BATCH_WORKERS = 4  # Conversion processes
+BATCH_FETCH_WORKERS = 8  # Pages fetched at the same time (from different hosts)
+BATCH_HOST_DELAY = 1.0  # seconds between requests to the same host
 
 # UI Settings
 THEME_PRIMARY_COLOR = "#1f77b4"
@@ -55,5 +119,6 @@ THEME_SECONDARY_COLOR = "#666666"
 
 # Feature Flags
 ENABLE_SETTINGS_PAGE = True
-ENABLE_BATCH_PROCESSING = False
+ENABLE_BATCH_PROCESSING = False  # Show the batch (URL list) input in the app
+ENABLE_JOB_QUEUE = False  # Run generations in worker.py processes instead of the app
 ENABLE_USER_AUTH = False
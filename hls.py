@@ -0,0 +1,101 @@
+"""
+HTTP Live Streaming (HLS) output: packed MP3 segments and m3u8 playlists.
+"""
+
+import math
+import os
+import uuid
+from typing import List, Tuple
+
+from id3_tags import build_tag, priv_frame
+from mp3_frames import iter_frames, make_silence, read_audio_frames
+
+# ID3 PRIV owner carrying the start time of a packed audio segment
+TIMESTAMP_OWNER = 'com.apple.streaming.transportStreamTimestamp'
+TIMESTAMP_CLOCK = 90000  # MPEG-2 presentation clock in Hz
+
+def timestamp_tag(start_seconds: float) -> bytes:
+    """ID3 tag that tells HLS players where a packed audio segment starts."""
+    ticks = int(round(start_seconds * TIMESTAMP_CLOCK)) & ((1 << 33) - 1)
+    frame = priv_frame(TIMESTAMP_OWNER, ticks.to_bytes(8, 'big'))
+    return build_tag([frame], size=10 + len(frame))
+
+def segment_mp3(path: str, segment_seconds: float, start_seconds: float = 0.0,
+                lead_silence_ms: int = 0) -> List[Tuple[bytes, float]]:
+    """
+    Cut an MP3 file into packed audio segments at frame boundaries.
+
+    Args:
+        path: Path to MP3 file
+        segment_seconds: Target segment duration; the last segment may be shorter
+        start_seconds: Position of the file in the whole stream, for the timestamps
+        lead_silence_ms: Silence to put before the audio (the pause between chunks)
+
+    Returns:
+        (segment bytes, duration in seconds) for each segment, in order
+
+    Raises:
+        ValueError: If the file has no MP3 frames
+    """
+    frames, header = read_audio_frames(path)
+    if not frames:
+        raise ValueError(f"No MP3 frames found in {path}")
+
+    silence = make_silence(header, lead_silence_ms)
+    frames = [silence[offset:offset + frame.frame_length]
+              for offset, frame in iter_frames(silence)] + frames
+
+    frame_seconds = header.samples_per_frame / header.sample_rate
+    frames_per_segment = max(1, int(round(segment_seconds / frame_seconds)))
+    segments = []
+    for first in range(0, len(frames), frames_per_segment):
+        block = frames[first:first + frames_per_segment]
+        offset = start_seconds + first * frame_seconds
+        segments.append((timestamp_tag(offset) + b''.join(block), len(block) * frame_seconds))
+    return segments
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """Replace a file in one step, so a player never reads it half written."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_segment(path: str, data: bytes) -> None:
+    """
+    Write a segment to a directory shared with other renders.
+
+    Segments are named by content, so concurrent renders may write the same
+    one while a player reads it; it is replaced in one step.
+    """
+    _write_atomically(path, data)
+
+def write_playlist(path: str, segments: List[Tuple[str, float]]) -> None:
+    """
+    Write a complete (VOD) HLS media playlist.
+
+    Args:
+        path: Path of the .m3u8 file
+        segments: (URI relative to the playlist, duration in seconds) per segment
+    """
+    target = max((math.ceil(duration) for _, duration in segments), default=1)
+    lines = [
+        '#EXTM3U',
+        '#EXT-X-VERSION:3',
+        f'#EXT-X-TARGETDURATION:{target}',
+        '#EXT-X-MEDIA-SEQUENCE:0',
+        '#EXT-X-PLAYLIST-TYPE:VOD',
+    ]
+    for uri, duration in segments:
+        lines.append(f'#EXTINF:{duration:.3f},')
+        lines.append(uri)
+    lines.append('#EXT-X-ENDLIST')
+
+    _write_atomically(path, ('\n'.join(lines) + '\n').encode('utf-8'))
@@ -0,0 +1,148 @@
+"""
+Minimal ID3v2.4 tag writer with chapter (CHAP/CTOC) support.
+"""
+
+import os
+import re
+import struct
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Padding left after a new tag so later edits can be written in place
+DEFAULT_PADDING = 1024
+
+def _synchsafe(value: int) -> bytes:
+    """Encode an integer as a 4-byte synchsafe integer."""
+    return bytes([(value >> 21) & 0x7F, (value >> 14) & 0x7F, (value >> 7) & 0x7F, value & 0x7F])
+
+def _frame(frame_id: str, payload: bytes) -> bytes:
+    """Encode a single ID3v2.4 frame."""
+    return frame_id.encode('ascii') + _synchsafe(len(payload)) + b'\x00\x00' + payload
+
+def text_frame(frame_id: str, text: str) -> bytes:
+    """Encode a UTF-8 text information frame (TIT2, TPE1, ...)."""
+    return _frame(frame_id, b'\x03' + text.encode('utf-8'))
+
+def url_frame(frame_id: str, url: str) -> bytes:
+    """Encode a URL link frame (WOAS, ...)."""
+    return _frame(frame_id, url.encode('latin-1', errors='ignore'))
+
+def priv_frame(owner: str, data: bytes) -> bytes:
+    """Encode a private frame (PRIV) with an owner identifier."""
+    return _frame('PRIV', owner.encode('latin-1') + b'\x00' + data)
+
+def chapter_frame(element_id: str, start_ms: int, end_ms: int, title: str) -> bytes:
+    """Encode a CHAP frame with an embedded title."""
+    payload = (element_id.encode('latin-1') + b'\x00'
+               + struct.pack('>IIII', start_ms, end_ms, 0xFFFFFFFF, 0xFFFFFFFF)
+               + text_frame('TIT2', title))
+    return _frame('CHAP', payload)
+
+def toc_frame(element_id: str, child_ids: List[str], title: Optional[str] = None) -> bytes:
+    """Encode a top-level, ordered CTOC frame listing chapter element IDs."""
+    payload = element_id.encode('latin-1') + b'\x00' + bytes([0x03, len(child_ids)])
+    payload += b''.join(child.encode('latin-1') + b'\x00' for child in child_ids)
+    if title:
+        payload += text_frame('TIT2', title)
+    return _frame('CTOC', payload)
+
+def chapter_frames(chapters: List[Tuple[str, int, int]]) -> List[bytes]:
+    """
+    Encode a table of contents and chapter frames.
+
+    Args:
+        chapters: (title, start_ms, end_ms) for each chapter, in order
+
+    Returns:
+        CTOC frame followed by one CHAP frame per chapter (at most 255)
+    """
+    chapters = chapters[:255]
+    element_ids = [f"chp{i}" for i in range(len(chapters))]
+    frames = [toc_frame('toc', element_ids)]
+    for element_id, (title, start_ms, end_ms) in zip(element_ids, chapters):
+        frames.append(chapter_frame(element_id, int(start_ms), int(end_ms), title))
+    return frames
+
+def format_recording_date(date: str) -> Optional[str]:
+    """Convert a blog date to the ISO 8601 form TDRC expects, if possible."""
+    date = date.strip()
+    # ISO dates and timestamps (with or without time zone)
+    match = re.match(r'(\d{4}-\d{2}-\d{2})', date)
+    if match:
+        return match.group(1)
+    for fmt in ('%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y', '%m/%d/%Y'):
+        try:
+            return datetime.strptime(date, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    # Fall back to the year when the format is unknown
+    match = re.search(r'\b(?:19|20)\d{2}\b', date)
+    return match.group(0) if match else None
+
+def build_tag(frames: List[bytes], size: Optional[int] = None) -> bytes:
+    """
+    Build an ID3v2.4 tag from encoded frames.
+
+    Args:
+        frames: Encoded frames
+        size: Total tag size to pad to (default: frames plus DEFAULT_PADDING)
+
+    Returns:
+        Encoded tag including its 10-byte header
+    """
+    body = b''.join(frames)
+    if size is None:
+        size = 10 + len(body) + DEFAULT_PADDING
+    body += b'\x00' * (size - 10 - len(body))
+    return b'ID3\x04\x00\x00' + _synchsafe(len(body)) + body
+
+def existing_tag_size(path: str) -> int:
+    """Total size of the ID3v2 tag at the start of a file (0 if there is none)."""
+    with open(path, 'rb') as f:
+        header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return 0
+    size = 0
+    for b in header[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+def write_tag(path: str, frames: List[bytes]) -> None:
+    """
+    Write an ID3v2.4 tag to the start of a file, replacing any existing tag.
+
+    The tag is written in place when it fits in the space of the old one.
+    Otherwise the audio is copied once behind a new, padded tag; it is never
+    decoded.
+
+    Args:
+        path: Path to the audio file
+        frames: Encoded frames
+    """
+    old_size = existing_tag_size(path)
+    needed = 10 + sum(len(frame) for frame in frames)
+
+    if old_size and needed <= old_size:
+        with open(path, 'r+b') as f:
+            f.write(build_tag(frames, size=old_size))
+        return
+
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+            dst.write(build_tag(frames))
+            src.seek(old_size)
+            while True:
+                block = src.read(1024 * 1024)
+                if not block:
+                    break
+                dst.write(block)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,230 @@
+"""
+Persistent podcast job queue backed by SQLite.
+
+The Streamlit app enqueues jobs and polls their status; worker processes
+(see worker.py) claim and run them. Jobs are rows in a SQLite database, so
+they survive app and worker restarts, and any number of workers on the same
+machine can share one queue.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from config import JOB_QUEUE_DB, JOB_STALE_SECONDS, JOB_MAX_ATTEMPTS
+from utils import ensure_directory
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    heartbeat_at REAL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+class JobQueue:
+    """
+    SQLite-backed queue of podcast jobs.
+
+    Every method opens its own connection, so one JobQueue can be shared by
+    threads, and separate processes can open the same database file.
+
+    Example:
+        queue = JobQueue()
+        job_id = queue.enqueue({'url': url, 'language': 'en'})
+        queue.status(job_id)['status']  # 'queued', 'running', 'done', 'failed' or 'cancelled'
+    """
+
+    def __init__(self, db_path: str = JOB_QUEUE_DB):
+        self.db_path = db_path
+        ensure_directory(os.path.dirname(os.path.abspath(db_path)))
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open an autocommit connection that is closed afterwards."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            # Readers (the app polling) never block the writer (a worker) and vice versa
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, params: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            params: JSON-serializable job parameters
+            job_id: ID to use (default: a new unique ID)
+
+        Returns:
+            The job ID
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), now, now)
+            )
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a job.
+
+        Returns:
+            Dictionary with 'id', 'status', 'params', 'result', 'error',
+            'attempts', 'stage', 'progress' (0.0 to 1.0), 'created_at' and
+            'updated_at', or None if unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the result of a finished job, or None if it is not done."""
+        job = self.status(job_id)
+        return job['result'] if job and job['status'] == DONE else None
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest queued job and mark it as running.
+
+        Returns:
+            The claimed job (as returned by status), or None if the queue is empty
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # IMMEDIATE takes the write lock up front, so two workers never claim the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                        "updated_at = ?, heartbeat_at = ? WHERE id = ?",
+                        (RUNNING, worker_id, now, now, row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.status(row['id']) if row else None
+
+    def heartbeat(self, job_id: str) -> None:
+        """Record that the worker running a job is still alive."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                         (time.time(), job_id, RUNNING))
+
+    def set_progress(self, job_id: str, stage: str, progress: float) -> None:
+        """Record how far a running job has got."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET stage = ?, progress = ?, updated_at = ? "
+                         "WHERE id = ? AND status = ?",
+                         (stage, progress, time.time(), job_id, RUNNING))
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        A queued job is never claimed; the worker running a job notices the
+        cancellation at its next heartbeat and stops it.
+
+        Returns:
+            True if the job was still queued or running
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING)
+            ).rowcount > 0
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a running job as done with its result (unless it was cancelled)."""
+        self._finish(job_id, DONE, result=json.dumps(result))
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a running job as failed."""
+        self._finish(job_id, FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (status, result, error, time.time(), job_id, RUNNING)
+            )
+
+    def requeue_stale(self, stale_seconds: float = JOB_STALE_SECONDS,
+                      max_attempts: int = JOB_MAX_ATTEMPTS) -> int:
+        """
+        Recover jobs whose worker died (no heartbeat for `stale_seconds`).
+
+        They are queued again, or failed once they have been tried
+        `max_attempts` times.
+
+        Returns:
+            Number of jobs recovered
+        """
+        now = time.time()
+        cutoff = now - stale_seconds
+        with self._connect() as conn:
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, "Worker stopped responding", now, RUNNING, cutoff, max_attempts)
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, updated_at = ? "
+                "WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, now, RUNNING, cutoff)
+            ).rowcount
+        return failed + requeued
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'id': row['id'],
+        'status': row['status'],
+        'params': json.loads(row['params']),
+        'result': json.loads(row['result']) if row['result'] else None,
+        'error': row['error'],
+        'attempts': row['attempts'],
+        'stage': row['stage'],
+        'progress': row['progress'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at']
+    }
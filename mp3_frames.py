@@ -0,0 +1,495 @@
+"""
+MPEG audio frame parsing and frame-level MP3 concatenation.
+"""
+
+import os
+import struct
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+# Bitrates in kbps by (MPEG-1?, layer)
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates by version bits (0: MPEG-2.5, 2: MPEG-2, 3: MPEG-1)
+_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+_LAYERS = {1: 3, 2: 2, 3: 1}
+_MONO = 3
+
+class FrameHeader(NamedTuple):
+    """Decoded fields of a 4-byte MPEG audio frame header."""
+    raw: int
+    version_bits: int
+    layer: int
+    protected: bool
+    bitrate: int
+    sample_rate: int
+    padding: int
+    channel_mode: int
+    frame_length: int
+    samples_per_frame: int
+
+    @property
+    def is_mpeg1(self) -> bool:
+        return self.version_bits == 3
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.channel_mode == _MONO else 2
+
+    @property
+    def side_info_size(self) -> int:
+        """Size of the Layer III side information after the header (and CRC)."""
+        if self.is_mpeg1:
+            return 17 if self.channel_mode == _MONO else 32
+        return 9 if self.channel_mode == _MONO else 17
+
+    @property
+    def stream_config(self) -> Tuple[int, int, int, int]:
+        """Fields that must match for frames to be concatenated."""
+        return (self.version_bits, self.layer, self.sample_rate, self.channels)
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """
+    Parse an MPEG audio frame header.
+
+    Args:
+        data: Buffer containing the frame
+        offset: Position of the header in the buffer
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid header
+    """
+    if offset + 4 > len(data):
+        return None
+    raw = struct.unpack('>I', data[offset:offset + 4])[0]
+    if raw & 0xFFE00000 != 0xFFE00000:
+        return None
+
+    version_bits = (raw >> 19) & 0x3
+    layer_bits = (raw >> 17) & 0x3
+    bitrate_index = (raw >> 12) & 0xF
+    sample_rate_index = (raw >> 10) & 0x3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        # Reserved values, or free-format streams we cannot measure
+        return None
+
+    layer = _LAYERS[layer_bits]
+    is_mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(is_mpeg1, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (raw >> 9) & 0x1
+
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 2 or is_mpeg1:
+        samples_per_frame = 1152
+        frame_length = 144 * bitrate * 1000 // sample_rate + padding
+    else:
+        samples_per_frame = 576
+        frame_length = 72 * bitrate * 1000 // sample_rate + padding
+
+    return FrameHeader(
+        raw=raw,
+        version_bits=version_bits,
+        layer=layer,
+        protected=not (raw >> 16) & 0x1,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        channel_mode=(raw >> 6) & 0x3,
+        frame_length=frame_length,
+        samples_per_frame=samples_per_frame
+    )
+
+def skip_id3v2(data: bytes) -> int:
+    """Return the offset of the first byte after any leading ID3v2 tags."""
+    offset = 0
+    while data[offset:offset + 3] == b'ID3' and offset + 10 <= len(data):
+        size_bytes = data[offset + 6:offset + 10]
+        size = 0
+        for b in size_bytes:
+            size = (size << 7) | (b & 0x7F)
+        footer = 10 if data[offset + 5] & 0x10 else 0
+        offset += 10 + size + footer
+    return offset
+
+def _find_sync(data: bytes, offset: int) -> Optional[Tuple[int, FrameHeader]]:
+    """Find the next position where two consecutive valid frame headers start."""
+    while True:
+        offset = data.find(b'\xff', offset)
+        if offset < 0:
+            return None
+        header = parse_frame_header(data, offset)
+        if header:
+            following = offset + header.frame_length
+            if following >= len(data) or parse_frame_header(data, following):
+                return offset, header
+        offset += 1
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, FrameHeader]]:
+    """
+    Iterate over the audio frames of an MP3 file.
+
+    Args:
+        data: Complete MP3 file contents
+
+    Yields:
+        (offset, header) for each complete frame, skipping tags and junk
+    """
+    offset = skip_id3v2(data)
+    while offset < len(data):
+        header = parse_frame_header(data, offset)
+        if not header:
+            found = _find_sync(data, offset)
+            if not found:
+                return
+            offset, header = found
+        if offset + header.frame_length > len(data):
+            # Truncated final frame
+            return
+        yield offset, header
+        offset += header.frame_length
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """Check whether a frame carries a Xing/Info or VBRI header instead of audio."""
+    if header.layer != 3:
+        return False
+    xing_offset = offset + 4 + (2 if header.protected else 0) + header.side_info_size
+    if data[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        return True
+    return data[offset + 36:offset + 40] == b'VBRI'
+
+def _read_info_frame(data: bytes, offset: int, header: FrameHeader) -> Optional[int]:
+    """Number of audio frames declared by a Xing/Info or VBRI header, if any."""
+    xing_offset = offset + 4 + (2 if header.protected else 0) + header.side_info_size
+    if data[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x1:
+            return struct.unpack('>I', data[xing_offset + 8:xing_offset + 12])[0]
+        return None
+    if data[offset + 36:offset + 40] == b'VBRI':
+        return struct.unpack('>I', data[offset + 50:offset + 54])[0]
+    return None
+
+def read_mp3_info(path: str, probe_bytes: int = 64 * 1024) -> Optional[dict]:
+    """
+    Read duration and stream format from MP3 headers without decoding audio.
+    
+    The frame count comes from a Xing/Info or VBRI header when present. For
+    constant bitrate streams without one, the duration is derived from the
+    audio size; otherwise every frame header is walked.
+    
+    Args:
+        path: Path to MP3 file
+        probe_bytes: How much of the file to read before falling back to a full scan
+        
+    Returns:
+        Dictionary with audio information (same keys as get_audio_info), or
+        None if the file is not a parseable MP3 stream
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        # Skip leading ID3v2 tags using only their 10-byte headers
+        start = 0
+        while True:
+            f.seek(start)
+            head = f.read(10)
+            if len(head) < 10 or head[:3] != b'ID3':
+                break
+            start += skip_id3v2(head)
+        f.seek(start)
+        data = f.read(probe_bytes)
+        if file_size >= 128:
+            f.seek(file_size - 128)
+            tail = f.read(3)
+        else:
+            tail = b''
+    
+    # The stream must start right after the tags (allowing zero padding),
+    # so other formats are never mistaken for MP3
+    offset = len(data) - len(data.lstrip(b'\0'))
+    found = _find_sync(data, offset)
+    if not found or found[0] != offset:
+        return None
+    header = found[1]
+    
+    frame_count = None
+    audio_start = start + offset
+    if header.layer == 3 and offset + header.frame_length <= len(data):
+        frame_count = _read_info_frame(data, offset, header)
+        if frame_count is None and is_info_frame(data, offset, header):
+            # Xing frame without a frame count; measure from the next frame
+            audio_start += header.frame_length
+            offset += header.frame_length
+        elif frame_count is not None:
+            audio_start += header.frame_length
+    
+    if frame_count is None:
+        audio_end = file_size - (128 if tail == b'TAG' else 0)
+        sample = []
+        for _, frame_header in iter_frames(data[offset:]):
+            sample.append(frame_header)
+            if len(sample) >= 32:
+                break
+        if not sample:
+            return None
+        
+        if len({h.bitrate for h in sample}) == 1 and len(sample) >= 32:
+            # Constant bitrate: every frame has (almost) the same length
+            duration = (audio_end - audio_start) * 8 / (header.bitrate * 1000.0)
+        else:
+            with open(path, 'rb') as f:
+                f.seek(audio_start)
+                frame_count = sum(1 for _ in iter_frames(f.read(audio_end - audio_start)))
+    
+    if frame_count is not None:
+        duration = frame_count * header.samples_per_frame / header.sample_rate
+    
+    return {
+        'duration': duration,
+        'frame_rate': header.sample_rate,
+        'channels': header.channels,
+        'sample_width': 2,
+        'file_size': file_size
+    }
+
+def _with_fields(header: FrameHeader, bitrate_index: Optional[int] = None) -> int:
+    """Header word for an unprotected, unpadded frame in the same stream configuration."""
+    raw = header.raw | 0x00010000  # no CRC
+    raw &= ~0x00000200  # no padding
+    if bitrate_index is not None:
+        raw = (raw & ~0x0000F000) | (bitrate_index << 12)
+    return raw
+
+@lru_cache(maxsize=32)
+def _silent_frame(raw_header: int) -> bytes:
+    header = parse_frame_header(struct.pack('>I', raw_header))
+    # All-zero side info and main data decode to digital silence
+    return struct.pack('>I', raw_header) + bytes(header.frame_length - 4)
+
+def make_silence(header: FrameHeader, duration_ms: int) -> bytes:
+    """
+    Build a block of silent Layer III frames matching a stream's configuration.
+
+    Args:
+        header: Header of a frame from the stream the silence will be inserted into
+        duration_ms: Length of the silence in milliseconds
+
+    Returns:
+        Encoded silent frames (empty if duration_ms rounds to zero frames)
+    """
+    return _silent_frame(_with_fields(header)) * _silence_frame_count(header, duration_ms)
+
+def _silence_frame_count(header: FrameHeader, duration_ms: int) -> int:
+    """Number of frames closest to the requested duration."""
+    if duration_ms <= 0:
+        return 0
+    frame_ms = header.samples_per_frame * 1000.0 / header.sample_rate
+    return int(round(duration_ms / frame_ms))
+
+def make_xing_frame(header: FrameHeader, frame_count: int, byte_count: int,
+                    vbr: bool = False) -> bytes:
+    """
+    Build a Xing/Info header frame describing a Layer III stream.
+
+    Args:
+        header: Header of a frame from the stream
+        frame_count: Number of audio frames that follow the Xing frame
+        byte_count: Size of the audio stream in bytes, including the Xing frame
+        vbr: Whether the stream has a variable bitrate ('Xing' instead of 'Info')
+
+    Returns:
+        Encoded Xing frame
+    """
+    side_info = header.side_info_size
+    needed = 4 + side_info + 16
+
+    # Pick the smallest bitrate whose frame fits the Xing payload
+    for bitrate_index in range(1, 15):
+        candidate = parse_frame_header(struct.pack('>I', _with_fields(header, bitrate_index)))
+        if candidate.frame_length >= needed:
+            break
+
+    frame = bytearray(candidate.frame_length)
+    frame[0:4] = struct.pack('>I', candidate.raw)
+    offset = 4 + side_info
+    frame[offset:offset + 4] = b'Xing' if vbr else b'Info'
+    # Flags: frame count and byte count present
+    struct.pack_into('>III', frame, offset + 4, 0x3, frame_count,
+                     byte_count + candidate.frame_length)
+    return bytes(frame)
+
+def read_audio_frames(path: str) -> Tuple[List[bytes], Optional[FrameHeader]]:
+    """
+    Read the audio frames of an MP3 file without tags or Xing/VBRI frames.
+
+    Args:
+        path: Path to MP3 file
+
+    Returns:
+        (frames, header of the first audio frame)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    frames = []
+    first_header = None
+    for offset, header in iter_frames(data):
+        if first_header is None and is_info_frame(data, offset, header):
+            continue
+        if first_header is None:
+            first_header = header
+        frames.append(data[offset:offset + header.frame_length])
+    return frames, first_header
+
+class Mp3StreamWriter:
+    """
+    Append MP3 files to an output stream frame by frame.
+
+    Every append is flushed, so the output can be played (or served) while
+    it grows. With `xing=True` an Info/Xing frame is reserved at the start
+    and filled in by close(); leave it off for files that are read while
+    they are written, since players trust the frame count in that header.
+
+    Example:
+        with Mp3StreamWriter(path) as writer:
+            for chunk_path in chunk_paths:
+                writer.append(chunk_path, gap_ms=500)
+    """
+
+    def __init__(self, output_path: str, xing: bool = False):
+        self.output_path = output_path
+        self.xing = xing
+        self.reference: Optional[FrameHeader] = None
+        self.frame_count = 0
+        self.byte_count = 0
+        self._bitrates = set()
+        self._out = open(output_path, 'wb')
+
+    def __enter__(self) -> 'Mp3StreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def duration(self) -> float:
+        """Duration written so far in seconds."""
+        if self.reference is None:
+            return 0.0
+        return self.frame_count * self.reference.samples_per_frame / self.reference.sample_rate
+
+    def append(self, path: str, gap_ms: int = 0) -> float:
+        """
+        Append the audio frames of an MP3 file, after a pause if there is earlier audio.
+
+        Args:
+            path: Path to MP3 file
+            gap_ms: Silence before the file in milliseconds (skipped for the first file)
+
+        Returns:
+            Time in seconds at which the appended audio starts
+
+        Raises:
+            ValueError: If the file has no MP3 frames or does not match the stream format
+        """
+        frames, header = read_audio_frames(path)
+        if not frames:
+            raise ValueError(f"No MP3 frames found in {path}")
+        if header.layer != 3:
+            raise ValueError(f"{path} is not an MPEG Layer III stream")
+
+        if self.reference is None:
+            self.reference = header
+            if self.xing:
+                # Reserve space for the Xing frame until the totals are known
+                self._out.write(make_xing_frame(header, 0, 0))
+        else:
+            if header.stream_config != self.reference.stream_config:
+                raise ValueError(f"{path} does not match the stream format of the output")
+            if gap_ms > 0:
+                silence = make_silence(self.reference, gap_ms)
+                self._out.write(silence)
+                self.frame_count += _silence_frame_count(self.reference, gap_ms)
+                self.byte_count += len(silence)
+                self._bitrates.add(self.reference.bitrate)
+
+        start = self.duration
+        for frame in frames:
+            self._out.write(frame)
+            self.byte_count += len(frame)
+            self._bitrates.add(parse_frame_header(frame).bitrate)
+        self.frame_count += len(frames)
+        self._out.flush()
+        return start
+
+    def close(self) -> None:
+        """Write the Xing frame (if reserved) and close the output."""
+        if self._out.closed:
+            return
+        try:
+            if self.xing and self.reference is not None:
+                # Rewrite the placeholder now that the totals are known
+                self._out.seek(0)
+                self._out.write(make_xing_frame(self.reference, self.frame_count, self.byte_count,
+                                                vbr=len(self._bitrates) > 1))
+        finally:
+            self._out.close()
+
+def concat_mp3_files(audio_files: List[str], output_path: str, gap_ms: int = 500) -> dict:
+    """
+    Concatenate MP3 files frame by frame, without decoding or re-encoding.
+
+    All inputs must be Layer III streams with the same MPEG version, sample
+    rate and channel count (as produced by a single TTS backend). Leading
+    Xing/LAME frames and tags are dropped, a silent frame block is inserted
+    between files and a new Info/Xing header frame is written for the result.
+
+    Args:
+        audio_files: List of MP3 file paths
+        output_path: Path to save the concatenated file
+        gap_ms: Silence between files in milliseconds
+
+    Returns:
+        Dictionary with audio information (same keys as get_audio_info)
+
+    Raises:
+        ValueError: If a file has no MP3 frames or the streams are incompatible
+    """
+    if not audio_files:
+        raise ValueError("No audio files to concatenate")
+
+    temp_path = f"{output_path}.part"
+    try:
+        with Mp3StreamWriter(temp_path, xing=True) as writer:
+            for path in audio_files:
+                writer.append(path, gap_ms)
+        os.replace(temp_path, output_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    reference = writer.reference
+    return {
+        'duration': writer.duration,
+        'frame_rate': reference.sample_rate,
+        'channels': reference.channels,
+        'sample_width': 2,
+        'file_size': os.path.getsize(output_path)
+    }
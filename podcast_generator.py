@@ -3,32 +3,425 @@ Advanced TTS and audio generation for podcast creation.
 """
 
 import os
-import tempfile
-from typing import Optional
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from config import (
     DEFAULT_LANGUAGE, DEFAULT_VOICE_SPEED,
-    MAX_AUDIO_CHUNK_SIZE, AUDIO_FORMAT
+    MAX_AUDIO_CHUNK_SIZE, MAX_TTS_WORKERS, AUDIO_FORMAT, AUDIO_QUALITY,
+    HLS_SEGMENT_SECONDS, OUTPUT_DIR
 )
-from utils import chunk_text_by_sentences, sanitize_text
-from audio_processor import merge_audio_files, normalize_audio, adjust_speed, add_metadata
+from utils import chunk_text_by_sentences, ensure_directory, sanitize_text
+from cache_manager import AudioCache, chunk_audio_cache, hls_segment_cache, podcast_cache
+from audio_processor import (
+    AudioPipeline, merge_audio_files, add_metadata, get_audio_duration, ffmpeg_available,
+    get_encoding_profile, EncodingProfile
+)
+from mp3_frames import Mp3StreamWriter
+from hls import segment_mp3, write_playlist, write_segment
+from workspace import JobWorkspace, output_path_for
+from checkpoint import CHUNK_DONE, ChunkCheckpoint
+from progress import (
+    CancellationToken, GenerationCancelled, ProgressCallback,
+    PLANNED, SYNTHESIZED, MERGING, DONE, report
+)
+from tts_backends import TTSBackend, get_backend
+from resilience import get_breaker, get_hedger
+from chunk_planner import get_latency_model, plan_chunks
 
 def generate_with_gtts(text: str, language: str, output_path: str) -> bool:
     """Generate audio using gTTS."""
     try:
-        from gtts import gTTS
-        tts = gTTS(text=text, lang=language, slow=False)
-        tts.save(output_path)
+        get_backend('gtts').synthesize(text, language, output_path)
         return True
     except Exception as e:
         print(f"gTTS error: {e}")
         return False
 
+def get_tts_backend_id(tts_backend: Optional[str] = None) -> str:
+    """Identify the TTS backend and version that produced chunk audio."""
+    return get_backend(tts_backend).backend_id()
+
+def _resolve_backend(tts_backend: Optional[str], language: str) -> Optional[TTSBackend]:
+    """The backend to synthesize with, or None (after printing why) if it cannot be used."""
+    try:
+        backend = get_backend(tts_backend)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return None
+    if not backend.supports_language(language):
+        print(f"ERROR: TTS backend '{backend.name}' does not support language '{language}'")
+        return None
+    return backend
+
+def chunk_cache_key(chunk: str, language: str, tts_backend: Optional[str] = None) -> str:
+    """Content address of a chunk's synthesized audio."""
+    text_hash = AudioCache.make_key(chunk)
+    return AudioCache.make_key(text_hash, language, get_tts_backend_id(tts_backend))
+
+def podcast_cache_key(cleaned_text: str, language: str, speed: float,
+                      audio_format: str = AUDIO_FORMAT, quality: str = AUDIO_QUALITY,
+                      tts_backend: Optional[str] = None) -> str:
+    """Content address of a finished podcast for the given render settings."""
+    profile = get_encoding_profile(audio_format, quality)
+    return AudioCache.make_key(AudioCache.make_key(cleaned_text), language,
+                               f"{speed:.2f}", profile.id, get_tts_backend_id(tts_backend))
+
+# Lock and number of holders or waiters, per podcast being rendered
+_render_locks: Dict[str, List] = {}
+_render_locks_guard = threading.Lock()
+
+@contextmanager
+def _render_lock(cache_key: str) -> Iterator[None]:
+    """Hold the lock shared by concurrent renders of the same podcast."""
+    with _render_locks_guard:
+        entry = _render_locks.setdefault(cache_key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _render_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _render_locks[cache_key]
+
+def _build_timeline(cleaned_text: str, chunks: List[str], results: List[Dict],
+                    gap_ms: int = 500) -> List[List[int]]:
+    """
+    Map each synthesized chunk to its character and time range in the podcast.
+    
+    Returns:
+        [start_char, end_char, start_ms, end_ms] per chunk, at normal speed
+    """
+    timeline = []
+    position = 0
+    time_ms = 0.0
+    for result in results:
+        chunk = chunks[result['index']]
+        start_char = cleaned_text.find(chunk, position)
+        if start_char < 0:
+            start_char = position
+        position = start_char + len(chunk)
+        if not result['path']:
+            continue
+        
+        if timeline:
+            time_ms += gap_ms
+        duration_ms = get_audio_duration(result['path']) * 1000
+        timeline.append([start_char, position, round(time_ms), round(time_ms + duration_ms)])
+        time_ms += duration_ms
+    return timeline
+
+def _scale_timeline(timeline: List[List[int]], speed: float) -> List[List[int]]:
+    """Adjust timeline times for a speed change."""
+    return [[start, end, round(start_ms / speed), round(end_ms / speed)]
+            for start, end, start_ms, end_ms in timeline]
+
+def _char_to_ms(position: int, timeline: List[List[int]]) -> Optional[int]:
+    """Estimate when a character position is spoken, within its chunk."""
+    for start, end, start_ms, end_ms in timeline:
+        if start <= position < end:
+            fraction = (position - start) / max(1, end - start)
+            return round(start_ms + fraction * (end_ms - start_ms))
+    return None
+
+def _plan_chapters(cleaned_text: str, headings: List[str], timeline: List[List[int]],
+                   total_ms: int, intro_title: str) -> List[tuple]:
+    """Chapters starting at each heading found in the spoken text."""
+    starts = []
+    search_from = 0
+    for heading in headings:
+        position = cleaned_text.find(heading, search_from)
+        if position < 0:
+            continue
+        search_from = position + len(heading)
+        start_ms = _char_to_ms(position, timeline)
+        if start_ms is not None and (not starts or start_ms > starts[-1][1]):
+            starts.append((heading, start_ms))
+    
+    if not starts:
+        return []
+    if starts[0][1] > 0:
+        starts.insert(0, (intro_title, 0))
+    
+    ends = [start_ms for _, start_ms in starts[1:]] + [total_ms]
+    return [(heading, start_ms, end_ms)
+            for (heading, start_ms), end_ms in zip(starts, ends) if end_ms > start_ms]
+
+def _publish_podcast(audio_path: str, output_path: str, cleaned_text: str,
+                     title: Optional[str], author: Optional[str], metadata: Optional[Dict],
+                     timeline: Optional[List[List[int]]], copy: bool = False) -> str:
+    """Move (or copy) a finished podcast to its job's output path and tag it."""
+    if copy:
+        shutil.copyfile(audio_path, output_path)
+    else:
+        shutil.move(audio_path, output_path)
+    
+    # ID3 tags and chapters only apply to MP3 files
+    if output_path.endswith('.mp3'):
+        _tag_podcast(output_path, cleaned_text, title, author, metadata, timeline)
+    return output_path
+
+def _tag_podcast(output_path: str, cleaned_text: str, title: Optional[str],
+                 author: Optional[str], metadata: Optional[Dict],
+                 timeline: Optional[List[List[int]]]) -> None:
+    """Write title, author, source and chapter tags to a finished podcast."""
+    metadata = metadata or {}
+    title = title or metadata.get('title')
+    if title:
+        chapters = []
+        if timeline and metadata.get('headings'):
+            total_ms = round(get_audio_duration(output_path) * 1000)
+            chapters = _plan_chapters(cleaned_text, metadata['headings'], timeline,
+                                      total_ms, title)
+        add_metadata(output_path, title,
+                     artist=author or metadata.get('author') or "Blog to Podcast",
+                     source_url=metadata.get('url'),
+                     date=metadata.get('date'),
+                     chapters=chapters)
+
+def get_cached_podcast(text: str, language: str = DEFAULT_LANGUAGE,
+                       speed: float = DEFAULT_VOICE_SPEED,
+                       title: Optional[str] = None,
+                       author: Optional[str] = None,
+                       metadata: Optional[Dict] = None,
+                       audio_format: str = AUDIO_FORMAT,
+                       quality: str = AUDIO_QUALITY,
+                       job_id: Optional[str] = None,
+                       tts_backend: Optional[str] = None) -> Optional[str]:
+    """
+    Return a previously rendered podcast for this content and settings.
+    
+    Args:
+        text: The blog content text
+        language: Language code (e.g., 'en', 'es', 'fr')
+        speed: Speech speed multiplier (0.5 to 2.0)
+        title: Podcast title for metadata
+        author: Author name for metadata
+        metadata: Blog metadata (url, date, headings) for tags and chapters
+        audio_format: Output format ('mp3' or 'opus')
+        quality: Encoding quality ('low', 'medium' or 'high')
+        job_id: Job the podcast is returned for (names the output file)
+        tts_backend: Name of the TTS backend (default: TTS_BACKEND)
+        
+    Returns:
+        Path to the audio file, or None if nothing is cached
+    """
+    cleaned_text = sanitize_text(text)
+    if not cleaned_text:
+        return None
+    
+    cache_key = podcast_cache_key(cleaned_text, language, speed, audio_format, quality,
+                                  tts_backend)
+    extension = get_encoding_profile(audio_format, quality).extension
+    cached_path = podcast_cache.get(cache_key, extension)
+    if not cached_path:
+        return None
+    
+    cached_meta = podcast_cache.get_meta(cache_key) or {}
+    try:
+        output_path = output_path_for(job_id or uuid.uuid4().hex, extension)
+        return _publish_podcast(cached_path, output_path, cleaned_text, title, author, metadata,
+                                cached_meta.get('timeline'), copy=True)
+    except OSError as e:
+        print(f"Error reading cached podcast: {e}")
+        return None
+
+def _synthesize_guarded(backend: TTSBackend, text: str, language: str, output_path: str) -> None:
+    """
+    Synthesize text through the backend's circuit breaker, hedging the call if it is slow.
+    
+    Each copy of a hedged call writes its own file; the first one finished
+    is moved to output_path. The losing copy's file is removed when it
+    finishes, and its failure counts against the breaker. The latency of a successful call is added to
+    the backend's latency model, which the chunk planner sizes chunks by.
+    """
+    breaker = get_breaker(backend.name)
+    breaker.before_call()
+    
+    def attempt(n: int) -> str:
+        path = f"{output_path}.{n}"
+        backend.synthesize(text, language, path)
+        return path
+    
+    def abandoned(n: int, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            breaker.record_failure(error)
+        try:
+            os.remove(f"{output_path}.{n}")
+        except OSError:
+            pass
+    
+    started = time.monotonic()
+    hedger = get_hedger(backend.name, backend.capabilities.max_concurrency)
+    try:
+        # Latency is tracked per 1000 characters; short chunks cost about the same as 500
+        path = hedger.call(attempt, cost=max(len(text), 500) / 1000, on_abandoned=abandoned)
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+    os.replace(path, output_path)
+    try:
+        get_latency_model(backend.name).observe(len(text), time.monotonic() - started)
+    except sqlite3.Error as e:
+        print(f"Could not record TTS latency: {e}")
+
+def _synthesize_chunk(index: int, chunk: str, language: str, output_path: str,
+                      use_cache: bool = True,
+                      cancel: Optional[CancellationToken] = None,
+                      tts_backend: Optional[str] = None) -> Dict:
+    """Synthesize a single chunk, reusing cached audio, and describe the outcome."""
+    result = {'index': index, 'path': None, 'error': None, 'cached': False}
+    if cancel and cancel.cancelled:
+        result['error'] = "Cancelled"
+        return result
+    backend = get_backend(tts_backend)
+    cache_key = chunk_cache_key(chunk, language, tts_backend) if use_cache else None
+    
+    if cache_key:
+        cached_path = chunk_audio_cache.get(cache_key)
+        if cached_path:
+            try:
+                shutil.copyfile(cached_path, output_path)
+                result['path'] = output_path
+                result['cached'] = True
+                return result
+            except OSError:
+                # Evicted between lookup and copy; synthesize it again
+                pass
+    
+    try:
+        _synthesize_guarded(backend, chunk, language, output_path)
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            result['path'] = output_path
+            if cache_key:
+                chunk_audio_cache.put(cache_key, output_path)
+        else:
+            result['error'] = f"{backend.name} produced no audio"
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    return result
+
+def _checkpoint_recorder(checkpoint: ChunkCheckpoint, chunk: str) -> Callable[[Future], None]:
+    """Callback that records the outcome of a chunk's synthesis in the checkpoint."""
+    def record(future: Future) -> None:
+        if not future.cancelled():
+            result = future.result()
+            checkpoint.record(result['index'], chunk, result['path'], result['error'])
+    return record
+
+def iter_synthesized_chunks(chunks: List[str], language: str, output_dir: str,
+                            max_workers: int = MAX_TTS_WORKERS,
+                            use_cache: bool = True,
+                            cancel: Optional[CancellationToken] = None,
+                            tts_backend: Optional[str] = None,
+                            checkpoint: Optional[ChunkCheckpoint] = None) -> Iterator[Dict]:
+    """
+    Synthesize text chunks concurrently, yielding each result as soon as it
+    and every chunk before it are done.
+    
+    Takes the same arguments as synthesize_chunks and yields the same result
+    dicts, in chunk order. No more chunks run at once than the backend
+    accepts. Closing the iterator early (or cancelling) drops
+    the chunks that have not been sent to TTS yet.
+    """
+    jobs = [(i, chunk) for i, chunk in enumerate(chunks) if chunk.strip()]
+    if not jobs:
+        return
+    
+    max_concurrency = get_backend(tts_backend).capabilities.max_concurrency
+    workers = max(1, min(max_workers, max_concurrency, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for i, chunk in jobs:
+            resumed_path = checkpoint.completed_path(i, chunk) if checkpoint else None
+            if resumed_path:
+                future = Future()
+                future.set_result({'index': i, 'path': resumed_path, 'error': None, 'cached': True})
+            else:
+                future = executor.submit(_synthesize_chunk, i, chunk, language,
+                                         os.path.join(output_dir, f"chunk_{i}.mp3"), use_cache,
+                                         cancel, tts_backend)
+                if checkpoint:
+                    # Recorded when the chunk finishes, even if an earlier chunk is still running
+                    future.add_done_callback(_checkpoint_recorder(checkpoint, chunk))
+            futures.append(future)
+        try:
+            # Yield in submission order so playback and the merge keep the chunk order
+            for future in futures:
+                yield future.result()
+        finally:
+            # Nobody is waiting for the rest (abandoned or cancelled); skip what has not started
+            for future in futures:
+                future.cancel()
+
+def synthesize_chunks(chunks: List[str], language: str, output_dir: str,
+                      max_workers: int = MAX_TTS_WORKERS,
+                      use_cache: bool = True,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel: Optional[CancellationToken] = None,
+                      tts_backend: Optional[str] = None,
+                      checkpoint: Optional[ChunkCheckpoint] = None) -> List[Dict]:
+    """
+    Synthesize text chunks concurrently with a bounded worker pool.
+    
+    Args:
+        chunks: Text chunks in playback order
+        language: Language code (e.g., 'en', 'es', 'fr')
+        output_dir: Directory to write the chunk MP3 files to
+        max_workers: Maximum number of chunks synthesized at the same time
+        use_cache: Whether to reuse and store audio in the chunk audio cache
+        progress: Called with 'planned' and 'synthesized' progress events
+        cancel: Token that stops chunks from being sent to TTS
+        tts_backend: Name of the TTS backend (default: TTS_BACKEND)
+        checkpoint: Records each chunk as it finishes; chunks it already
+            records as done are reused instead of synthesized
+        
+    Returns:
+        One result dict per non-empty chunk, in chunk order, with 'index',
+        'path' (None on failure), 'error' (None on success) and 'cached' keys
+    """
+    total = sum(1 for chunk in chunks if chunk.strip())
+    report(progress, PLANNED, 0, total)
+    results = []
+    for result in iter_synthesized_chunks(chunks, language, output_dir, max_workers,
+                                          use_cache, cancel, tts_backend, checkpoint):
+        results.append(result)
+        report(progress, SYNTHESIZED, len(results), total)
+    return results
+
 def generate_podcast(text: str, language: str = DEFAULT_LANGUAGE, 
                     speed: float = DEFAULT_VOICE_SPEED,
                     title: Optional[str] = None,
-                    author: Optional[str] = None) -> Optional[str]:
+                    author: Optional[str] = None,
+                    metadata: Optional[Dict] = None,
+                    audio_format: str = AUDIO_FORMAT,
+                    quality: str = AUDIO_QUALITY,
+                    hls: bool = False,
+                    job_id: Optional[str] = None,
+                    progress: Optional[ProgressCallback] = None,
+                    cancel: Optional[CancellationToken] = None,
+                    tts_backend: Optional[str] = None,
+                    allow_partial: bool = False) -> Optional[str]:
     """
-    Generate a podcast (MP3 audio file) from blog text using Google Text-to-Speech (gTTS).
+    Generate a podcast (MP3 audio file) from blog text using a TTS backend.
+    
+    A podcast already rendered for the same content and settings is returned
+    from the podcast cache without running the pipeline again. With `hls`
+    the podcast is written as HLS segments instead (see generate_hls).
+    
+    Each chunk is checkpointed in the job's workspace as soon as it is
+    synthesized. If any chunk fails (or the process dies), the workspace is
+    kept, and calling again with the same job_id synthesizes only the
+    missing and failed chunks.
     
     Args:
         text: The blog content text
@@ -36,98 +429,512 @@ def generate_podcast(text: str, language: str = DEFAULT_LANGUAGE,
         speed: Speech speed multiplier (0.5 to 2.0)
         title: Podcast title for metadata
         author: Author name for metadata
+        metadata: Blog metadata (url, date, headings) for tags and chapters
+        audio_format: Output format ('mp3' or 'opus')
+        quality: Encoding quality ('low', 'medium' or 'high')
+        hls: Emit HLS segments and a playlist instead of a single file
+            (always MP3)
+        job_id: Unique job ID (default: a new one); intermediate files go
+            in the job's own workspace and the output is named after it.
+            Pass the ID of a failed render to resume it
+        progress: Called with a ProgressEvent as chunks are planned and
+            synthesized, and as the audio is merged, processed and encoded
+        cancel: Token that stops the generation; pending TTS calls are
+            skipped and None is returned
+        tts_backend: Name of the TTS backend (default: TTS_BACKEND)
+        allow_partial: Produce the podcast even if some chunks failed,
+            leaving them out (by default nothing is produced)
         
     Returns:
-        Path to the generated MP3 file, or None if failed
+        Path to the generated audio file (or HLS playlist), or None if failed
     """
+    if hls:
+        return generate_hls(text, language, speed, quality=quality, job_id=job_id,
+                            tts_backend=tts_backend, allow_partial=allow_partial,
+                            progress=progress, cancel=cancel)
+    
     # Clean the text
     cleaned_text = sanitize_text(text)
     
-    if not cleaned_text:
+    if not cleaned_text or not _resolve_backend(tts_backend, language):
         return None
     
-    # Split into chunks if needed
-    if len(cleaned_text) > MAX_AUDIO_CHUNK_SIZE:
-        chunks = chunk_text_by_sentences(cleaned_text, MAX_AUDIO_CHUNK_SIZE)
-    else:
-        chunks = [cleaned_text]
+    # Concurrent requests for the same podcast wait for a single render
+    profile = get_encoding_profile(audio_format, quality)
+    cache_key = podcast_cache_key(cleaned_text, language, speed, audio_format, quality,
+                                  tts_backend)
+    with _render_lock(cache_key):
+        job_id = job_id or uuid.uuid4().hex
+        cached_path = get_cached_podcast(cleaned_text, language, speed, title, author, metadata,
+                                         audio_format, quality, job_id, tts_backend)
+        if cached_path:
+            report(progress, DONE)
+            return cached_path
+        
+        workspace = JobWorkspace(job_id)
+        try:
+            output_path = _render_podcast(cleaned_text, language, speed, title, author, metadata,
+                                          cache_key, profile, workspace, progress, cancel,
+                                          tts_backend, allow_partial)
+        except GenerationCancelled:
+            print("Podcast generation cancelled")
+            workspace.cleanup()
+            return None
+        # A failed render keeps its checkpointed chunks for a resumed run (abandoned
+        # workspaces are collected after WORKSPACE_MAX_AGE_HOURS)
+        if output_path:
+            workspace.cleanup()
+        return output_path
+
+def _split_text(cleaned_text: str, max_chars: int = MAX_AUDIO_CHUNK_SIZE) -> List[str]:
+    """Split text into chunks the TTS backend accepts."""
+    max_chars = min(max_chars, MAX_AUDIO_CHUNK_SIZE)
+    if len(cleaned_text) > max_chars:
+        return chunk_text_by_sentences(cleaned_text, max_chars)
+    return [cleaned_text]
+
+def _plan_chunks(cleaned_text: str, backend: TTSBackend) -> List[str]:
+    """
+    Split text into chunks sized for time to first audio and parallelism.
+    
+    The first chunk is short; the rest are spread over the TTS calls that
+    can run at once, but not below the smallest chunk worth a call for the
+    backend's measured latency (a fixed size that rarely changes, so the
+    chunks and their cache keys are stable from run to run).
+    """
+    concurrency = min(MAX_TTS_WORKERS, backend.capabilities.max_concurrency)
+    try:
+        min_chars = get_latency_model(backend.name).chunk_floor()
+    except sqlite3.Error as e:
+        print(f"Could not read TTS latency, using fixed-size chunks: {e}")
+        return _split_text(cleaned_text, backend.capabilities.max_chars)
+    return plan_chunks(cleaned_text, min(backend.capabilities.max_chars, MAX_AUDIO_CHUNK_SIZE),
+                       concurrency, min_chars)
+
+def stream_podcast(text: str, language: str = DEFAULT_LANGUAGE,
+                   speed: float = DEFAULT_VOICE_SPEED,
+                   title: Optional[str] = None,
+                   author: Optional[str] = None,
+                   metadata: Optional[Dict] = None,
+                   output_path: Optional[str] = None,
+                   quality: str = AUDIO_QUALITY,
+                   job_id: Optional[str] = None,
+                   progress: Optional[ProgressCallback] = None,
+                   cancel: Optional[CancellationToken] = None,
+                   tts_backend: Optional[str] = None,
+                   allow_partial: bool = False) -> Iterator[Dict]:
+    """
+    Generate a podcast progressively, yielding each part as soon as it is playable.
     
-    audio_files = []
-    temp_dir = tempfile.gettempdir()
+    Chunks are synthesized concurrently as in generate_podcast, but every
+    chunk is speed-adjusted and loudness-normalized on its own and appended
+    to the output file as soon as it and the chunks before it are done, so
+    playback can start after the first chunk instead of the whole post. The
+    output file grows while it is played; it is tagged when the stream ends.
     
-    # Generate audio for each chunk using gTTS
-    for i, chunk in enumerate(chunks):
-        if not chunk.strip():
-            continue
+    Without ffmpeg the parts are appended as synthesized, like the
+    frame-level fallback of generate_podcast. Like generate_podcast, the
+    stream holds the render lock of the podcast, so concurrent requests for
+    it wait for one render; a complete, processed stream is stored in the
+    podcast cache, and a cached podcast is yielded as a single part. Chunks
+    are checkpointed in the job's workspace, which is kept if a chunk fails,
+    so the stream can be resumed with the same job_id.
+    
+    Args:
+        text: The blog content text
+        language: Language code (e.g., 'en', 'es', 'fr')
+        speed: Speech speed multiplier (0.5 to 2.0)
+        title: Podcast title for metadata
+        author: Author name for metadata
+        metadata: Blog metadata (url, date, headings) for tags and chapters
+        output_path: Path of the growing MP3 file (default: the job's output path)
+        quality: MP3 encoding quality ('low', 'medium' or 'high')
+        job_id: Unique job ID (default: a new one)
+        progress: Called with a ProgressEvent as chunks are planned and synthesized
+        cancel: Token that ends the stream; pending TTS calls are skipped
+            and the output file is removed
+        tts_backend: Name of the TTS backend (default: TTS_BACKEND)
+        allow_partial: Carry on past failed chunks, leaving them out (by
+            default the stream ends at the first failed chunk and the
+            output file is removed)
         
-        temp_file = os.path.join(temp_dir, f"chunk_{i}.mp3")
-        success = generate_with_gtts(chunk, language, temp_file)
+    Yields:
+        One dict per chunk, in order, with 'index', 'path' (a playable MP3
+        of just that part, kept until the stream ends; None on failure),
+        'error', 'start_ms' and 'end_ms' (position in the output) and
+        'output_path'
+    """
+    cleaned_text = sanitize_text(text)
+    backend = _resolve_backend(tts_backend, language) if cleaned_text else None
+    if not backend:
+        return
+    
+    cache_key = podcast_cache_key(cleaned_text, language, speed, 'mp3', quality, tts_backend)
+    with _render_lock(cache_key):
+        job_id = job_id or uuid.uuid4().hex
+        cached_path = get_cached_podcast(cleaned_text, language, speed, title, author, metadata,
+                                         'mp3', quality, job_id, tts_backend)
+        if cached_path:
+            if output_path:
+                shutil.move(cached_path, output_path)
+                cached_path = output_path
+            report(progress, DONE)
+            yield {'index': 0, 'path': cached_path, 'error': None, 'start_ms': 0,
+                   'end_ms': round(get_audio_duration(cached_path) * 1000),
+                   'output_path': cached_path}
+            return
+        yield from _stream_render(cleaned_text, backend, language, speed, title, author, metadata,
+                                  output_path, quality, cache_key, JobWorkspace(job_id), progress,
+                                  cancel, tts_backend, allow_partial)
+
+def _stream_render(cleaned_text: str, backend: TTSBackend, language: str, speed: float,
+                   title: Optional[str], author: Optional[str], metadata: Optional[Dict],
+                   output_path: Optional[str], quality: str, cache_key: str,
+                   workspace: JobWorkspace, progress: Optional[ProgressCallback],
+                   cancel: Optional[CancellationToken], tts_backend: Optional[str],
+                   allow_partial: bool) -> Iterator[Dict]:
+    """Synthesize, process and append the parts of a streamed podcast in a job workspace."""
+    # Split into chunks, the same ones again when resuming
+    checkpoint = ChunkCheckpoint(workspace.dir, cache_key)
+    chunks = checkpoint.plan
+    if not chunks:
+        chunks = _plan_chunks(cleaned_text, backend)
+        checkpoint.set_plan(chunks)
+    resumed = checkpoint.counts()[CHUNK_DONE]
+    if resumed:
+        print(f"Resuming job {workspace.job_id}: {resumed} chunks already synthesized")
+    
+    output_path = output_path or workspace.output_path('mp3')
+    gap_ms = round(500 / speed)
+    profile = get_encoding_profile('mp3', quality)
+    process = True
+    timeline = []
+    position = 0
+    
+    total = sum(1 for chunk in chunks if chunk.strip())
+    report(progress, PLANNED, 0, total)
+    failed = False
+    cancelled = False
+    complete = True
+    # Kept for a resumed run if a chunk fails or the render crashes
+    keep_workspace = False
+    
+    try:
+        with Mp3StreamWriter(output_path) as writer:
+            results = iter_synthesized_chunks(chunks, language, workspace.dir, cancel=cancel,
+                                              tts_backend=tts_backend, checkpoint=checkpoint)
+            for done, result in enumerate(results, 1):
+                if cancel and cancel.cancelled:
+                    cancelled = True
+                    break
+                chunk = chunks[result['index']]
+                start_char = cleaned_text.find(chunk, position)
+                if start_char < 0:
+                    start_char = position
+                position = start_char + len(chunk)
+                part = {'index': result['index'], 'path': None, 'error': result['error'],
+                        'start_ms': None, 'end_ms': None, 'output_path': output_path}
+                
+                if result['path'] and process:
+                    processed_path = workspace.path(f"part_{result['index']}.mp3")
+                    try:
+                        (AudioPipeline([result['path']]).speed(speed).normalize_loudness()
+                         .run(processed_path, profile=profile))
+                        part['path'] = processed_path
+                    except Exception as e:
+                        if writer.reference is not None:
+                            # Earlier parts were processed; mixing formats would break the stream
+                            part['error'] = f"Audio processing failed: {e}"
+                        else:
+                            print(f"WARNING: Audio processing failed (ffmpeg may be required). Streaming without post-processing. ({e})")
+                            process = False
+                if result['path'] and not process:
+                    part['path'] = result['path']
+                
+                if part['path']:
+                    try:
+                        start = writer.append(part['path'], gap_ms)
+                        part['start_ms'] = round(start * 1000)
+                        part['end_ms'] = round(writer.duration * 1000)
+                        timeline.append([start_char, position, part['start_ms'], part['end_ms']])
+                    except ValueError as e:
+                        part['path'] = None
+                        part['error'] = str(e)
+                if part['error']:
+                    complete = False
+                    print(f"Failed to generate audio for chunk {part['index']}: {part['error']}")
+                report(progress, SYNTHESIZED, done, total)
+                yield part
+                if part['error'] and not allow_partial:
+                    failed = True
+                    break
         
-        if success and os.path.exists(temp_file):
-            audio_files.append(temp_file)
-        else:
-            print(f"Failed to generate audio for chunk {i} using gTTS")
+        if cancelled:
+            # A truncated file would look like a finished podcast
+            os.remove(output_path)
+            return
+        if failed:
+            # The parts so far are all right, but the podcast would have a hole
+            print(f"ERROR: Stopped at the failed chunk; the incomplete podcast was removed. Run "
+                  f"again with job_id='{workspace.job_id}' to synthesize only the missing chunks.")
+            os.remove(output_path)
+            keep_workspace = True
+            return
+        # Only complete, processed renders are reused by later requests
+        if complete and process and timeline:
+            podcast_cache.put(cache_key, output_path, meta={'timeline': timeline}, extension='mp3')
+        if timeline:
+            _tag_podcast(output_path, cleaned_text, title, author, metadata, timeline)
+        report(progress, DONE)
+    except Exception:
+        keep_workspace = True
+        raise
+    finally:
+        if not keep_workspace:
+            workspace.cleanup()
+
+def _hls_chunk_key(previous_key: str, chunk: str, language: str, speed: float,
+                   profile_id: str, processed: bool, tts_backend: Optional[str] = None) -> str:
+    """Content address of a chunk's HLS segments, covering every chunk before it."""
+    return AudioCache.make_key(previous_key, chunk_cache_key(chunk, language, tts_backend),
+                               f"{speed:.2f}",
+                               profile_id, 'processed' if processed else 'raw')
+
+def _cached_hls_segments(chunk_key: str) -> Optional[List[Tuple[str, str, float]]]:
+    """(segment key, cached path, duration) of every cached segment of a chunk, or None."""
+    segments = []
+    while True:
+        segment_key = AudioCache.make_key(chunk_key, len(segments))
+        path = hls_segment_cache.get(segment_key)
+        meta = hls_segment_cache.get_meta(segment_key) if path else None
+        if not meta:
+            return None
+        segments.append((segment_key, path, meta['duration']))
+        if meta.get('last'):
+            return segments
+
+def generate_hls(text: str, language: str = DEFAULT_LANGUAGE,
+                 speed: float = DEFAULT_VOICE_SPEED,
+                 output_dir: Optional[str] = None,
+                 segment_seconds: float = HLS_SEGMENT_SECONDS,
+                 quality: str = AUDIO_QUALITY,
+                 job_id: Optional[str] = None,
+                 tts_backend: Optional[str] = None,
+                 allow_partial: bool = False,
+                 progress: Optional[ProgressCallback] = None,
+                 cancel: Optional[CancellationToken] = None) -> Optional[str]:
+    """
+    Generate a podcast as HLS: fixed-duration MP3 segments plus an m3u8 playlist.
+    
+    Segments never cross a chunk boundary, and each chunk is speed-adjusted
+    and loudness-normalized on its own, so a chunk's segments depend only on
+    the text up to and including that chunk. They are cached and named by
+    that content address: renders that differ only at the end share their
+    leading segments, and only the chunks after the first difference are
+    synthesized again.
+    
+    Args:
+        text: The blog content text
+        language: Language code (e.g., 'en', 'es', 'fr')
+        speed: Speech speed multiplier (0.5 to 2.0)
+        output_dir: Directory for the playlist and segments (default: the
+            'hls' directory in OUTPUT_DIR, shared by all jobs)
+        segment_seconds: Target segment duration in seconds
+        quality: MP3 encoding quality ('low', 'medium' or 'high')
+        job_id: Unique job ID (default: a new one); names the playlist
+        tts_backend: Name of the TTS backend (default: TTS_BACKEND)
+        allow_partial: Leave failed chunks out of the playlist (by default
+            no playlist is written if any chunk fails; the segments of the
+            chunks before it stay cached)
+        progress: Called with a ProgressEvent as chunks are planned and
+            synthesized (cached chunks count as synthesized)
+        cancel: Token that stops the generation; pending TTS calls are
+            skipped, no playlist is written and None is returned
+        
+    Returns:
+        Path to the m3u8 playlist, or None if failed
+    """
+    cleaned_text = sanitize_text(text)
+    backend = _resolve_backend(tts_backend, language) if cleaned_text else None
+    if not backend:
+        return None
+    
+    # Fixed-size chunks, not the chunk planner's: segments are cached by the
+    # chunks before them, so the split must not change as latency is measured
+    chunks = [chunk for chunk in _split_text(cleaned_text, backend.capabilities.max_chars)
+              if chunk.strip()]
+    output_dir = output_dir or os.path.join(OUTPUT_DIR, 'hls')
+    ensure_directory(output_dir)
+    processed = ffmpeg_available()
+    profile = get_encoding_profile('mp3', quality)
+    gap_ms = round(500 / speed)
+    
+    chunk_keys = []
+    previous_key = ''
+    for chunk in chunks:
+        previous_key = _hls_chunk_key(previous_key, chunk, language, speed, profile.id, processed,
+                                      tts_backend)
+        chunk_keys.append(previous_key)
+    cached = [_cached_hls_segments(key) for key in chunk_keys]
+    
+    # Only chunks without cached segments are synthesized (empty chunks are skipped)
+    workspace = JobWorkspace(job_id)
+    pending = [chunk if segments is None else '' for chunk, segments in zip(chunks, cached)]
+    results = iter_synthesized_chunks(pending, language, workspace.dir, cancel=cancel,
+                                      tts_backend=tts_backend)
+    report(progress, PLANNED, 0, len(chunks))
+    
+    playlist = []
+    position = 0.0
+    # Segment timestamps depend on every earlier chunk, so nothing is cached after a failure
+    cacheable = True
+    try:
+        for i, chunk_key in enumerate(chunk_keys):
+            if cancel:
+                cancel.raise_if_cancelled()
+            if cached[i] is not None:
+                for segment_key, path, duration in cached[i]:
+                    segment_path = os.path.join(output_dir, f"{segment_key}.mp3")
+                    with open(path, 'rb') as f:
+                        write_segment(segment_path, f.read())
+                    playlist.append((os.path.basename(segment_path), duration))
+                    position += duration
+                report(progress, SYNTHESIZED, i + 1, len(chunks))
+                continue
+            
+            result = next(results)
+            if cancel:
+                cancel.raise_if_cancelled()
+            report(progress, SYNTHESIZED, i + 1, len(chunks))
+            if not result['path']:
+                print(f"Failed to generate audio for chunk {result['index']}: {result['error']}")
+                if not allow_partial:
+                    return None
+                cacheable = False
+                continue
+            
+            part_path = result['path']
+            if processed:
+                try:
+                    part_path = workspace.path(f"part_{i}.mp3")
+                    (AudioPipeline([result['path']]).speed(speed).normalize_loudness()
+                     .run(part_path, profile=profile))
+                except Exception as e:
+                    print(f"WARNING: Audio processing failed for chunk {i}; using it unprocessed. ({e})")
+                    part_path = result['path']
+                    cacheable = False
+            
+            segments = segment_mp3(part_path, segment_seconds, start_seconds=position,
+                                   lead_silence_ms=gap_ms if playlist else 0)
+            for j, (data, duration) in enumerate(segments):
+                segment_key = AudioCache.make_key(chunk_key, j)
+                segment_path = os.path.join(output_dir, f"{segment_key}.mp3")
+                write_segment(segment_path, data)
+                if cacheable:
+                    hls_segment_cache.put(segment_key, segment_path,
+                                          meta={'duration': duration, 'last': j == len(segments) - 1})
+                playlist.append((os.path.basename(segment_path), duration))
+                position += duration
+    except GenerationCancelled:
+        print("Podcast generation cancelled")
+        return None
+    finally:
+        results.close()
+        workspace.cleanup()
+    
+    if not playlist:
+        print(f"ERROR: No audio generated. Total chunks: {len(chunks)}")
+        return None
+    
+    playlist_path = os.path.join(output_dir, f"podcast_{workspace.job_id}.m3u8")
+    write_playlist(playlist_path, playlist)
+    report(progress, DONE)
+    return playlist_path
+
+def _render_podcast(cleaned_text: str, language: str, speed: float,
+                    title: Optional[str], author: Optional[str],
+                    metadata: Optional[Dict], cache_key: str,
+                    profile: EncodingProfile, workspace: JobWorkspace,
+                    progress: Optional[ProgressCallback] = None,
+                    cancel: Optional[CancellationToken] = None,
+                    tts_backend: Optional[str] = None,
+                    allow_partial: bool = False) -> Optional[str]:
+    """Run the full TTS, merge and post-processing pipeline in a job workspace."""
+    # Split into chunks, the same ones again when resuming
+    checkpoint = ChunkCheckpoint(workspace.dir, cache_key)
+    chunks = checkpoint.plan
+    if not chunks:
+        chunks = _plan_chunks(cleaned_text, get_backend(tts_backend))
+        checkpoint.set_plan(chunks)
+    
+    # Generate audio for all chunks with the TTS backend
+    resumed = checkpoint.counts()[CHUNK_DONE]
+    if resumed:
+        print(f"Resuming job {workspace.job_id}: {resumed} chunks already synthesized")
+    results = synthesize_chunks(chunks, language, workspace.dir, progress=progress, cancel=cancel,
+                                tts_backend=tts_backend, checkpoint=checkpoint)
+    if cancel:
+        cancel.raise_if_cancelled()
+    audio_files = [r['path'] for r in results if r['path']]
+    failures = [r for r in results if not r['path']]
+    for failure in failures:
+        print(f"Failed to generate audio for chunk {failure['index']}: {failure['error']}")
+    if failures and not allow_partial:
+        print(f"ERROR: {len(failures)} of {len(results)} chunks failed. Run again with "
+              f"job_id='{workspace.job_id}' to synthesize only those chunks.")
+        return None
+    if failures and audio_files:
+        print(f"WARNING: {len(failures)} of {len(results)} chunks failed; podcast will be incomplete.")
+    complete = not failures
     
     if not audio_files:
         print(f"ERROR: No audio files generated. Total chunks: {len(chunks)}")
         return None
     
-    # Merge audio files if multiple chunks
-    if len(audio_files) == 1:
-        final_audio_path = audio_files[0]
-    else:
-        merge_output_path = os.path.join(temp_dir, 'blog_podcast_merged.mp3')
-        merged_path = merge_audio_files(audio_files, merge_output_path)
-        
-        # Check if merge was successful (merged_path will be merge_output_path if successful, or first chunk if failed)
-        if merged_path == merge_output_path and os.path.exists(merged_path) and os.path.getsize(merged_path) > 0:
-            # Merge succeeded
-            final_audio_path = merged_path
-            # Clean up individual chunk files
-            for f in audio_files:
-                try:
-                    if f != final_audio_path:
-                        os.unlink(f)
-                except:
-                    pass
-        else:
-            # Merge failed (likely due to missing ffmpeg), use returned path (first chunk)
-            print("WARNING: Audio merge failed (ffmpeg may be required). Using first chunk only.")
-            final_audio_path = merged_path  # This should be audio_files[0] from fallback
-            # Clean up other chunk files
-            for f in audio_files[1:]:
-                try:
-                    os.unlink(f)
-                except:
-                    pass
-    
-    # Apply speed adjustment if needed
-    if speed != 1.0:
-        speed_adjusted_path = os.path.join(temp_dir, 'blog_podcast_speed.mp3')
-        adjust_speed(final_audio_path, speed, speed_adjusted_path)
-        if os.path.exists(speed_adjusted_path):
-            if final_audio_path != audio_files[0]:  # Don't delete if it was the original chunk
-                try:
-                    os.unlink(final_audio_path)
-                except:
-                    pass
-            final_audio_path = speed_adjusted_path
+    timeline = _build_timeline(cleaned_text, chunks, results, gap_ms=500)
     
-    # Normalize audio
-    normalize_audio(final_audio_path, final_audio_path)
+    # Loudness statistics measured when the chunk audio was first rendered
+    chunk_keys = [chunk_cache_key(chunks[r['index']], language, tts_backend)
+                  for r in results if r['path']]
+    chunk_stats = [(chunk_audio_cache.get_meta(key) or {}).get('loudness') for key in chunk_keys]
     
-    # Add metadata if provided
-    if title:
-        add_metadata(final_audio_path, title, artist=author or "Blog to Podcast")
+    # Merge, speed-adjust and normalize with one decode and one encode
+    pipeline = (AudioPipeline(audio_files, gap_ms=500, chunk_stats=chunk_stats)
+                .speed(speed).normalize_loudness())
+    rendered_path = workspace.path(f'rendered.{profile.extension}')
+    extension = profile.extension
+    try:
+        report(progress, MERGING)
+        pipeline.run(rendered_path, profile=profile, progress=progress, cancel=cancel)
+        final_audio_path = rendered_path
+        timeline = _scale_timeline(timeline, speed)
+        # Keep new statistics with the cached chunks so later renders skip measuring
+        for key, cached, measured in zip(chunk_keys, chunk_stats, pipeline.chunk_stats):
+            if cached is None and measured is not None:
+                chunk_audio_cache.set_meta(key, {'loudness': measured})
+    except GenerationCancelled:
+        raise
+    except Exception as e:
+        # Decoding failed (likely due to missing ffmpeg); join the MP3 frames
+        # as they are, without speed adjustment or normalization
+        print(f"WARNING: Audio processing failed (ffmpeg may be required). Merging without post-processing. ({e})")
+        complete = False
+        # The chunks are joined as synthesized, so the result is MP3 whatever the profile
+        extension = 'mp3'
+        rendered_path = workspace.path('rendered.mp3')
+        final_audio_path = merge_audio_files(audio_files, rendered_path, method='frames')
+        if final_audio_path != rendered_path:
+            # Never publish a podcast missing chunks; the workspace is kept for a resumed run
+            print(f"ERROR: Could not merge the chunks. Run again with job_id='{workspace.job_id}' "
+                  f"to merge the synthesized chunks.")
+            return None
     
-    # Rename to final output path
-    output_path = os.path.join(temp_dir, 'blog_podcast.mp3')
-    if final_audio_path != output_path:
-        try:
-            if os.path.exists(output_path):
-                os.unlink(output_path)
-            os.rename(final_audio_path, output_path)
-        except:
-            output_path = final_audio_path
+    # Only complete renders are reused by later requests
+    if complete:
+        podcast_cache.put(cache_key, final_audio_path, meta={'timeline': timeline},
+                          extension=extension)
     
+    output_path = _publish_podcast(final_audio_path, workspace.output_path(extension), cleaned_text,
+                                   title, author, metadata, timeline)
+    report(progress, DONE)
     return output_path
@@ -0,0 +1,77 @@
+"""
+Progress reporting and cooperative cancellation for podcast generation.
+"""
+
+import threading
+from typing import Callable, NamedTuple, Optional
+
+# Stages in the order a generation goes through them
+PLANNED = 'planned'
+SYNTHESIZED = 'synthesized'
+MERGING = 'merging'
+PROCESSING = 'processing'
+ENCODING = 'encoding'
+DONE = 'done'
+
+class ProgressEvent(NamedTuple):
+    """One step of a generation: `completed` of `total` units of `stage` are done."""
+    stage: str
+    completed: int
+    total: int
+
+    @property
+    def fraction(self) -> float:
+        """Overall progress of the generation from 0.0 to 1.0."""
+        start, end = _STAGE_SPANS[self.stage]
+        done = self.completed / self.total if self.total else 1.0
+        return start + (end - start) * min(1.0, done)
+
+# Share of the overall progress taken by each stage (synthesis dominates)
+_STAGE_SPANS = {
+    PLANNED: (0.0, 0.0),
+    SYNTHESIZED: (0.0, 0.8),
+    MERGING: (0.8, 0.8),
+    PROCESSING: (0.8, 0.95),
+    ENCODING: (0.95, 0.95),
+    DONE: (1.0, 1.0),
+}
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+def report(callback: Optional[ProgressCallback], stage: str, completed: int = 0,
+           total: int = 1) -> None:
+    """Send a progress event if there is a callback; callback errors never stop a job."""
+    if callback is None:
+        return
+    try:
+        callback(ProgressEvent(stage, completed, total))
+    except Exception as e:
+        print(f"Error reporting progress: {e}")
+
+class GenerationCancelled(Exception):
+    """Raised inside a generation once its cancellation token is cancelled."""
+
+class CancellationToken:
+    """
+    Flag that asks a running generation to stop.
+
+    Checked before every TTS call and between processing steps: chunks not
+    yet sent to TTS are skipped, so a cancelled job stops using TTS quota
+    and CPU after the calls already in flight.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the generation to stop."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise GenerationCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise GenerationCancelled()
@@ -0,0 +1,242 @@
+"""
+Rate limiting and retries for calls to external services (TTS).
+
+The token bucket lives in a SQLite database, so every thread and process on
+the machine (app sessions, job workers, batch workers) draws from the same
+budget. Its rate adapts: it halves when the service throttles us and creeps
+back up after each successful call, settling near the highest rate the
+service accepts.
+"""
+
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from config import (
+    TTS_RATE_LIMIT_DB, TTS_RATE_PER_SECOND, TTS_RATE_MIN_PER_SECOND, TTS_RATE_MAX_PER_SECOND,
+    TTS_RATE_STEP, TTS_RATE_BURST, TTS_MAX_RETRIES, TTS_BACKOFF_BASE_SECONDS,
+    TTS_BACKOFF_MAX_SECONDS
+)
+from utils import ensure_directory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    rate REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    acquired INTEGER NOT NULL DEFAULT 0,
+    waited_seconds REAL NOT NULL DEFAULT 0,
+    throttled INTEGER NOT NULL DEFAULT 0,
+    retried INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+class TokenBucket:
+    """
+    Token bucket shared through a SQLite database.
+
+    Every method opens its own connection, so one bucket can be shared by
+    threads and separate processes can open buckets with the same name.
+    The database is created on first use, not on construction.
+
+    Example:
+        limiter = TokenBucket('gtts')
+        limiter.acquire()  # blocks until a request is allowed
+        try:
+            call_service()
+        except ThrottledError:
+            limiter.throttled()
+            raise
+        limiter.succeeded()
+    """
+
+    def __init__(self, name: str, rate: float = TTS_RATE_PER_SECOND,
+                 burst: float = TTS_RATE_BURST,
+                 min_rate: float = TTS_RATE_MIN_PER_SECOND,
+                 max_rate: float = TTS_RATE_MAX_PER_SECOND,
+                 step: float = TTS_RATE_STEP,
+                 db_path: str = TTS_RATE_LIMIT_DB):
+        self.name = name
+        self.initial_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.db_path = db_path
+        self._ready = False
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements under the database write lock, committed together."""
+        if not self._ready:
+            ensure_directory(os.path.dirname(os.path.abspath(self.db_path)))
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            if not self._ready:
+                conn.executescript(_SCHEMA)
+                self._ready = True
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _refill(self, conn: sqlite3.Connection, now: float) -> sqlite3.Row:
+        """Load the bucket with the tokens earned since its last update."""
+        conn.execute(
+            "INSERT OR IGNORE INTO buckets (name, tokens, rate, updated_at) VALUES (?, ?, ?, ?)",
+            (self.name, self.burst, self.initial_rate, now)
+        )
+        conn.execute(
+            "UPDATE buckets SET tokens = MIN(?, tokens + MAX(0, ? - updated_at) * rate), "
+            "updated_at = ? WHERE name = ?",
+            (self.burst, now, now, self.name)
+        )
+        return conn.execute("SELECT * FROM buckets WHERE name = ?", (self.name,)).fetchone()
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Take tokens from the bucket, waiting until enough have accumulated.
+
+        Args:
+            tokens: Number of tokens (requests) to take
+            timeout: Give up after waiting this many seconds (default: wait forever)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the tokens were not available within `timeout`
+        """
+        started = time.time()
+        while True:
+            now = time.time()
+            with self._transaction() as conn:
+                row = self._refill(conn, now)
+                if row['tokens'] >= tokens:
+                    waited = now - started
+                    conn.execute(
+                        "UPDATE buckets SET tokens = tokens - ?, acquired = acquired + 1, "
+                        "waited_seconds = waited_seconds + ? WHERE name = ?",
+                        (tokens, waited, self.name)
+                    )
+                    return waited
+                wait = (tokens - row['tokens']) / row['rate']
+            if timeout is not None and now - started + wait > timeout:
+                raise TimeoutError(f"Rate limit '{self.name}' not available within {timeout}s")
+            # Other threads and processes compete for the same tokens; check again after the wait
+            time.sleep(wait)
+
+    def throttled(self) -> None:
+        """Record that the service rejected a call for going too fast: halve the rate."""
+        with self._transaction() as conn:
+            self._refill(conn, time.time())
+            conn.execute(
+                "UPDATE buckets SET rate = MAX(?, rate / 2), tokens = 0, "
+                "throttled = throttled + 1 WHERE name = ?",
+                (self.min_rate, self.name)
+            )
+
+    def succeeded(self) -> None:
+        """Record a successful call: raise the rate a little."""
+        with self._transaction() as conn:
+            self._refill(conn, time.time())
+            conn.execute("UPDATE buckets SET rate = MIN(?, rate + ?) WHERE name = ?",
+                         (self.max_rate, self.step, self.name))
+
+    def retried(self) -> None:
+        """Count a retried call."""
+        with self._transaction() as conn:
+            self._refill(conn, time.time())
+            conn.execute("UPDATE buckets SET retried = retried + 1 WHERE name = ?", (self.name,))
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Current state of the limiter.
+
+        Returns:
+            Dictionary with 'rate' (requests per second), 'tokens', 'burst',
+            and the totals 'acquired', 'waited_seconds', 'throttled' and 'retried'
+        """
+        with self._transaction() as conn:
+            row = self._refill(conn, time.time())
+        return {
+            'rate': row['rate'],
+            'tokens': row['tokens'],
+            'burst': self.burst,
+            'acquired': row['acquired'],
+            'waited_seconds': row['waited_seconds'],
+            'throttled': row['throttled'],
+            'retried': row['retried']
+        }
+
+def response_status(error: BaseException) -> Optional[int]:
+    """HTTP status of the response attached to an error (gTTS and requests errors), if any."""
+    for attribute in ('rsp', 'response'):
+        status = getattr(getattr(error, attribute, None), 'status_code', None)
+        if status is not None:
+            return status
+    return None
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether the service rejected the call for exceeding its rate limit."""
+    return response_status(error) == 429
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is likely to go away on retry.
+
+    Throttling and server errors are; other HTTP errors (bad request,
+    unsupported language) are not. Errors without a response are network
+    failures (requests errors are OSErrors; gTTS wraps them without one).
+    """
+    status = response_status(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, OSError) or hasattr(error, 'rsp')
+
+def call_with_backoff(func: Callable[[], Any], retries: int = TTS_MAX_RETRIES,
+                      base_delay: float = TTS_BACKOFF_BASE_SECONDS,
+                      max_delay: float = TTS_BACKOFF_MAX_SECONDS,
+                      retryable: Callable[[BaseException], bool] = is_retryable,
+                      on_retry: Optional[Callable[[BaseException, float], None]] = None) -> Any:
+    """
+    Call a function, retrying retryable errors with exponential backoff.
+
+    The wait before retry n is drawn uniformly from 0 to
+    min(max_delay, base_delay * 2**n) ("full jitter"), so callers that
+    failed together don't retry together.
+
+    Args:
+        func: Function to call
+        retries: Retries after the first attempt
+        base_delay: Upper bound of the first wait in seconds
+        max_delay: Upper bound of any wait in seconds
+        retryable: Decides whether an error is worth retrying
+        on_retry: Called with the error and the wait before each retry
+
+    Returns:
+        What `func` returns
+
+    Raises:
+        The last error, or the first one that is not retryable
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if on_retry:
+                on_retry(e, delay)
+            time.sleep(delay)
@@ -0,0 +1,305 @@
+"""
+Protection against slow and failing TTS calls.
+
+The merge waits for every chunk, so one slow call holds up the whole
+podcast and a degraded service makes every chunk wait out its timeouts.
+Two guards, one of each per TTS backend and process:
+
+- Hedger: when a call runs longer than a high percentile of recent calls,
+  the same call is started again and whichever finishes first is used.
+- CircuitBreaker: after several calls in a row fail, further calls fail at
+  once for a while instead of waiting on the service; then a single trial
+  call decides whether it has recovered.
+
+    breaker = get_breaker('gtts')
+    breaker.before_call()  # raises CircuitOpenError while the circuit is open
+    try:
+        path = get_hedger('gtts').call(lambda attempt: synthesize(attempt))
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Deque, Dict, Optional
+from config import (
+    MAX_TTS_WORKERS, TTS_HEDGE_PERCENTILE, TTS_HEDGE_MIN_SAMPLES, TTS_HEDGE_MAX_FRACTION, TTS_HEDGE_WINDOW,
+    TTS_BREAKER_FAILURES, TTS_BREAKER_RESET_SECONDS
+)
+from rate_limiter import is_retryable
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit is open."""
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a backend keeps failing.
+
+    Closed: calls go through; `failure_threshold` failures in a row open
+    the circuit. Open: calls are rejected for `reset_seconds`. Half open:
+    one trial call goes through; its success closes the circuit, its
+    failure opens it again. Only failures that point at the service
+    (`counts_as_failure`) count; a rejected request does not.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = TTS_BREAKER_FAILURES,
+                 reset_seconds: float = TTS_BREAKER_RESET_SECONDS,
+                 counts_as_failure: Callable[[BaseException], bool] = is_retryable):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.counts_as_failure = counts_as_failure
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state = HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go ahead.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with its
+                trial call still running
+        """
+        state = self.state
+        with self._lock:
+            if state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            if state == CLOSED:
+                return
+            self._rejected += 1
+        retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"TTS backend '{self.name}' is failing; "
+                               f"not calling it for another {retry_in:.0f}s")
+
+    def record_success(self) -> None:
+        """Record a successful call: closes the circuit."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self, error: BaseException) -> None:
+        """Record a failed call; opens the circuit once there are enough in a row."""
+        with self._lock:
+            trial = self._trial_running
+            self._trial_running = False
+            if not self.counts_as_failure(error):
+                if trial:
+                    # The service answered, so it is up again
+                    self._state = CLOSED
+                    self._failures = 0
+                return
+            self._failures += 1
+            if trial or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._opened += 1
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Current state of the breaker.
+
+        Returns:
+            Dictionary with 'state', 'consecutive_failures', and the totals
+            'opened' (times the circuit opened) and 'rejected' (calls failed fast)
+        """
+        state = self.state
+        with self._lock:
+            return {'state': state, 'consecutive_failures': self._failures,
+                    'opened': self._opened, 'rejected': self._rejected}
+
+class Hedger:
+    """
+    Starts a second copy of a call that is taking unusually long.
+
+    Latencies are tracked per unit of `cost` (e.g. per 1000 characters), so
+    long and short chunks are judged alike. A call is hedged once it has
+    run longer than the `percentile` of the last `window` latencies; before
+    `min_samples` calls have finished, nothing is hedged. At most
+    `max_fraction` of calls are hedged, so a uniformly slow service is not
+    sent twice the load.
+
+    The first copy of a call starts at once on a thread of its own, and the
+    hedge delay counts from when it started, so a call is never hedged for
+    waiting on other calls. Second copies run on the hedger's pool, one
+    thread per call the backend can take at once (`max_concurrency`, at
+    least MAX_TTS_WORKERS).
+    """
+
+    def __init__(self, name: str, percentile: float = TTS_HEDGE_PERCENTILE,
+                 min_samples: int = TTS_HEDGE_MIN_SAMPLES,
+                 max_fraction: float = TTS_HEDGE_MAX_FRACTION,
+                 window: int = TTS_HEDGE_WINDOW,
+                 max_concurrency: int = MAX_TTS_WORKERS):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_fraction = max_fraction
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+        self._max_workers = max(MAX_TTS_WORKERS, max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def hedge_delay(self, cost: float = 1.0) -> Optional[float]:
+        """Seconds after which a call of this cost is hedged (None: not hedged)."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index] * cost
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Threads that run second copies, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                    thread_name_prefix=f'tts-hedge-{self.name}')
+            return self._executor
+
+    def _record(self, seconds: float, cost: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds / max(cost, 1e-9))
+
+    def call(self, func: Callable[[int], Any], cost: float = 1.0,
+             on_abandoned: Optional[Callable[[int, Future], None]] = None) -> Any:
+        """
+        Call `func(0)`, and `func(1)` too if the first call is slow.
+
+        Both copies must be safe to run at the same time; the loser keeps
+        running in the background and its result is dropped.
+
+        Args:
+            func: Makes the call; receives the attempt number (0 or 1)
+            cost: Size of the call in the units latencies are tracked in
+            on_abandoned: Called with the attempt number and future of the
+                copy that lost, once it has finished, to clean up after it
+
+        Returns:
+            What the first successful copy returned
+
+        Raises:
+            The error of the last copy to fail, if none succeeded
+        """
+        def timed(attempt: int) -> Any:
+            started = time.monotonic()
+            result = func(attempt)
+            self._record(time.monotonic() - started, cost)
+            return result
+
+        with self._lock:
+            self._calls += 1
+        first: Future = Future()
+
+        def run_first() -> None:
+            if not first.set_running_or_notify_cancel():
+                return
+            try:
+                first.set_result(timed(0))
+            except BaseException as e:
+                first.set_exception(e)
+
+        # Not queued behind other calls, so the hedge delay counts from its start
+        threading.Thread(target=run_first, name=f'tts-{self.name}', daemon=True).start()
+        futures: Dict[Future, int] = {first: 0}
+        delay = self.hedge_delay(cost)
+        if delay is not None:
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                with self._lock:
+                    allowed = self._hedged + 1 <= self.max_fraction * self._calls
+                    if allowed:
+                        self._hedged += 1
+                if allowed:
+                    futures[self._get_executor().submit(timed, 1)] = 1
+
+        error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if futures[future] == 1:
+                    with self._lock:
+                        self._hedge_wins += 1
+                if on_abandoned:
+                    for loser, attempt in futures.items():
+                        if loser is not future:
+                            loser.add_done_callback(lambda f, n=attempt: on_abandoned(n, f))
+                return result
+        raise error
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Hedging statistics.
+
+        Returns:
+            Dictionary with 'calls', 'hedged', 'hedge_wins', 'hedge_rate'
+            (share of calls hedged), 'win_rate' (share of hedges that
+            finished first) and 'hedge_delay' (seconds per unit of cost, or
+            None while warming up)
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'hedged': self._hedged,
+                'hedge_wins': self._hedge_wins,
+                'hedge_rate': self._hedged / self._calls if self._calls else 0.0,
+                'win_rate': self._hedge_wins / self._hedged if self._hedged else 0.0,
+                'hedge_delay': delay
+            }
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedgers: Dict[str, Hedger] = {}
+_registry_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Circuit breaker of a TTS backend in this process."""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def get_hedger(name: str, max_concurrency: int = MAX_TTS_WORKERS) -> Hedger:
+    """Hedger of a TTS backend in this process, for the calls it can take at once."""
+    with _registry_lock:
+        if name not in _hedgers:
+            _hedgers[name] = Hedger(name, max_concurrency=max_concurrency)
+        return _hedgers[name]
@@ -0,0 +1,216 @@
+"""
+Tests for audio_processor module.
+"""
+
+import os
+import tempfile
+import unittest
+import weakref
+from unittest import mock
+from pydub import AudioSegment
+from pydub.generators import Sine
+import numpy as np
+from audio_processor import (
+    AudioPipeline, _change_speed, _known_info, _lookup_info, _remember_info, get_audio_duration,
+    get_audio_info, get_encoding_profile, measure_loudness, time_stretch
+)
+from loudness import integrated_loudness
+from mp3_frames import make_silence, parse_frame_header
+
+class TestAudioPipeline(unittest.TestCase):
+    """Test cases for the single-decode audio pipeline."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.chunks = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f'chunk_{i}.wav')
+            Sine(440).to_audio_segment(duration=1000).set_frame_rate(24000).export(path, format='wav')
+            self.chunks.append(path)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_merges_with_gaps(self):
+        """Chunks are joined in order with a pause between them."""
+        output_path = os.path.join(self.tmp.name, 'merged.wav')
+        info = AudioPipeline(self.chunks, gap_ms=500).run(output_path, format='wav')
+        
+        self.assertAlmostEqual(info['duration'], 4.0, places=2)
+        self.assertEqual(info['frame_rate'], 24000)
+        self.assertEqual(len(AudioSegment.from_file(output_path)), 4000)
+    
+    def test_decodes_each_chunk_once(self):
+        """Every stage runs in memory on a single decode per input."""
+        output_path = os.path.join(self.tmp.name, 'processed.wav')
+        with mock.patch('pydub.AudioSegment.from_file',
+                        wraps=AudioSegment.from_file) as from_file:
+            AudioPipeline(self.chunks).speed(1.5).normalize().trim_silence().run(output_path, format='wav')
+            info = get_audio_info(output_path)
+        
+        self.assertEqual(from_file.call_count, len(self.chunks))
+        self.assertEqual(info['file_size'], os.path.getsize(output_path))
+    
+    def test_streaming_matches_in_memory(self):
+        """Streaming keeps one decoded chunk alive and produces the same audio."""
+        streamed_path = os.path.join(self.tmp.name, 'streamed.wav')
+        buffered_path = os.path.join(self.tmp.name, 'buffered.wav')
+        live = []
+        original = AudioSegment.from_file
+    
+        def tracking_from_file(*args, **kwargs):
+            segment = original(*args, **kwargs)
+            live[:] = [ref for ref in live if ref() is not None]
+            self.assertLessEqual(len(live), 1)
+            live.append(weakref.ref(segment))
+            return segment
+    
+        pipeline = AudioPipeline(self.chunks).speed(1.25).normalize_loudness().trim_silence()
+        self.assertTrue(pipeline.can_stream)
+        with mock.patch('pydub.AudioSegment.from_file', side_effect=tracking_from_file):
+            info = pipeline.run(streamed_path, format='wav', streaming=True)
+        AudioPipeline(self.chunks).speed(1.25).normalize_loudness().trim_silence().run(
+            buffered_path, format='wav', streaming=False)
+    
+        streamed = AudioSegment.from_file(streamed_path)
+        buffered = AudioSegment.from_file(buffered_path)
+        self.assertAlmostEqual(len(streamed), len(buffered), delta=20)
+        self.assertAlmostEqual(info['duration'], len(streamed) / 1000.0, places=2)
+        self.assertAlmostEqual(streamed.dBFS, buffered.dBFS, delta=0.5)
+    
+    def test_peak_normalize_cannot_stream(self):
+        """Peak normalization needs the whole merge, so streaming is refused."""
+        pipeline = AudioPipeline(self.chunks).normalize()
+        self.assertFalse(pipeline.can_stream)
+        with self.assertRaises(ValueError):
+            pipeline.run(os.path.join(self.tmp.name, 'out.wav'), format='wav', streaming=True)
+    
+    def test_loudness_normalization_uses_chunk_stats(self):
+        """Cached chunk statistics are used; missing ones are measured while decoding."""
+        # Longer chunks, so blocks spanning the pauses barely affect the result
+        chunks = []
+        for i, gain in enumerate((-6, -20, -12)):
+            path = os.path.join(self.tmp.name, f'long_{i}.wav')
+            Sine(440).to_audio_segment(duration=10000, volume=gain).export(path, format='wav')
+            chunks.append(path)
+        output_path = os.path.join(self.tmp.name, 'normalized.wav')
+        cached = measure_loudness(AudioSegment.from_file(chunks[0]))
+        pipeline = AudioPipeline(chunks, chunk_stats=[cached, None, None]).normalize_loudness(-16.0)
+        
+        with mock.patch('audio_processor.measure_loudness', wraps=measure_loudness) as measure:
+            pipeline.run(output_path, format='wav')
+        
+        self.assertEqual(measure.call_count, 2)
+        self.assertTrue(all(stats is not None for stats in pipeline.chunk_stats))
+        result = measure_loudness(AudioSegment.from_file(output_path))
+        self.assertAlmostEqual(integrated_loudness(result), -16.0, delta=0.3)
+
+class TestEncodingProfiles(unittest.TestCase):
+    """Test cases for speech encoding profiles."""
+    
+    def test_profiles_follow_quality(self):
+        """Profiles are mono, and Opus needs a lower bitrate than MP3."""
+        mp3 = get_encoding_profile('mp3', 'low')
+        opus = get_encoding_profile('opus', 'low')
+        
+        self.assertEqual((mp3.container, mp3.codec, mp3.extension), ('mp3', 'libmp3lame', 'mp3'))
+        self.assertEqual((opus.container, opus.codec, opus.extension), ('ogg', 'libopus', 'ogg'))
+        self.assertEqual(mp3.channels, 1)
+        self.assertLess(int(opus.bitrate[:-1]), int(mp3.bitrate[:-1]))
+        self.assertNotEqual(mp3.id, get_encoding_profile('mp3', 'high').id)
+        with self.assertRaises(ValueError):
+            get_encoding_profile('flac', 'high')
+    
+    def test_streaming_encode_uses_profile(self):
+        """The encoder gets the profile's codec and bitrate and mono PCM."""
+        with tempfile.TemporaryDirectory() as tmp:
+            tone = Sine(440).to_audio_segment(duration=1000).set_frame_rate(24000)
+            path = os.path.join(tmp, 'stereo.wav')
+            AudioSegment.from_mono_audiosegments(tone, tone).export(path, format='wav')
+            
+            with mock.patch('audio_processor.subprocess.Popen') as popen:
+                process = popen.return_value
+                process.wait.return_value = 0
+                process.stderr.read.return_value = b''
+                written = []
+                process.stdin.write.side_effect = written.append
+                # The encoder is mocked, so no output file is written
+                with mock.patch('audio_processor.os.path.getsize', return_value=0):
+                    AudioPipeline([path]).run(os.path.join(tmp, 'podcast.ogg'),
+                                              profile=get_encoding_profile('opus', 'medium'))
+        
+        command = popen.call_args[0][0]
+        self.assertEqual(command[command.index('-c:a') + 1], 'libopus')
+        self.assertEqual(command[command.index('-b:a') + 1], '24k')
+        self.assertEqual(command[command.index('-ac') + 1], '1')
+        self.assertEqual(command[command.index('-f', command.index('-b:a')) + 1], 'ogg')
+        self.assertEqual(sum(len(block) for block in written), 24000 * 2)
+
+class TestTimeStretch(unittest.TestCase):
+    """Test cases for pitch-preserving speed changes."""
+    
+    def _dominant_frequency(self, samples, frame_rate):
+        spectrum = np.abs(np.fft.rfft(samples))
+        return np.argmax(spectrum) * frame_rate / len(samples)
+    
+    def test_changes_duration_but_not_pitch(self):
+        """The tempo follows the speed factor while the pitch stays put."""
+        frame_rate = 24000
+        t = np.arange(frame_rate * 4) / frame_rate
+        samples = (np.sin(2 * np.pi * 220 * t) * 10000).astype(np.float32)
+        
+        for speed in (0.5, 1.5, 2.0):
+            stretched = time_stretch(samples, speed, frame_rate)
+            self.assertEqual(len(stretched), round(len(samples) / speed))
+            middle = stretched[frame_rate // 2:frame_rate // 2 + frame_rate]
+            self.assertAlmostEqual(self._dominant_frequency(middle, frame_rate), 220, delta=2)
+            # Aligned frames add up without cancelling each other out
+            self.assertGreater(np.abs(middle).max(), 9000)
+    
+    def test_stereo_segments(self):
+        """Multi-channel audio keeps its format and channel count."""
+        tone = Sine(330).to_audio_segment(duration=2000).set_frame_rate(24000)
+        stereo = AudioSegment.from_mono_audiosegments(tone, tone)
+        
+        faster = _change_speed(stereo, 1.25)
+        self.assertEqual(faster.channels, 2)
+        self.assertEqual(faster.frame_rate, 24000)
+        self.assertAlmostEqual(len(faster), 1600, delta=5)
+
+class TestAudioInfo(unittest.TestCase):
+    """Test cases for reading audio information."""
+    
+    def test_mp3_info_without_decoding(self):
+        """MP3 duration and format are read from headers alone."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'podcast.mp3')
+            with open(path, 'wb') as f:
+                f.write(make_silence(header, 3000))
+            
+            with mock.patch('pydub.AudioSegment.from_file') as from_file:
+                info = get_audio_info(path)
+                duration = get_audio_duration(path)
+        
+        from_file.assert_not_called()
+        self.assertAlmostEqual(duration, 3.0, places=1)
+        self.assertEqual(info['frame_rate'], 24000)
+        self.assertEqual(info['channels'], 1)
+    
+    def test_recorded_info_is_bounded(self):
+        """Only the most recently written files' info is kept."""
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('audio_processor._KNOWN_INFO_MAX', 3):
+            paths = []
+            for i in range(5):
+                paths.append(os.path.join(tmp, f'{i}.mp3'))
+                with open(paths[-1], 'wb') as f:
+                    f.write(bytes([i]))
+                _remember_info(paths[-1], {'duration': i})
+            
+            self.assertLessEqual(len(_known_info), 3)
+            self.assertIsNone(_lookup_info(paths[0]))
+            self.assertEqual(_lookup_info(paths[4]), {'duration': 4})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for batch conversion.
+"""
+
+import unittest
+import os
+import tempfile
+import time
+from unittest import mock
+from batch import HostThrottle, MANIFEST_NAME, load_manifest, read_url_list, run_batch
+
+class TestHostThrottle(unittest.TestCase):
+    """Test cases for per-host request spacing."""
+    
+    def test_spaces_requests_per_host(self):
+        """Requests to one host wait for each other; other hosts don't."""
+        throttle = HostThrottle(delay=0.1)
+        start = time.monotonic()
+        throttle.wait("https://www.forrester.com/blogs/a/")
+        throttle.wait("https://example.com/post")
+        self.assertLess(time.monotonic() - start, 0.05)
+        throttle.wait("https://www.forrester.com/blogs/b/")
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+class TestRunBatch(unittest.TestCase):
+    """Test cases for the batch engine."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp.name, 'batch')
+        self.fetched = []
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def fake_fetch(self, url, use_cache=True, delay=0):
+        self.fetched.append(url)
+        if url.endswith('/missing/'):
+            return None
+        return {'content': f"Post at {url}.", 'metadata': {'title': url}}
+    
+    def fake_generate(self, content, job_id=None, **kwargs):
+        path = os.path.join(self.tmp.name, f"podcast_{job_id}.mp3")
+        with open(path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        return path
+    
+    def run_batch(self, urls, **kwargs):
+        with mock.patch('batch.fetch_blog_content', side_effect=self.fake_fetch), \
+                mock.patch('batch.generate_podcast', side_effect=self.fake_generate):
+            return run_batch(urls, self.output_dir, workers=1, host_delay=0, **kwargs)
+    
+    def test_writes_manifest_and_resumes(self):
+        """Outputs and failures are recorded; a second run only redoes failures."""
+        urls = ["https://example.com/a/", "https://example.com/missing/", "https://example.com/b/"]
+        summary = self.run_batch(urls)
+        self.assertEqual(summary, {'done': 2, 'failed': 1, 'skipped': 0})
+        
+        manifest = load_manifest(os.path.join(self.output_dir, MANIFEST_NAME))
+        self.assertEqual(set(manifest), set(urls))
+        self.assertEqual(manifest[urls[1]]['status'], 'failed')
+        for url in (urls[0], urls[2]):
+            with open(manifest[url]['podcast_path'], 'rb') as f:
+                self.assertEqual(f.read(), f"Post at {url}.".encode('utf-8'))
+        
+        self.fetched.clear()
+        summary = self.run_batch(urls + ["https://example.com/c/"])
+        self.assertEqual(sorted(self.fetched), ["https://example.com/c/", urls[1]])
+        self.assertEqual(summary, {'done': 1, 'failed': 1, 'skipped': 2})
+        
+        self.fetched.clear()
+        self.run_batch(urls, retry_failed=False)
+        self.assertEqual(self.fetched, [])
+        
+        self.fetched.clear()
+        self.run_batch(urls[:1], speed=1.5)
+        self.assertEqual(self.fetched, urls[:1])
+    
+    def test_interrupted_manifest_line_is_ignored(self):
+        """A manifest cut short mid-line still loads."""
+        os.makedirs(self.output_dir)
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        with open(path, 'w') as f:
+            f.write('{"url": "https://example.com/a/", "status": "failed"}\n{"url": "https://ex')
+        self.assertEqual(list(load_manifest(path)), ["https://example.com/a/"])
+    
+    def test_read_url_list(self):
+        """Comments, blank lines and repeats are skipped."""
+        path = os.path.join(self.tmp.name, 'urls.txt')
+        with open(path, 'w') as f:
+            f.write("# Q3 posts\nhttps://example.com/a/\n\nhttps://example.com/b/\nhttps://example.com/a/\n")
+        self.assertEqual(read_url_list(path), ["https://example.com/a/", "https://example.com/b/"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,10 @@ Tests for blog_fetcher module.
 """
 
 import unittest
-from blog_fetcher import fetch_from_text, validate_url, is_forrester_url
+from bs4 import BeautifulSoup
+from blog_fetcher import (
+    fetch_from_text, validate_url, is_forrester_url, extract_content, extract_headings
+)
 
 class TestBlogFetcher(unittest.TestCase):
     """Test cases for blog fetcher."""
@@ -30,6 +33,24 @@ class TestBlogFetcher(unittest.TestCase):
         self.assertTrue(is_forrester_url("https://www.forrester.com/blog/test"))
         self.assertTrue(is_forrester_url("https://blogs.forrester.com/article"))
         self.assertFalse(is_forrester_url("https://example.com/blog"))
+    
+    def test_extract_headings(self):
+        """Headings kept by extract_content are listed in order."""
+        soup = BeautifulSoup("""
+            <nav><h2>Navigation Heading Here</h2></nav>
+            <article>
+                <h1>Why Cloud Costs Keep Rising</h1>
+                <p>Spending on cloud infrastructure grew again this quarter.</p>
+                <h2>Short</h2>
+                <h2>What Leaders Should Do Next</h2>
+                <p>Start by measuring unit costs for every workload.</p>
+            </article>
+        """, 'html.parser')
+        content = extract_content(soup)
+        headings = extract_headings(soup)
+        
+        self.assertEqual(headings, ["Why Cloud Costs Keep Rising", "What Leaders Should Do Next"])
+        self.assertTrue(all(heading in content for heading in headings))
 
 if __name__ == '__main__':
     unittest.main()
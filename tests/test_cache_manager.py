@@ -0,0 +1,69 @@
+"""
+Tests for cache_manager module.
+"""
+
+import os
+import tempfile
+import unittest
+from cache_manager import AudioCache
+
+class TestAudioCache(unittest.TestCase):
+    """Test cases for the content-addressed audio cache."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AudioCache('audio_chunks', max_size_mb=1)
+        self.cache.cache_dir = os.path.join(self.tmp.name, 'cache')
+        os.makedirs(self.cache.cache_dir)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def _make_file(self, name: str, size: int) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(b'\0' * size)
+        return path
+    
+    def test_make_key_is_stable(self):
+        """Keys depend only on their parts."""
+        self.assertEqual(AudioCache.make_key('a', 'en'), AudioCache.make_key('a', 'en'))
+        self.assertNotEqual(AudioCache.make_key('a', 'en'), AudioCache.make_key('a', 'fr'))
+    
+    def test_put_and_get(self):
+        """Stored files can be found again by key."""
+        key = AudioCache.make_key('hello')
+        self.assertIsNone(self.cache.get(key))
+        
+        cached = self.cache.put(key, self._make_file('chunk.mp3', 10))
+        self.assertEqual(self.cache.get(key), cached)
+        self.assertEqual(os.path.getsize(cached), 10)
+    
+    def test_other_formats_keep_their_extension(self):
+        """Files stored with another extension are named, found and evicted by it."""
+        key = AudioCache.make_key('hello', 'opus')
+        cached = self.cache.put(key, self._make_file('podcast.opus', 10), meta={'extension': 'opus'},
+                                extension='opus')
+        
+        self.assertTrue(cached.endswith('.opus'))
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.get(key, 'opus'), cached)
+        self.assertEqual(self.cache.get_meta(key), {'extension': 'opus'})
+        self.assertEqual(self.cache.clear(), 1)
+        self.assertIsNone(self.cache.get(key, 'opus'))
+    
+    def test_evicts_least_recently_used(self):
+        """The store stays under its size cap by dropping the oldest entries."""
+        self.cache.max_size_bytes = 250
+        keys = [AudioCache.make_key(str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, self._make_file(f'{i}.mp3', 100))
+            # Spread modification times so LRU order is deterministic
+            os.utime(self.cache.get(key), (1000 + i, 1000 + i))
+        
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+        self.assertLessEqual(self.cache.get_stats()['total_files'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
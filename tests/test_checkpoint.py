@@ -0,0 +1,53 @@
+"""
+Tests for checkpoint module.
+"""
+
+import unittest
+import os
+import tempfile
+from checkpoint import CHUNK_DONE, CHUNK_FAILED, ChunkCheckpoint
+
+class TestChunkCheckpoint(unittest.TestCase):
+    """Test cases for per-chunk render manifests."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.chunk_path = os.path.join(self.tmp.name, 'chunk_0.mp3')
+        with open(self.chunk_path, 'wb') as f:
+            f.write(b'audio')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_done_chunks_survive_a_restart(self):
+        """A new checkpoint for the same render sees the chunks recorded before."""
+        checkpoint = ChunkCheckpoint(self.tmp.name, 'render')
+        checkpoint.record(0, "First chunk.", self.chunk_path, None)
+        checkpoint.record(1, "Second chunk.", None, "quota exceeded")
+        
+        reloaded = ChunkCheckpoint(self.tmp.name, 'render')
+        self.assertEqual(reloaded.completed_path(0, "First chunk."), self.chunk_path)
+        self.assertIsNone(reloaded.completed_path(1, "Second chunk."))
+        self.assertEqual(reloaded.counts(), {CHUNK_DONE: 1, CHUNK_FAILED: 1})
+    
+    def test_plan_survives_a_restart(self):
+        """A resumed render gets the chunks the first run was cut into."""
+        self.assertIsNone(ChunkCheckpoint(self.tmp.name, 'render').plan)
+        checkpoint = ChunkCheckpoint(self.tmp.name, 'render')
+        checkpoint.set_plan(["First chunk.", "Second chunk."])
+        checkpoint.record(0, "First chunk.", self.chunk_path, None)
+        
+        self.assertEqual(ChunkCheckpoint(self.tmp.name, 'render').plan, ["First chunk.", "Second chunk."])
+        self.assertIsNone(ChunkCheckpoint(self.tmp.name, 'other').plan)
+    
+    def test_other_renders_and_texts_are_not_reused(self):
+        """Audio recorded for other settings or other text is ignored."""
+        ChunkCheckpoint(self.tmp.name, 'render').record(0, "First chunk.", self.chunk_path, None)
+        
+        self.assertIsNone(ChunkCheckpoint(self.tmp.name, 'other').completed_path(0, "First chunk."))
+        self.assertIsNone(ChunkCheckpoint(self.tmp.name, 'render').completed_path(0, "Edited chunk."))
+        os.remove(self.chunk_path)
+        self.assertIsNone(ChunkCheckpoint(self.tmp.name, 'render').completed_path(0, "First chunk."))
+
+if __name__ == '__main__':
+    unittest.main()
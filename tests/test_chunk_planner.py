@@ -0,0 +1,96 @@
+"""
+Tests for chunk_planner module.
+"""
+
+import unittest
+import os
+import tempfile
+from chunk_planner import CHUNK_FLOORS, LatencyModel, plan_chunks
+from config import TTS_LATENCY_PRIOR_SECONDS
+
+class TestPlanChunks(unittest.TestCase):
+    """Test cases for cutting a post into TTS chunks."""
+    
+    def setUp(self):
+        self.text = ''.join(f"This is sentence number {i}. " for i in range(400))
+    
+    def test_short_first_chunk_then_one_per_worker(self):
+        """The first chunk is short; the rest are spread over the workers."""
+        chunks = plan_chunks(self.text, max_chars=4500, concurrency=4, min_chars=500,
+                             first_chunk_chars=400)
+        
+        self.assertLessEqual(len(chunks[0]), 400)
+        self.assertIn(len(chunks) - 1, (4, 5))
+        self.assertEqual(' '.join(chunks), self.text.strip())
+    
+    def test_respects_max_chars(self):
+        """With few workers the rest is still cut to what the backend accepts."""
+        chunks = plan_chunks(self.text, max_chars=2000, concurrency=1, min_chars=500)
+        
+        self.assertTrue(all(len(chunk) <= 2000 for chunk in chunks))
+        self.assertEqual(' '.join(chunks), self.text.strip())
+    
+    def test_slow_calls_make_fewer_chunks(self):
+        """When each call has a high fixed cost, chunks are not cut below it."""
+        fast = plan_chunks(self.text, 4500, 4, min_chars=250)
+        slow = plan_chunks(self.text, 4500, 4, min_chars=4000)
+        self.assertLess(len(slow), len(fast))
+    
+    def test_short_text_is_one_chunk(self):
+        """Text shorter than the first chunk is not cut."""
+        self.assertEqual(plan_chunks("Hello there.", 4500, 4, 500), ["Hello there."])
+
+class TestLatencyModel(unittest.TestCase):
+    """Test cases for the measured TTS latency."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'latency.db')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_prior_until_enough_samples(self):
+        """Too few measurements leave the configured prior in place."""
+        model = LatencyModel('test', db_path=self.db_path, min_samples=5)
+        model.observe(1000, 9.0)
+        self.assertEqual(model.estimate()[0], TTS_LATENCY_PRIOR_SECONDS)
+    
+    def test_fit_is_kept_across_runs(self):
+        """The fitted cost per call and per character is read back by a new model."""
+        model = LatencyModel('test', db_path=self.db_path, decay=0.95, min_samples=5)
+        for chars in (200, 800, 1500, 3000, 4500, 1000):
+            model.observe(chars, 0.3 + 0.0005 * chars)
+        
+        base, per_char = LatencyModel('test', db_path=self.db_path).estimate()
+        self.assertAlmostEqual(base, 0.3, places=6)
+        self.assertAlmostEqual(per_char, 0.0005, places=9)
+        self.assertAlmostEqual(model.predict(2000), 1.3, places=6)
+        self.assertEqual(LatencyModel('other', db_path=self.db_path).estimate()[0],
+                         TTS_LATENCY_PRIOR_SECONDS)
+    
+    def test_plan_is_stable_as_samples_come_in(self):
+        """More measurements of about the same latency don't change how a post is cut."""
+        model = LatencyModel('test', db_path=self.db_path, min_samples=5)
+        text = ''.join(f"This is sentence number {i}. " for i in range(400))
+        
+        def plan():
+            return plan_chunks(text, 4500, 4, LatencyModel('test', db_path=self.db_path).chunk_floor())
+        
+        for chars in (200, 800, 1500, 3000, 4500, 1000):
+            model.observe(chars, 0.3 + 0.0005 * chars)
+        first = plan()
+        self.assertIn(LatencyModel('test', db_path=self.db_path).chunk_floor(), CHUNK_FLOORS)
+        for seconds in (0.45, 0.2, 0.35):
+            for chars in (300, 2000, 4000):
+                model.observe(chars, seconds + 0.0005 * chars)
+            self.assertEqual(plan(), first)
+        
+        # A service that has become much slower per call gets longer chunks
+        for _ in range(200):
+            for chars in (300, 2000, 4000):
+                model.observe(chars, 5.0 + 0.0005 * chars)
+        self.assertLess(len(plan()), len(first))
+
+if __name__ == '__main__':
+    unittest.main()
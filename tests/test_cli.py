@@ -0,0 +1,57 @@
+"""
+Tests for the command-line interface.
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestCli(unittest.TestCase):
+    """Test cases for headless generation."""
+    
+    def test_startup_skips_heavy_modules(self):
+        """Importing the CLI loads neither Streamlit nor the audio and scraping libraries."""
+        code = ("import sys, cli; "
+                "print(','.join(m for m in ('streamlit', 'pydub', 'numpy', 'requests', 'bs4') "
+                "if m in sys.modules))")
+        loaded = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        self.assertEqual(loaded, '')
+    
+    def test_converts_text_file(self):
+        """Pasted text is converted and the podcast written to --output."""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'post.txt')
+            with open(source, 'w') as f:
+                f.write("A short post about cloud strategy.")
+            rendered = os.path.join(tmp, 'podcast_job.mp3')
+            output = os.path.join(tmp, 'episode.mp3')
+            
+            def fake_generate(content, **kwargs):
+                with open(rendered, 'w') as f:
+                    f.write(content)
+                return rendered
+            
+            with mock.patch('podcast_generator.generate_podcast', side_effect=fake_generate), \
+                    mock.patch('sys.stdout'):
+                status = cli.main(['--text', source, '-o', output, '--speed', '1.25'])
+            
+            self.assertEqual(status, 0)
+            with open(output) as f:
+                self.assertEqual(f.read(), "A short post about cloud strategy.")
+    
+    def test_failed_generation_exits_nonzero(self):
+        """A failed run returns status 1."""
+        with mock.patch('podcast_generator.generate_podcast', return_value=None), \
+                mock.patch('sys.stdin') as stdin, mock.patch('sys.stderr'):
+            stdin.read.return_value = "Some text."
+            self.assertEqual(cli.main(['--text', '-']), 1)
+
+if __name__ == '__main__':
+    unittest.main()
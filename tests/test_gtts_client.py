@@ -0,0 +1,120 @@
+"""
+Tests for the pooled, parallel gTTS client against a local stand-in server.
+"""
+
+import unittest
+import base64
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
+from rate_limiter import TokenBucket
+import tts_backends
+
+class FakeTranslateHandler(BaseHTTPRequestHandler):
+    """Answers batchexecute requests the way Google Translate does, with the text as 'audio'."""
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        rpc = json.loads(parse_qs(body)['f.req'][0])
+        text = json.loads(rpc[0][0][1])[0]
+        
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.clients.add(self.client_address)
+        # Answer out of order (the backoff tests patch time.sleep)
+        threading.Event().wait(server.random.uniform(0.01, 0.05))
+        with server.lock:
+            server.active -= 1
+        
+        if server.fail_first and not server.failed.get(text):
+            server.failed[text] = True
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        audio = base64.b64encode(f"<{text}>".encode('utf-8')).decode('ascii')
+        line = json.dumps([["wrb.fr", "jQ1olc", json.dumps([audio]), None, None, None, "generic"]],
+                          separators=(',', ':'))
+        payload = f")]}}'\n\n{line}\n".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+class TestParallelGtts(unittest.TestCase):
+    """Test cases for _save_with_gtts."""
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTranslateHandler)
+        self.server.lock = threading.Lock()
+        self.server.active = self.server.max_active = 0
+        self.server.clients = set()
+        self.server.fail_first = False
+        self.server.failed = {}
+        self.server.random = random.Random(0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp = tempfile.TemporaryDirectory()
+        
+        host, port = self.server.server_address
+        limiter = TokenBucket('test', rate=1000, burst=1000,
+                              db_path=os.path.join(self.tmp.name, 'limits.db'))
+        self.patches = [
+            mock.patch('tts_backends.GTTS_BASE_URL', f"http://{host}:{port}"),
+            mock.patch('tts_backends.GTTS_PARALLEL_REQUESTS', 4),
+            mock.patch('tts_backends.tts_rate_limiter', limiter),
+            mock.patch('tts_backends._gtts_session', None),
+            mock.patch('rate_limiter.time.sleep'),
+        ]
+        for patch in self.patches:
+            patch.start()
+    
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+    
+    def test_parts_are_fetched_concurrently_and_joined_in_order(self):
+        """Sentence parts go out in parallel over pooled connections; the audio keeps their order."""
+        sentences = [f"Sentence number {i} is about cloud strategy." for i in range(12)]
+        output_path = os.path.join(self.tmp.name, 'chunk.mp3')
+        tts_backends._save_with_gtts(' '.join(sentences), 'en', output_path)
+        
+        with open(output_path, 'rb') as f:
+            audio = f.read().decode('utf-8')
+        # One part per sentence, in text order
+        self.assertEqual(audio.count('<'), len(sentences))
+        self.assertEqual(re.findall(r'<Sentence number (\d+)', audio), [str(i) for i in range(12)])
+        self.assertGreater(self.server.max_active, 1)
+        # Connections are reused instead of opened per request
+        self.assertLessEqual(len(self.server.clients), 4)
+    
+    def test_failed_parts_are_retried(self):
+        """A server error on a part is retried without redoing the others."""
+        self.server.fail_first = True
+        output_path = os.path.join(self.tmp.name, 'chunk.mp3')
+        first = "The first sentence is long enough that gTTS sends it on its own"
+        second = "and so is the second one which follows it in the same chunk."
+        tts_backends._save_with_gtts(f"{first}. {second}", 'en', output_path)
+        
+        with open(output_path, 'rb') as f:
+            self.assertEqual(f.read().decode('utf-8'), f"<{first}><{second}>")
+        self.assertEqual(tts_backends.tts_rate_limiter.metrics()['retried'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
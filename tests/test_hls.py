@@ -0,0 +1,75 @@
+"""
+Tests for hls module.
+"""
+
+import os
+import tempfile
+import unittest
+from hls import TIMESTAMP_OWNER, segment_mp3, write_playlist, write_segment
+from id3_tags import existing_tag_size
+from mp3_frames import make_silence, parse_frame_header, read_mp3_info
+
+GTTS_HEADER = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+
+class TestSegmentMp3(unittest.TestCase):
+    """Test cases for cutting MP3 files into packed audio segments."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'chunk.mp3')
+        with open(self.path, 'wb') as f:
+            f.write(make_silence(GTTS_HEADER, 5000))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_fixed_duration_segments_with_timestamps(self):
+        """Segments have the target duration and carry their start time."""
+        segments = segment_mp3(self.path, 2.0, start_seconds=10.0, lead_silence_ms=500)
+        
+        durations = [duration for _, duration in segments]
+        self.assertAlmostEqual(sum(durations), 5.5, delta=0.05)
+        self.assertTrue(all(abs(d - 2.0) < 0.05 for d in durations[:-1]))
+        
+        for k, (data, _) in enumerate(segments):
+            owner = data.index(TIMESTAMP_OWNER.encode('latin-1'))
+            ticks = int.from_bytes(data[owner + len(TIMESTAMP_OWNER) + 1:][:8], 'big')
+            self.assertAlmostEqual(ticks / 90000.0, 10.0 + sum(durations[:k]), places=3)
+            
+            segment_path = os.path.join(self.tmp.name, f'segment_{k}.mp3')
+            with open(segment_path, 'wb') as f:
+                f.write(data)
+            self.assertGreater(existing_tag_size(segment_path), 0)
+            self.assertAlmostEqual(read_mp3_info(segment_path)['duration'], durations[k], delta=0.05)
+
+class TestWritePlaylist(unittest.TestCase):
+    """Test cases for m3u8 playlists."""
+    
+    def test_vod_playlist(self):
+        """The playlist lists every segment and is marked complete."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'podcast.m3u8')
+            write_playlist(path, [('a.mp3', 6.0), ('b.mp3', 6.024), ('c.mp3', 1.5)])
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        
+        self.assertEqual(lines[0], '#EXTM3U')
+        self.assertIn('#EXT-X-TARGETDURATION:7', lines)
+        self.assertEqual(lines[-1], '#EXT-X-ENDLIST')
+        self.assertEqual([line for line in lines if not line.startswith('#')],
+                         ['a.mp3', 'b.mp3', 'c.mp3'])
+    
+    def test_segment_rewrite_leaves_readers_whole(self):
+        """A player reading a segment keeps the whole file while another render rewrites it."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'segment.mp3')
+            write_segment(path, b'first render')
+            with open(path, 'rb') as reader:
+                write_segment(path, b'second render')
+                self.assertEqual(reader.read(), b'first render')
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'second render')
+            self.assertEqual(os.listdir(tmp), ['segment.mp3'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for id3_tags module.
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+from audio_processor import add_metadata
+from id3_tags import existing_tag_size, format_recording_date, text_frame, write_tag
+from mp3_frames import make_silence, parse_frame_header, read_mp3_info
+
+def read_frames(path: str) -> dict:
+    """Parse the frames of the ID3v2.4 tag at the start of a file."""
+    with open(path, 'rb') as f:
+        data = f.read(existing_tag_size(path))
+    frames = {}
+    offset = 10
+    while offset + 10 <= len(data) and data[offset:offset + 4] != b'\0\0\0\0':
+        frame_id = data[offset:offset + 4].decode('ascii')
+        size = 0
+        for b in data[offset + 4:offset + 8]:
+            size = (size << 7) | b
+        frames.setdefault(frame_id, []).append(data[offset + 10:offset + 10 + size])
+        offset += 10 + size
+    return frames
+
+class TestId3Tags(unittest.TestCase):
+    """Test cases for the ID3v2.4 writer."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'podcast.mp3')
+        self.audio = make_silence(parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4])), 2000)
+        with open(self.path, 'wb') as f:
+            f.write(self.audio)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_add_metadata_with_chapters(self):
+        """Title, source, date and chapters are written ahead of the untouched audio."""
+        add_metadata(self.path, "Cloud Trends", artist="Jane Analyst",
+                     source_url="https://www.forrester.com/blogs/cloud-trends/",
+                     date="March 5, 2024",
+                     chapters=[("Cloud Trends", 0, 800), ("What Comes Next", 800, 2000)])
+        
+        frames = read_frames(self.path)
+        self.assertEqual(frames['TIT2'], [b'\x03Cloud Trends'])
+        self.assertEqual(frames['TPE1'], [b'\x03Jane Analyst'])
+        self.assertEqual(frames['WOAS'], [b'https://www.forrester.com/blogs/cloud-trends/'])
+        self.assertEqual(frames['TDRC'], [b'\x032024-03-05'])
+        self.assertIn(b'chp0\x00chp1\x00', frames['CTOC'][0])
+        second = frames['CHAP'][1]
+        self.assertEqual(struct.unpack('>II', second[5:13]), (800, 2000))
+        self.assertIn(b'What Comes Next', second)
+        
+        with open(self.path, 'rb') as f:
+            self.assertTrue(f.read().endswith(self.audio))
+        self.assertAlmostEqual(read_mp3_info(self.path)['duration'], 2.0, places=1)
+    
+    def test_rewrites_in_place_when_tag_fits(self):
+        """A smaller tag reuses the space (and padding) of the existing one."""
+        write_tag(self.path, [text_frame('TIT2', "A much longer original title")])
+        tag_size = existing_tag_size(self.path)
+        inode = os.stat(self.path).st_ino
+        
+        write_tag(self.path, [text_frame('TIT2', "Short")])
+        
+        self.assertEqual(existing_tag_size(self.path), tag_size)
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(read_frames(self.path)['TIT2'], [b'\x03Short'])
+    
+    def test_format_recording_date(self):
+        """Blog dates are converted to ISO 8601 where possible."""
+        self.assertEqual(format_recording_date("2024-03-05T10:00:00Z"), "2024-03-05")
+        self.assertEqual(format_recording_date("Mar 5, 2024"), "2024-03-05")
+        self.assertEqual(format_recording_date("Published in 2023"), "2023")
+        self.assertIsNone(format_recording_date("yesterday"))
+
+if __name__ == '__main__':
+    unittest.main()
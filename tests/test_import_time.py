@@ -0,0 +1,50 @@
+"""
+Tests that the app modules stay cheap to import.
+"""
+
+import unittest
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything the app, CLI and workers import at startup, except Streamlit itself
+APP_MODULES = ['podcast_generator', 'blog_fetcher', 'cache_manager', 'audio_processor',
+               'job_queue', 'batch', 'worker', 'cli']
+
+# Loaded on first use instead
+HEAVY_MODULES = ['numpy', 'pydub', 'requests', 'bs4', 'gtts', 'streamlit']
+
+# Cold import of APP_MODULES; about 0.05s on a laptop, so this only trips on a regression
+IMPORT_BUDGET_SECONDS = 0.5
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for startup cost."""
+    
+    def cold_import(self) -> dict:
+        code = (
+            "import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            f"for name in {APP_MODULES!r}:\n"
+            "    __import__(name)\n"
+            "print(json.dumps({'seconds': time.perf_counter() - start,\n"
+            f"                  'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                                text=True, check=True)
+        return json.loads(result.stdout)
+    
+    def test_heavy_dependencies_are_deferred(self):
+        """Importing the app modules loads none of the heavy libraries."""
+        self.assertEqual(self.cold_import()['heavy'], [])
+    
+    def test_import_time_budget(self):
+        """A cold import of the app modules stays within the budget."""
+        # Best of three, so one slow run on a busy machine doesn't fail the test
+        seconds = min(self.cold_import()['seconds'] for _ in range(3))
+        self.assertLess(seconds, IMPORT_BUDGET_SECONDS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for job_queue and worker modules.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from job_queue import JobQueue, DONE, FAILED, QUEUED, RUNNING, CANCELLED
+from worker import work
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for the SQLite job queue."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'jobs.db')
+        self.queue = JobQueue(self.db_path)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_job_lifecycle_survives_restart(self):
+        """Jobs are claimed in order and their results outlive the queue object."""
+        first = self.queue.enqueue({'text': "first"})
+        second = self.queue.enqueue({'text': "second"})
+        
+        claimed = self.queue.claim('worker-1')
+        self.assertEqual(claimed['id'], first)
+        self.assertEqual(claimed['params'], {'text': "first"})
+        self.assertEqual(self.queue.status(first)['status'], RUNNING)
+        self.assertIsNone(self.queue.result(first))
+        self.queue.complete(first, {'podcast_path': '/tmp/podcast.mp3'})
+        
+        restarted = JobQueue(self.db_path)
+        self.assertEqual(restarted.result(first), {'podcast_path': '/tmp/podcast.mp3'})
+        self.assertEqual(restarted.status(second)['status'], QUEUED)
+        self.assertEqual(restarted.counts(), {DONE: 1, QUEUED: 1})
+    
+    def test_concurrent_claims_are_exclusive(self):
+        """Each job is claimed by exactly one worker."""
+        jobs = {self.queue.enqueue({'n': i}) for i in range(20)}
+        claimed = []
+        lock = threading.Lock()
+        
+        def claim_all(worker_id):
+            queue = JobQueue(self.db_path)
+            while True:
+                job = queue.claim(worker_id)
+                if not job:
+                    return
+                with lock:
+                    claimed.append(job['id'])
+        
+        threads = [threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sorted(claimed), sorted(jobs))
+    
+    def test_stale_jobs_are_recovered(self):
+        """Jobs of a dead worker are queued again, then failed after too many attempts."""
+        job_id = self.queue.enqueue({'text': "post"})
+        self.queue.claim('dead-worker')
+        
+        with mock.patch('job_queue.time.time', return_value=time.time() + 600):
+            self.assertEqual(self.queue.requeue_stale(stale_seconds=120, max_attempts=2), 1)
+        self.assertEqual(self.queue.status(job_id)['status'], QUEUED)
+        
+        self.queue.claim('dead-worker')
+        with mock.patch('job_queue.time.time', return_value=time.time() + 600):
+            self.queue.requeue_stale(stale_seconds=120, max_attempts=2)
+        job = self.queue.status(job_id)
+        self.assertEqual(job['status'], FAILED)
+        self.assertEqual(job['attempts'], 2)
+    
+    def test_cancel(self):
+        """Cancelled jobs are never claimed and a late result does not overwrite the cancel."""
+        queued = self.queue.enqueue({'text': "first"})
+        running = self.queue.enqueue({'text': "second"})
+        self.assertTrue(self.queue.cancel(queued))
+        self.assertEqual(self.queue.claim('worker-1')['id'], running)
+        
+        self.assertTrue(self.queue.cancel(running))
+        self.queue.complete(running, {'podcast_path': "late.mp3"})
+        self.assertEqual(self.queue.status(running)['status'], CANCELLED)
+        self.assertIsNone(self.queue.result(running))
+        self.assertFalse(self.queue.cancel(running))
+
+class TestWorker(unittest.TestCase):
+    """Test cases for the worker loop."""
+    
+    def test_runs_jobs_and_records_failures(self):
+        """Results and errors of jobs end up in the queue."""
+        def fake_run_job(job_id, params, progress=None, cancel=None):
+            if params['text'] == "bad":
+                raise RuntimeError("Failed to fetch or process blog content")
+            return {'podcast_path': f"/output/podcast_{job_id}.mp3"}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = JobQueue(os.path.join(tmp, 'jobs.db'))
+            good = queue.enqueue({'text': "good"})
+            bad = queue.enqueue({'text': "bad"})
+            with mock.patch('worker.run_job', side_effect=fake_run_job):
+                self.assertEqual(work(queue, 'worker-1', poll_seconds=0.01, max_jobs=2), 2)
+            
+            self.assertEqual(queue.result(good), {'podcast_path': f"/output/podcast_{good}.mp3"})
+            self.assertEqual(queue.status(bad)['status'], FAILED)
+            self.assertIn("Failed to fetch", queue.status(bad)['error'])
+
+if __name__ == '__main__':
+    unittest.main()
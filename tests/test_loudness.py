@@ -0,0 +1,45 @@
+"""
+Tests for loudness module.
+"""
+
+import unittest
+import numpy as np
+from loudness import combine, integrated_loudness, measure_chunk, normalization_gain
+
+def sine(frequency: float, seconds: float, frame_rate: int, dbfs: float) -> np.ndarray:
+    """Integer-valued 16-bit sine wave at the given peak level."""
+    t = np.arange(int(seconds * frame_rate)) / frame_rate
+    return np.round(np.sin(2 * np.pi * frequency * t) * 32767 * 10 ** (dbfs / 20))
+
+class TestLoudness(unittest.TestCase):
+    """Test cases for BS.1770 loudness measurement."""
+    
+    def test_reference_tone(self):
+        """A 997 Hz tone at -20 dBFS measures -23 LUFS (EBU Tech 3341)."""
+        stats = measure_chunk(sine(997, 10, 48000, -20), 48000)
+        self.assertAlmostEqual(integrated_loudness(stats), -23.0, delta=0.1)
+        self.assertAlmostEqual(stats['peak_db'], -20.0, delta=0.01)
+    
+    def test_combined_chunks_match_whole_signal(self):
+        """Adding chunk histograms gives the loudness of the merged audio."""
+        loud = sine(440, 20, 24000, -10)
+        quiet = sine(440, 20, 24000, -30)
+        
+        combined = integrated_loudness(combine([measure_chunk(loud, 24000),
+                                                measure_chunk(quiet, 24000)]))
+        whole = integrated_loudness(measure_chunk(np.concatenate([loud, quiet]), 24000))
+        self.assertAlmostEqual(combined, whole, delta=0.15)
+    
+    def test_silence_is_gated(self):
+        """Silence has no loudness and needs no gain."""
+        stats = measure_chunk(np.zeros(24000 * 2), 24000)
+        self.assertEqual(integrated_loudness(stats), float('-inf'))
+        self.assertIsNone(normalization_gain(stats, -16.0))
+    
+    def test_gain_is_peak_limited(self):
+        """The gain never pushes the sample peak above the limit."""
+        stats = measure_chunk(sine(997, 5, 48000, -3), 48000)
+        self.assertAlmostEqual(normalization_gain(stats, -1.0, max_peak_db=-1.0), 2.0, delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for mp3_frames module.
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+from mp3_frames import (
+    concat_mp3_files, iter_frames, is_info_frame, make_silence, parse_frame_header,
+    read_mp3_info
+)
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono, no CRC (what gTTS produces)
+GTTS_HEADER = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+
+def write_mp3(path: str, duration_ms: int, id3: bool = False) -> None:
+    """Write a valid MP3 stream made of silent frames."""
+    with open(path, 'wb') as f:
+        if id3:
+            f.write(b'ID3\x04\x00\x00\x00\x00\x00\x0a' + b'\0' * 10)
+        f.write(make_silence(GTTS_HEADER, duration_ms))
+        f.write(b'TAG' + b'\0' * 125)
+
+class TestFrameHeader(unittest.TestCase):
+    """Test cases for frame header parsing."""
+    
+    def test_parse_gtts_header(self):
+        """An MPEG-2 Layer III mono header is decoded correctly."""
+        self.assertEqual(GTTS_HEADER.layer, 3)
+        self.assertEqual(GTTS_HEADER.sample_rate, 24000)
+        self.assertEqual(GTTS_HEADER.bitrate, 32)
+        self.assertEqual(GTTS_HEADER.channels, 1)
+        self.assertEqual(GTTS_HEADER.samples_per_frame, 576)
+        self.assertEqual(GTTS_HEADER.frame_length, 96)
+    
+    def test_rejects_invalid_header(self):
+        """Bytes without a frame sync are not a header."""
+        self.assertIsNone(parse_frame_header(b'ID3\x04'))
+        self.assertIsNone(parse_frame_header(b'\xff'))
+
+class TestConcatMp3Files(unittest.TestCase):
+    """Test cases for frame-level concatenation."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_concatenates_with_gap_and_xing_header(self):
+        """Frames are copied in order with silence between files and a new Info frame."""
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f'chunk_{i}.mp3')
+            write_mp3(path, 1200, id3=(i == 1))
+            paths.append(path)
+        output_path = os.path.join(self.tmp.name, 'merged.mp3')
+        
+        info = concat_mp3_files(paths, output_path, gap_ms=500)
+        
+        with open(output_path, 'rb') as f:
+            data = f.read()
+        frames = list(iter_frames(data))
+        self.assertTrue(is_info_frame(data, *frames[0]))
+        
+        audio_frames = len(frames) - 1
+        self.assertEqual(audio_frames, 3 * 50 + 2 * 21)
+        xing_offset = 4 + GTTS_HEADER.side_info_size
+        flags, frame_count, byte_count = struct.unpack('>III', data[xing_offset + 4:xing_offset + 16])
+        self.assertEqual(frame_count, audio_frames)
+        self.assertEqual(byte_count, len(data))
+        self.assertAlmostEqual(info['duration'], audio_frames * 0.024, places=3)
+        self.assertNotIn(b'TAG', data)
+    
+    def test_rejects_mismatched_streams(self):
+        """Files with different sample rates cannot be joined frame by frame."""
+        first = os.path.join(self.tmp.name, 'a.mp3')
+        second = os.path.join(self.tmp.name, 'b.mp3')
+        write_mp3(first, 500)
+        with open(second, 'wb') as f:
+            # MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo
+            f.write(make_silence(parse_frame_header(bytes([0xFF, 0xFB, 0x90, 0x00])), 500))
+        
+        with self.assertRaises(ValueError):
+            concat_mp3_files([first, second], os.path.join(self.tmp.name, 'out.mp3'))
+
+class TestReadMp3Info(unittest.TestCase):
+    """Test cases for header-based audio info."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_constant_bitrate_with_tags(self):
+        """Duration of a CBR stream comes from its size, ignoring ID3 tags."""
+        path = os.path.join(self.tmp.name, 'cbr.mp3')
+        write_mp3(path, 60000, id3=True)
+        
+        info = read_mp3_info(path)
+        self.assertAlmostEqual(info['duration'], 60.0, places=2)
+        self.assertEqual(info['frame_rate'], 24000)
+        self.assertEqual(info['channels'], 1)
+        self.assertEqual(info['file_size'], os.path.getsize(path))
+    
+    def test_xing_frame_count(self):
+        """Duration comes from the Info frame when one is present."""
+        chunk = os.path.join(self.tmp.name, 'chunk.mp3')
+        merged = os.path.join(self.tmp.name, 'merged.mp3')
+        write_mp3(chunk, 2400)
+        expected = concat_mp3_files([chunk, chunk], merged)
+        
+        self.assertAlmostEqual(read_mp3_info(merged)['duration'], expected['duration'])
+    
+    def test_other_formats_are_not_parsed(self):
+        """Files that do not start with an MP3 stream are left to the decoder."""
+        path = os.path.join(self.tmp.name, 'audio.wav')
+        with open(path, 'wb') as f:
+            f.write(b'RIFF' + b'\0' * 40 + make_silence(GTTS_HEADER, 500))
+        
+        self.assertIsNone(read_mp3_info(path))
+
+if __name__ == '__main__':
+    unittest.main()
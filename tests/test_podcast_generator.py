@@ -4,11 +4,43 @@ Tests for podcast_generator module.
 
 import unittest
 import os
-from podcast_generator import generate_podcast
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from unittest import mock
+from audio_processor import get_audio_duration
+from cache_manager import AudioCache
+from checkpoint import CHECKPOINT_NAME
+from mp3_frames import make_silence, parse_frame_header
+from podcast_generator import (
+    generate_hls, generate_podcast, stream_podcast, synthesize_chunks, podcast_cache_key, _plan_chunks,
+    _render_locks, _synthesize_guarded
+)
+from resilience import Hedger, get_breaker
+from tts_backends import TTSBackend, get_backend
+from progress import CancellationToken, DONE, PLANNED, SYNTHESIZED
+from workspace import JobWorkspace
+
+_latency_dir = tempfile.TemporaryDirectory()
+_latency_db = mock.patch('config.TTS_LATENCY_MODEL_DB', os.path.join(_latency_dir.name, 'latency.db'))
+
+def setUpModule():
+    # Mocked TTS calls take no time; keep them out of the real latency model
+    _latency_db.start()
+
+def tearDownModule():
+    _latency_db.stop()
+    _latency_dir.cleanup()
 
 class TestPodcastGenerator(unittest.TestCase):
     """Test cases for podcast generator."""
     
+    def tearDown(self):
+        # Without network access these calls fail and open the gTTS circuit
+        get_breaker('gtts').reset()
+    
     def test_generate_podcast_short_text(self):
         """Test podcast generation with short text."""
         text = "This is a short test text for podcast generation."
@@ -30,5 +62,535 @@ class TestPodcastGenerator(unittest.TestCase):
         # Should handle long text (may return None if TTS fails)
         self.assertTrue(result is None or isinstance(result, str))
 
+class TestSynthesizeChunks(unittest.TestCase):
+    """Test cases for concurrent chunk synthesis."""
+    
+    def test_keeps_order_and_reports_failures(self):
+        """Results follow chunk order even when later chunks finish first."""
+        def fake_save(text, language, output_path):
+            # Earlier chunks take longer so completion order is reversed
+            time.sleep(0.05 * (3 - int(text[-1])))
+            if text.endswith('2'):
+                raise RuntimeError("quota exceeded")
+            with open(output_path, 'wb') as f:
+                f.write(b'audio')
+        
+        chunks = ["chunk 0", "chunk 1", "chunk 2", "chunk 3"]
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=fake_save):
+            results = synthesize_chunks(chunks, 'en', tmp, max_workers=4, use_cache=False)
+        
+        self.assertEqual([r['index'] for r in results], [0, 1, 2, 3])
+        self.assertIsNone(results[2]['path'])
+        self.assertIn("quota exceeded", results[2]['error'])
+        self.assertTrue(all(r['path'] for i, r in enumerate(results) if i != 2))
+    
+    def test_respects_worker_limit(self):
+        """No more than max_workers chunks are synthesized at once."""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def fake_save(text, language, output_path):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            with open(output_path, 'wb') as f:
+                f.write(b'audio')
+        
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=fake_save):
+            synthesize_chunks([f"chunk {i}" for i in range(8)], 'en', tmp, max_workers=2,
+                              use_cache=False)
+        
+        self.assertLessEqual(state['peak'], 2)
+    
+    def test_losing_hedge_leaves_no_file(self):
+        """The copy of a hedged call that finishes second has its file removed."""
+        class SlowFirstCopy(TTSBackend):
+            name = 'slow-first-copy'
+            
+            def synthesize(self, text, language, output_path):
+                if text == "Slow." and output_path.endswith('.0'):
+                    time.sleep(0.3)
+                with open(output_path, 'wb') as f:
+                    f.write(b'audio')
+        
+        hedger = Hedger(SlowFirstCopy.name, percentile=50, min_samples=1, max_fraction=1.0)
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict('resilience._hedgers', {SlowFirstCopy.name: hedger}):
+            for text in ("Fast.", "Slow."):
+                _synthesize_guarded(SlowFirstCopy(), text, 'en', os.path.join(tmp, f'{text}mp3'))
+            time.sleep(0.4)
+            files = sorted(os.listdir(tmp))
+        
+        self.assertEqual(hedger.metrics()['hedge_wins'], 1)
+        self.assertEqual(files, ['Fast.mp3', 'Slow.mp3'])
+    
+    def test_reuses_cached_chunks(self):
+        """Chunks already in the audio cache are not synthesized again."""
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(text.encode('utf-8'))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AudioCache('audio_chunks', max_size_mb=1)
+            cache.cache_dir = os.path.join(tmp, 'cache')
+            os.makedirs(cache.cache_dir)
+            with mock.patch('podcast_generator.chunk_audio_cache', cache), \
+                    mock.patch('tts_backends._save_with_gtts', side_effect=fake_save) as save:
+                synthesize_chunks(["first chunk"], 'en', tmp)
+                results = synthesize_chunks(["first chunk", "second chunk"], 'en', tmp)
+        
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual([r['cached'] for r in results], [True, False])
+
+class TestConcurrentJobs(unittest.TestCase):
+    """Test cases for generations running at the same time."""
+    
+    def test_jobs_do_not_share_files(self):
+        """Concurrent jobs keep their own chunks and outputs."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        barrier = threading.Barrier(2)
+        
+        def fake_save(text, language, output_path):
+            # Both jobs write chunk_0.mp3 at the same moment
+            barrier.wait(timeout=5)
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000 if text.startswith("Short") else 3000))
+        
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        results = {}
+        
+        def run(text):
+            results[text] = generate_podcast(text, language='en')
+        
+        with mock.patch('tts_backends._save_with_gtts', side_effect=fake_save), \
+                mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.podcast_cache', disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            threads = [threading.Thread(target=run, args=(text,))
+                       for text in ("Short post.", "Longer post.")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertNotEqual(results["Short post."], results["Longer post."])
+        self.assertEqual(_render_locks, {})
+        self.assertAlmostEqual(get_audio_duration(results["Short post."]), 1.0, delta=0.1)
+        self.assertAlmostEqual(get_audio_duration(results["Longer post."]), 3.0, delta=0.1)
+        for path in results.values():
+            os.remove(path)
+
+class TestPodcastCache(unittest.TestCase):
+    """Test cases for the finished-podcast cache."""
+    
+    def test_cached_podcast_skips_synthesis(self):
+        """A podcast rendered before is returned without calling TTS."""
+        text = "This post was converted a minute ago."
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AudioCache('podcasts', max_size_mb=1)
+            cache.cache_dir = tmp
+            source = os.path.join(tmp, 'rendered.mp3')
+            with open(source, 'wb') as f:
+                f.write(b'finished podcast')
+            cache.put(podcast_cache_key(text, 'en', 1.25), source)
+            
+            with mock.patch('podcast_generator.podcast_cache', cache), \
+                    mock.patch('tts_backends._save_with_gtts') as save:
+                result = generate_podcast(text, language='en', speed=1.25)
+                with open(result, 'rb') as f:
+                    data = f.read()
+        
+        save.assert_not_called()
+        self.assertEqual(data, b'finished podcast')
+    
+    def test_opus_podcasts_are_cached_as_opus(self):
+        """An Opus render is stored and returned under an .ogg name, not .mp3."""
+        text = "This post was converted to Opus."
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AudioCache('podcasts', max_size_mb=1)
+            cache.cache_dir = tmp
+            source = os.path.join(tmp, 'rendered.ogg')
+            with open(source, 'wb') as f:
+                f.write(b'finished podcast')
+            cached = cache.put(podcast_cache_key(text, 'en', 1.0, 'opus'), source, extension='ogg')
+            
+            with mock.patch('podcast_generator.podcast_cache', cache), \
+                    mock.patch('podcast_generator.add_metadata'), \
+                    mock.patch('tts_backends._save_with_gtts') as save:
+                result = generate_podcast(text, language='en', audio_format='opus')
+        
+        save.assert_not_called()
+        self.assertTrue(cached.endswith('.ogg'))
+        self.assertTrue(result.endswith('.ogg'))
+        os.remove(result)
+    
+    def test_format_and_quality_are_part_of_the_key(self):
+        """Podcasts encoded with other profiles are not reused."""
+        keys = {podcast_cache_key("Same post.", 'en', 1.0, audio_format, quality)
+                for audio_format, quality in (('mp3', 'low'), ('mp3', 'high'), ('opus', 'low'))}
+        self.assertEqual(len(keys), 3)
+
+class TestMergeWithoutFfmpeg(unittest.TestCase):
+    """Test cases for merging when audio cannot be decoded."""
+    
+    def test_long_text_keeps_every_chunk(self):
+        """All chunks end up in the podcast instead of only the first one."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        text = "This is a long text. " * 500 + "Second Part Heading. " + "This is a long text. " * 500
+        metadata = {'title': "Long Post", 'headings': ["Second Part Heading."]}
+        with mock.patch('tts_backends._save_with_gtts', side_effect=fake_save) as save, \
+                mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.podcast_cache', disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            result = generate_podcast(text, language='en', metadata=metadata)
+        
+        # Chunks of about 1 second with 0.5 second pauses between them
+        chunks = save.call_count
+        self.assertGreater(chunks, 2)
+        self.assertAlmostEqual(get_audio_duration(result), chunks + 0.5 * (chunks - 1), delta=0.1)
+        # An intro chapter plus one starting at the heading
+        with open(result, 'rb') as f:
+            data = f.read()
+        self.assertEqual(data.count(b'CHAP'), 2)
+        self.assertIn(b'Second Part Heading.', data)
+
+class TestProgressAndCancellation(unittest.TestCase):
+    """Test cases for progress events and cancelling a generation."""
+    
+    def setUp(self):
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        self.silence = make_silence(header, 1000)
+        self.disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        self.disabled_cache.enabled = False
+        self.text = "This is a long text. " * 1000
+    
+    def generate(self, fake_save, **kwargs):
+        with mock.patch('tts_backends._save_with_gtts', side_effect=fake_save) as save, \
+                mock.patch('podcast_generator.chunk_audio_cache', self.disabled_cache), \
+                mock.patch('podcast_generator.podcast_cache', self.disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            return generate_podcast(self.text, language='en', **kwargs), save.call_count
+    
+    def test_reports_progress_in_order(self):
+        """Every chunk is reported and the progress only moves forward."""
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(self.silence)
+        
+        events = []
+        result, saves = self.generate(fake_save, progress=events.append)
+        os.remove(result)
+        
+        self.assertEqual(events[0].stage, PLANNED)
+        self.assertEqual(events[-1].stage, DONE)
+        synthesized = [e.completed for e in events if e.stage == SYNTHESIZED]
+        self.assertEqual(synthesized, list(range(1, saves + 1)))
+        fractions = [e.fraction for e in events]
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertEqual(fractions[-1], 1.0)
+    
+    def test_cancel_skips_pending_tts_calls(self):
+        """Chunks not yet sent to TTS are dropped once the job is cancelled."""
+        cancel = CancellationToken()
+        
+        def fake_save(text, language, output_path):
+            cancel.cancel()
+            with open(output_path, 'wb') as f:
+                f.write(self.silence)
+        
+        result, saves = self.generate(fake_save, cancel=cancel)
+        
+        self.assertIsNone(result)
+        self.assertLess(saves, len(_plan_chunks(self.text, get_backend('gtts'))))
+
+class TestResumableGeneration(unittest.TestCase):
+    """Test cases for failed chunks and resuming a render."""
+    
+    def setUp(self):
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        self.silence = make_silence(header, 1000)
+        self.disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        self.disabled_cache.enabled = False
+        self.text = ''.join(f"This is sentence {i}. " for i in range(1000))
+        self.job_id = uuid.uuid4().hex
+        self.failing = {"sentence 500."}
+    
+    def tearDown(self):
+        JobWorkspace(self.job_id).cleanup()
+    
+    def fake_save(self, text, language, output_path):
+        if any(sentence in text for sentence in self.failing):
+            raise RuntimeError("quota exceeded")
+        with open(output_path, 'wb') as f:
+            f.write(self.silence)
+    
+    def generate(self, **kwargs):
+        with mock.patch('tts_backends._save_with_gtts', side_effect=self.fake_save) as save, \
+                mock.patch('podcast_generator.chunk_audio_cache', self.disabled_cache), \
+                mock.patch('podcast_generator.podcast_cache', self.disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            return generate_podcast(self.text, language='en', job_id=self.job_id, **kwargs), save.call_count
+    
+    def test_resume_synthesizes_only_failed_chunks(self):
+        """A failed chunk produces no podcast; running the job again redoes only that chunk."""
+        result, chunks = self.generate()
+        self.assertIsNone(result)
+        self.assertGreater(chunks, 2)
+        
+        self.failing = set()
+        result, saves = self.generate()
+        self.assertEqual(saves, 1)
+        self.assertAlmostEqual(get_audio_duration(result), chunks + 0.5 * (chunks - 1), delta=0.1)
+        os.remove(result)
+    
+    def test_failed_merge_publishes_nothing(self):
+        """If the chunks can't be joined, no single chunk is passed off as the podcast."""
+        self.failing = set()
+        with mock.patch('audio_processor.concat_mp3_files', side_effect=ValueError("bad frame")):
+            result, chunks = self.generate()
+        self.assertIsNone(result)
+        self.assertTrue(os.path.exists(JobWorkspace(self.job_id).path(CHECKPOINT_NAME)))
+        
+        result, saves = self.generate()
+        self.assertEqual(saves, 0)
+        self.assertAlmostEqual(get_audio_duration(result), chunks + 0.5 * (chunks - 1), delta=0.1)
+        os.remove(result)
+    
+    def test_allow_partial(self):
+        """With allow_partial the podcast is produced without the failed chunk."""
+        result, chunks = self.generate(allow_partial=True)
+        self.assertAlmostEqual(get_audio_duration(result), (chunks - 1) + 0.5 * (chunks - 2),
+                               delta=0.1)
+        os.remove(result)
+    
+    def test_stream_stops_at_failed_chunk(self):
+        """A stream ends at the first failed chunk and leaves no incomplete podcast."""
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=self.fake_save), \
+                mock.patch('podcast_generator.chunk_audio_cache', self.disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            output_path = os.path.join(tmp, 'stream.mp3')
+            parts = list(stream_podcast(self.text, language='en', output_path=output_path,
+                                        job_id=self.job_id))
+            self.assertFalse(os.path.exists(output_path))
+            
+            # Running the job again synthesizes only the chunks not checkpointed
+            self.failing = set()
+            with mock.patch('tts_backends._save_with_gtts', side_effect=self.fake_save) as save:
+                resumed = list(stream_podcast(self.text, language='en', output_path=output_path,
+                                              job_id=self.job_id))
+        
+        self.assertGreater(len(parts), 1)
+        self.assertTrue(all(p['path'] for p in parts[:-1]))
+        self.assertIn("quota exceeded", parts[-1]['error'])
+        self.assertTrue(all(p['path'] for p in resumed))
+        # The parts streamed before the failure are not synthesized again
+        resynthesized = {call.args[0] for call in save.call_args_list}
+        self.assertLessEqual(len(resynthesized), len(resumed) - (len(parts) - 1))
+
+class TestStreamPodcast(unittest.TestCase):
+    """Test cases for progressive podcast output."""
+    
+    def test_first_part_plays_before_synthesis_finishes(self):
+        """The first part is yielded and playable while later chunks are still synthesizing."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        first_part_seen = threading.Event()
+        
+        def fake_save(text, language, output_path):
+            if not text.startswith("First"):
+                self.assertTrue(first_part_seen.wait(timeout=5))
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        text = "First sentence here. " + "This is a long text. " * 1000
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=fake_save), \
+                mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            output_path = os.path.join(tmp, 'stream.mp3')
+            parts = []
+            for part in stream_podcast(text, language='en', title="Long Post", output_path=output_path):
+                if not parts:
+                    # Playable on its own, and already in the growing output
+                    self.assertAlmostEqual(get_audio_duration(part['path']), 1.0, delta=0.1)
+                    self.assertAlmostEqual(get_audio_duration(output_path), 1.0, delta=0.1)
+                    first_part_seen.set()
+                parts.append(part)
+            final_duration = get_audio_duration(output_path)
+            with open(output_path, 'rb') as f:
+                tagged = f.read(3) == b'ID3'
+        
+        self.assertEqual([p['index'] for p in parts], list(range(len(parts))))
+        # One second of audio, then the half-second pause (in whole frames)
+        self.assertAlmostEqual(parts[1]['start_ms'], 1500, delta=30)
+        self.assertAlmostEqual(final_duration, parts[-1]['end_ms'] / 1000.0, delta=0.1)
+        self.assertTrue(tagged)
+    
+    def test_concurrent_streams_render_once(self):
+        """A second viewer of the same post waits for the first render and gets it from the cache."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        
+        def fake_save(text, language, output_path):
+            time.sleep(0.05)
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        def fake_run(pipeline, output_path, **kwargs):
+            shutil.copyfile(pipeline.audio_files[0], output_path)
+        
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        text = ''.join(f"This is sentence {i}. " for i in range(200))
+        parts = {}
+        
+        def run(viewer):
+            parts[viewer] = list(stream_podcast(text, language='en'))
+        
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=fake_save) as save, \
+                mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', autospec=True, side_effect=fake_run):
+            cache = AudioCache('podcasts', max_size_mb=10)
+            cache.cache_dir = tmp
+            with mock.patch('podcast_generator.podcast_cache', cache):
+                threads = [threading.Thread(target=run, args=(viewer,)) for viewer in range(2)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        
+        rendered, cached = sorted(parts.values(), key=len, reverse=True)
+        # Every chunk is synthesized for one viewer only (slow calls may be hedged)
+        self.assertEqual(len({call.args[0] for call in save.call_args_list}), len(rendered))
+        self.assertEqual(len(cached), 1)
+        self.assertAlmostEqual(cached[0]['end_ms'], rendered[-1]['end_ms'], delta=30)
+        for viewer_parts in parts.values():
+            os.remove(viewer_parts[-1]['output_path'])
+    
+    def test_cancel_removes_the_output(self):
+        """A cancelled stream ends without leaving a truncated podcast behind."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        cancel = CancellationToken()
+        
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        text = ''.join(f"This is sentence {i}. " for i in range(300))
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch('tts_backends._save_with_gtts', side_effect=fake_save), \
+                mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.AudioPipeline.run', side_effect=RuntimeError("no ffmpeg")):
+            output_path = os.path.join(tmp, 'stream.mp3')
+            parts = []
+            for part in stream_podcast(text, language='en', output_path=output_path, cancel=cancel):
+                parts.append(part)
+                cancel.cancel()
+            
+            self.assertEqual(len(parts), 1)
+            self.assertFalse(os.path.exists(output_path))
+
+class TestGenerateHls(unittest.TestCase):
+    """Test cases for segmented HLS output."""
+    
+    def test_renders_share_leading_segments(self):
+        """A post that only changes at the end reuses the segments before the change."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 3000))
+        
+        base = "This is a long text. " * 500
+        with tempfile.TemporaryDirectory() as tmp:
+            segment_cache = AudioCache('hls_segments', max_size_mb=10)
+            segment_cache.cache_dir = tmp
+            disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+            disabled_cache.enabled = False
+            output_dir = os.path.join(tmp, 'out')
+            with mock.patch('tts_backends._save_with_gtts', side_effect=fake_save) as save, \
+                    mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                    mock.patch('podcast_generator.hls_segment_cache', segment_cache), \
+                    mock.patch('podcast_generator.ffmpeg_available', return_value=False):
+                first = generate_hls(base + "The original ending.", 'en', output_dir=output_dir,
+                                     segment_seconds=2)
+                with open(first, encoding='utf-8') as f:
+                    first_segments = [l for l in f.read().splitlines() if not l.startswith('#')]
+                calls = save.call_count
+                
+                second = generate_hls(base + "A different ending.", 'en', output_dir=output_dir,
+                                      segment_seconds=2)
+                with open(second, encoding='utf-8') as f:
+                    second_segments = [l for l in f.read().splitlines() if not l.startswith('#')]
+                self.assertTrue(all(os.path.exists(os.path.join(output_dir, s))
+                                    for s in second_segments))
+        
+        # 3 chunks of 3 seconds plus two pauses, in 2 second segments that restart at each chunk
+        self.assertEqual(calls, 3)
+        self.assertEqual(len(first_segments), 6)
+        # Only the last chunk is synthesized again; its segments are new
+        self.assertEqual(save.call_count - calls, 1)
+        self.assertEqual(first_segments[:4], second_segments[:4])
+        self.assertNotEqual(first_segments[4:], second_segments[4:])
+    
+    def render(self, fake_save, **kwargs):
+        """Render a three-chunk post as HLS through generate_podcast."""
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        with tempfile.TemporaryDirectory() as tmp:
+            segment_cache = AudioCache('hls_segments', max_size_mb=10)
+            segment_cache.cache_dir = tmp
+            with mock.patch('tts_backends._save_with_gtts', side_effect=fake_save), \
+                    mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                    mock.patch('podcast_generator.hls_segment_cache', segment_cache), \
+                    mock.patch('podcast_generator.ffmpeg_available', return_value=False), \
+                    mock.patch('podcast_generator.OUTPUT_DIR', tmp):
+                text = ''.join(f"This is sentence {i}. " for i in range(600))
+                return generate_podcast(text, 'en', hls=True, **kwargs)
+    
+    def test_reports_progress(self):
+        """HLS renders report the same stages as MP3 renders."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        events = []
+        
+        def fake_save(text, language, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        self.assertIsNotNone(self.render(fake_save, progress=events.append))
+        self.assertEqual(events[0].stage, PLANNED)
+        self.assertEqual(events[-1].stage, DONE)
+        synthesized = [e.completed for e in events if e.stage == SYNTHESIZED]
+        self.assertEqual(synthesized, list(range(1, events[0].total + 1)))
+    
+    def test_cancel_writes_no_playlist(self):
+        """A cancelled HLS render stops sending chunks to TTS and returns None."""
+        header = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC4]))
+        cancel = CancellationToken()
+        
+        def fake_save(text, language, output_path):
+            cancel.cancel()
+            with open(output_path, 'wb') as f:
+                f.write(make_silence(header, 1000))
+        
+        self.assertIsNone(self.render(fake_save, cancel=cancel))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for the shared rate limiter and retry helper.
+"""
+
+import unittest
+import os
+import tempfile
+import time
+from unittest import mock
+from rate_limiter import TokenBucket, call_with_backoff, is_retryable, is_throttled
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+class FakeTTSError(Exception):
+    """Shaped like gTTSError: the response (if any) is in `rsp`."""
+    def __init__(self, status_code=None):
+        super().__init__(f"status {status_code}")
+        self.rsp = FakeResponse(status_code) if status_code else None
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the SQLite token bucket."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'limits.db')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def bucket(self, **kwargs):
+        return TokenBucket('tts', db_path=self.db_path, **kwargs)
+    
+    def test_waits_once_the_burst_is_spent(self):
+        """Requests beyond the burst are spaced at the rate."""
+        bucket = self.bucket(rate=20.0, burst=2)
+        start = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.04)
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(bucket.metrics()['acquired'], 3)
+    
+    def test_budget_is_shared_between_instances(self):
+        """A bucket opened elsewhere (another process) sees the tokens already taken."""
+        self.bucket(rate=0.5, burst=1).acquire()
+        with self.assertRaises(TimeoutError):
+            self.bucket(rate=0.5, burst=1).acquire(timeout=0.1)
+    
+    def test_rate_adapts_to_throttling(self):
+        """Throttling halves the rate; successes raise it again up to the maximum."""
+        bucket = self.bucket(rate=4.0, min_rate=1.0, max_rate=5.0, step=0.5)
+        bucket.throttled()
+        bucket.throttled()
+        bucket.throttled()
+        metrics = bucket.metrics()
+        self.assertEqual(metrics['rate'], 1.0)
+        self.assertEqual(metrics['throttled'], 3)
+        for _ in range(10):
+            bucket.succeeded()
+        self.assertEqual(bucket.metrics()['rate'], 5.0)
+    
+    def test_database_is_created_on_first_use(self):
+        """Constructing a bucket touches no files."""
+        self.bucket()
+        self.assertFalse(os.path.exists(self.db_path))
+
+class TestBackoff(unittest.TestCase):
+    """Test cases for retries with backoff."""
+    
+    def test_classifies_errors(self):
+        """Throttling, server and network errors are retried; client errors are not."""
+        self.assertTrue(is_retryable(FakeTTSError(429)))
+        self.assertTrue(is_retryable(FakeTTSError(503)))
+        self.assertTrue(is_retryable(FakeTTSError()))
+        self.assertTrue(is_retryable(ConnectionError("reset")))
+        self.assertFalse(is_retryable(FakeTTSError(400)))
+        self.assertFalse(is_retryable(ValueError("Language not supported")))
+        self.assertTrue(is_throttled(FakeTTSError(429)))
+        self.assertFalse(is_throttled(FakeTTSError(503)))
+    
+    def test_retries_with_growing_jittered_delays(self):
+        """Retryable errors are retried until the call succeeds."""
+        calls = []
+        
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise FakeTTSError(429)
+            return "saved"
+        
+        with mock.patch('rate_limiter.time.sleep') as sleep:
+            self.assertEqual(call_with_backoff(flaky, retries=3, base_delay=1.0, max_delay=10.0), "saved")
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertLessEqual(delays[0], 1.0)
+        self.assertLessEqual(delays[1], 2.0)
+    
+    def test_gives_up(self):
+        """Errors that are not retryable, or keep failing, are raised."""
+        failing = mock.Mock(side_effect=FakeTTSError(400))
+        with self.assertRaises(FakeTTSError):
+            call_with_backoff(failing, retries=3)
+        self.assertEqual(failing.call_count, 1)
+        
+        failing = mock.Mock(side_effect=FakeTTSError(503))
+        with mock.patch('rate_limiter.time.sleep'), self.assertRaises(FakeTTSError):
+            call_with_backoff(failing, retries=2)
+        self.assertEqual(failing.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
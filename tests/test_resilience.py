@@ -0,0 +1,168 @@
+"""
+Tests for resilience module.
+"""
+
+import unittest
+import threading
+import time
+from config import MAX_TTS_WORKERS
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, Hedger
+
+class ServiceDown(OSError):
+    """A network failure, which counts against the circuit."""
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for failing fast while a backend is down."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Failures in a row open the circuit; calls are then rejected."""
+        breaker = CircuitBreaker('test', failure_threshold=3, reset_seconds=60)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure(ServiceDown())
+        breaker.before_call()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure(ServiceDown())
+        
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        self.assertEqual(breaker.metrics()['opened'], 1)
+        self.assertEqual(breaker.metrics()['rejected'], 1)
+    
+    def test_rejected_requests_do_not_count(self):
+        """Errors that don't point at the service leave the circuit closed."""
+        breaker = CircuitBreaker('test', failure_threshold=1)
+        breaker.before_call()
+        breaker.record_failure(ValueError("Language not supported"))
+        self.assertEqual(breaker.state, CLOSED)
+    
+    def test_single_trial_call_after_reset_time(self):
+        """Once the reset time has passed, one call is let through to test the service."""
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_seconds=0.05)
+        breaker.before_call()
+        breaker.record_failure(ServiceDown())
+        time.sleep(0.06)
+        
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure(ServiceDown())
+        self.assertEqual(breaker.state, OPEN)
+        
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+class TestHedger(unittest.TestCase):
+    """Test cases for hedged calls."""
+    
+    def warm_up(self, hedger, seconds=0.01, calls=10):
+        for _ in range(calls):
+            hedger.call(lambda attempt: time.sleep(seconds))
+    
+    def test_slow_call_is_hedged_and_hedge_wins(self):
+        """A call slower than the percentile gets a second copy, which is used."""
+        hedger = Hedger('test', percentile=90, min_samples=10, max_fraction=0.5)
+        self.assertIsNone(hedger.hedge_delay())
+        self.warm_up(hedger)
+        released = threading.Event()
+        
+        def call(attempt):
+            if attempt == 0:
+                released.wait(5)
+                return 'primary'
+            return 'hedge'
+        
+        start = time.monotonic()
+        self.assertEqual(hedger.call(call), 'hedge')
+        self.assertLess(time.monotonic() - start, 1.0)
+        released.set()
+        
+        metrics = hedger.metrics()
+        self.assertEqual(metrics['hedged'], 1)
+        self.assertEqual(metrics['hedge_wins'], 1)
+        self.assertAlmostEqual(metrics['hedge_rate'], 1 / 11)
+        self.assertEqual(metrics['win_rate'], 1.0)
+    
+    def test_hedge_budget(self):
+        """No more than max_fraction of calls are hedged."""
+        hedger = Hedger('test', percentile=50, min_samples=10, max_fraction=0.1)
+        self.warm_up(hedger)
+        for _ in range(5):
+            hedger.call(lambda attempt: time.sleep(0.05))
+        self.assertEqual(hedger.metrics()['hedged'], 1)
+    
+    def test_cost_scales_the_delay(self):
+        """Latencies are compared per unit of cost."""
+        hedger = Hedger('test', percentile=50, min_samples=10)
+        for _ in range(10):
+            hedger.call(lambda attempt: time.sleep(0.01), cost=2.0)
+        self.assertAlmostEqual(hedger.hedge_delay(4.0), 2 * hedger.hedge_delay(2.0))
+    
+    def test_error_waits_for_the_other_copy(self):
+        """If one copy fails, the other copy's result is still used."""
+        hedger = Hedger('test', percentile=50, min_samples=10, max_fraction=1.0)
+        self.warm_up(hedger, seconds=0.005)
+        
+        def call(attempt):
+            if attempt == 0:
+                time.sleep(0.1)
+                raise ServiceDown("timed out")
+            time.sleep(0.2)
+            return 'hedge'
+        
+        self.assertEqual(hedger.call(call), 'hedge')
+    
+    def test_losing_copy_is_handed_back(self):
+        """The copy that lost is passed to on_abandoned once it finishes."""
+        hedger = Hedger('test', percentile=50, min_samples=10, max_fraction=1.0)
+        self.warm_up(hedger, seconds=0.005)
+        released = threading.Event()
+        abandoned = []
+        
+        def call(attempt):
+            if attempt == 0:
+                released.wait(5)
+                raise ServiceDown("timed out")
+            return 'hedge'
+        
+        result = hedger.call(call, on_abandoned=lambda n, future: abandoned.append((n, future)))
+        self.assertEqual(result, 'hedge')
+        self.assertEqual(abandoned, [])
+        released.set()
+        for _ in range(100):
+            if abandoned:
+                break
+            time.sleep(0.01)
+        
+        self.assertEqual(abandoned[0][0], 0)
+        self.assertIsInstance(abandoned[0][1].exception(), ServiceDown)
+    
+    def test_threads_follow_backend_concurrency(self):
+        """Every call the backend can take at once can be hedged without waiting for a thread."""
+        hedger = Hedger('test', max_concurrency=16)
+        self.assertEqual(hedger._get_executor()._max_workers, 16)
+        self.assertGreaterEqual(Hedger('test', max_concurrency=1)._get_executor()._max_workers,
+                                MAX_TTS_WORKERS)
+    
+    def test_concurrent_calls_are_not_hedged(self):
+        """Many calls at once each start right away, so none is hedged for waiting its turn."""
+        # Hedged only when slower than every call so far
+        hedger = Hedger('test', percentile=100, min_samples=10, max_fraction=1.0)
+        self.warm_up(hedger, seconds=0.1)
+        threads = [threading.Thread(target=hedger.call, args=(lambda attempt: time.sleep(0.02),))
+                   for _ in range(16 * MAX_TTS_WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(hedger.metrics()['hedged'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
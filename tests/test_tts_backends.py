@@ -0,0 +1,90 @@
+"""
+Tests for tts_backends module.
+"""
+
+import unittest
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from audio_processor import get_audio_duration
+from cache_manager import AudioCache
+from podcast_generator import chunk_cache_key, generate_podcast
+from tts_backends import OfflineBackend, TTSCapabilities, available_backends, get_backend
+
+class TestRegistry(unittest.TestCase):
+    """Test cases for looking up backends."""
+    
+    def test_lookup(self):
+        """Both shipped backends are registered; unknown names are rejected."""
+        self.assertIn('gtts', available_backends())
+        self.assertIn('offline', available_backends())
+        self.assertEqual(get_backend('offline').name, 'offline')
+        with self.assertRaises(ValueError):
+            get_backend('missing')
+    
+    def test_backend_is_part_of_the_cache_key(self):
+        """Audio from one backend is never served for another."""
+        self.assertNotEqual(chunk_cache_key("Hello.", 'en', 'gtts'),
+                            chunk_cache_key("Hello.", 'en', 'offline'))
+
+class TestOfflineBackend(unittest.TestCase):
+    """Test cases for the offline backend."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_deterministic_audio(self):
+        """The same text gives the same bytes, as long as it takes to read."""
+        backend = OfflineBackend(words_per_minute=150)
+        paths = [os.path.join(self.tmp.name, f'{i}.mp3') for i in range(3)]
+        text = "word " * 25
+        for chunk, path in zip([text, text, "Short."], paths):
+            backend.synthesize(chunk, 'en', path)
+        
+        with open(paths[0], 'rb') as a, open(paths[1], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertAlmostEqual(get_audio_duration(paths[0]), 10.0, delta=0.1)
+        self.assertLess(get_audio_duration(paths[2]), 1.0)
+    
+    def test_simulated_latency_and_concurrency(self):
+        """Calls take the configured time and can run at the same time."""
+        backend = OfflineBackend(latency=0.1, max_concurrency=4)
+        paths = [os.path.join(self.tmp.name, f'{i}.mp3') for i in range(4)]
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda path: backend.synthesize("Hello.", 'en', path), paths))
+        elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.3)
+    
+    def test_generate_podcast_offline(self):
+        """The whole pipeline runs without the network."""
+        disabled_cache = AudioCache('audio_chunks', max_size_mb=1)
+        disabled_cache.enabled = False
+        text = "This sentence is spoken offline. " * 300
+        with mock.patch('podcast_generator.chunk_audio_cache', disabled_cache), \
+                mock.patch('podcast_generator.podcast_cache', disabled_cache), \
+                mock.patch.object(get_backend('offline'), 'capabilities',
+                                  TTSCapabilities(max_chars=2000, max_concurrency=2)):
+            path = generate_podcast(text, language='en', tts_backend='offline')
+        
+        self.assertIsNotNone(path)
+        try:
+            # 1500 words at 150 per minute, plus the gaps between the chunks
+            self.assertAlmostEqual(get_audio_duration(path), 602.0, delta=2.0)
+        finally:
+            os.remove(path)
+    
+    def test_unsupported_language(self):
+        """A backend that can't speak the language fails before any work is done."""
+        with mock.patch.object(get_backend('offline'), 'capabilities',
+                               TTSCapabilities(2000, 2, frozenset({'en'}))):
+            self.assertIsNone(generate_podcast("Bonjour.", language='fr', tts_backend='offline'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for workspace module.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from workspace import JobWorkspace, collect_garbage
+
+class TestJobWorkspace(unittest.TestCase):
+    """Test cases for per-job working directories."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, 'jobs')
+        self.output_dir = os.path.join(self.tmp.name, 'output')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_jobs_are_isolated(self):
+        """Jobs get their own directory and output path, removed when they end."""
+        with JobWorkspace(root=self.root) as first, JobWorkspace(root=self.root) as second:
+            self.assertNotEqual(first.path('chunk_0.mp3'), second.path('chunk_0.mp3'))
+            self.assertNotEqual(first.output_path('mp3', self.output_dir),
+                                second.output_path('mp3', self.output_dir))
+            with open(first.path('chunk_0.mp3'), 'wb') as f:
+                f.write(b'audio')
+        
+        self.assertEqual(os.listdir(self.root), [])
+    
+    def test_collects_abandoned_workspaces_and_old_outputs(self):
+        """Stale workspaces and expired outputs go; live ones stay."""
+        abandoned = JobWorkspace('abandoned', root=self.root)
+        live = JobWorkspace('live', root=self.root)
+        old_output = abandoned.output_path('mp3', self.output_dir)
+        new_output = live.output_path('mp3', self.output_dir)
+        for path in (old_output, new_output):
+            with open(path, 'wb') as f:
+                f.write(b'podcast')
+        
+        long_ago = time.time() - 48 * 3600
+        os.utime(os.path.join(abandoned.dir, '.heartbeat'), (long_ago, long_ago))
+        os.utime(old_output, (long_ago, long_ago))
+        
+        removed = collect_garbage(self.root, self.output_dir, max_age_hours=6,
+                                  output_max_age_hours=24)
+        
+        self.assertEqual(removed, 2)
+        self.assertEqual(os.listdir(self.root), ['live'])
+        self.assertFalse(os.path.exists(old_output))
+        self.assertTrue(os.path.exists(new_output))
+    
+    def test_segments_of_live_playlists_are_kept(self):
+        """Old HLS segments stay while a playlist that has not expired refers to them."""
+        hls_dir = os.path.join(self.output_dir, 'hls')
+        os.makedirs(hls_dir)
+        long_ago = time.time() - 48 * 3600
+        files = {'live.m3u8': '#EXTM3U\n#EXTINF:6.000,\nshared.mp3\n',
+                 'old.m3u8': '#EXTM3U\n#EXTINF:6.000,\nshared.mp3\n#EXTINF:6.000,\nold.mp3\n',
+                 'shared.mp3': '', 'old.mp3': ''}
+        for name, content in files.items():
+            path = os.path.join(hls_dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            if name != 'live.m3u8':
+                os.utime(path, (long_ago, long_ago))
+        
+        collect_garbage(self.root, self.output_dir, output_max_age_hours=24)
+        
+        self.assertEqual(sorted(os.listdir(hls_dir)), ['live.m3u8', 'shared.mp3'])
+
+if __name__ == '__main__':
+    unittest.main()
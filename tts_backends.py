@@ -0,0 +1,265 @@
+"""
+Text-to-speech backends.
+
+Every backend turns a chunk of text into an MP3 file and declares what it
+can handle (chunk size, concurrent requests, languages), which the pipeline
+uses to split text and size its worker pool. Backends are registered by
+name; TTS_BACKEND in config picks the default.
+
+    backend = get_backend('offline')
+    backend.synthesize("Hello there.", 'en', 'hello.mp3')
+
+Two backends ship with the app: 'gtts' (Google Translate's TTS service) and
+'offline', which writes silent audio of a realistic duration after a
+configurable delay, so the pipeline can be benchmarked and load-tested
+without the network.
+"""
+
+import base64
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+from config import (
+    TTS_BACKEND, MAX_AUDIO_CHUNK_SIZE, MAX_TTS_WORKERS, GTTS_BASE_URL, GTTS_PARALLEL_REQUESTS,
+    REQUEST_TIMEOUT, OFFLINE_TTS_LATENCY_SECONDS, OFFLINE_TTS_SECONDS_PER_1000_CHARS,
+    OFFLINE_TTS_WORDS_PER_MINUTE, OFFLINE_TTS_MAX_CONCURRENCY
+)
+from mp3_frames import make_silence, parse_frame_header
+from rate_limiter import TokenBucket, call_with_backoff, is_throttled
+
+class TTSCapabilities(NamedTuple):
+    """What a TTS backend accepts."""
+    max_chars: int  # Longest text sent in one synthesize call
+    max_concurrency: int  # Calls worth running at the same time
+    languages: Optional[FrozenSet[str]] = None  # Language codes (None: any)
+
+class TTSBackend:
+    """
+    Base class of TTS backends.
+
+    Subclasses set `name` and `capabilities` and implement synthesize.
+    """
+
+    name = ''
+    label = ''  # Shown in the app's settings
+    version = '1'
+    capabilities = TTSCapabilities(MAX_AUDIO_CHUNK_SIZE, MAX_TTS_WORKERS)
+
+    def backend_id(self) -> str:
+        """Backend and version; part of the cache key of everything it renders."""
+        return f"{self.name}-{self.version}"
+
+    def supports_language(self, language: str) -> bool:
+        """Whether the backend can speak a language."""
+        languages = self.capabilities.languages
+        return languages is None or language in languages
+
+    def synthesize(self, text: str, language: str, output_path: str) -> None:
+        """
+        Synthesize text into an MP3 file.
+
+        Args:
+            text: Text of at most capabilities.max_chars characters
+            language: Language code (e.g., 'en', 'es', 'fr')
+            output_path: Where to write the MP3 file
+
+        Raises:
+            Exception: If no audio could be produced (no partial file is left behind)
+        """
+        raise NotImplementedError
+
+_backends: Dict[str, TTSBackend] = {}
+
+def register_backend(backend: TTSBackend) -> TTSBackend:
+    """Make a backend available under its name (replacing one of the same name)."""
+    _backends[backend.name] = backend
+    return backend
+
+def get_backend(name: Optional[str] = None) -> TTSBackend:
+    """
+    Look up a registered backend.
+
+    Args:
+        name: Backend name (default: TTS_BACKEND)
+
+    Raises:
+        ValueError: If no backend is registered under the name
+    """
+    name = name or TTS_BACKEND
+    if name not in _backends:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    return _backends[name]
+
+def available_backends() -> List[str]:
+    """Names of the registered backends."""
+    return sorted(_backends)
+
+# Requests to Google Translate's TTS endpoint from every thread and process
+tts_rate_limiter = TokenBucket('gtts')
+
+_gtts_session = None
+_gtts_session_lock = threading.Lock()
+
+def _get_gtts_session():
+    """Keep-alive HTTP session shared by every TTS request of this process."""
+    global _gtts_session
+    with _gtts_session_lock:
+        if _gtts_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            # Enough pooled connections for every chunk worker's sub-requests at once
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=MAX_TTS_WORKERS * GTTS_PARALLEL_REQUESTS
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _gtts_session = session
+        return _gtts_session
+
+def _request_gtts_part(body: str, headers: Dict[str, str]) -> bytes:
+    """Send one gTTS sub-request and return its MP3 audio."""
+    response = _get_gtts_session().post(
+        f"{GTTS_BASE_URL}/_/TranslateWebserverUi/data/batchexecute",
+        data=body, headers=headers, timeout=REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    for line in response.text.splitlines():
+        if 'jQ1olc' in line:
+            match = re.search(r'jQ1olc","\[\\"(.*)\\"]', line)
+            if match:
+                return base64.b64decode(match.group(1))
+    raise RuntimeError("gTTS response contained no audio")
+
+def _save_with_gtts(text: str, language: str, output_path: str) -> None:
+    """
+    Synthesize text with gTTS and save it, raising on failure.
+
+    gTTS splits text into sentence-sized parts and would fetch them one
+    after another, each on a new connection. Here gTTS only prepares the
+    parts; they are sent GTTS_PARALLEL_REQUESTS at a time over the shared
+    keep-alive session and the audio is joined in order. Each part goes
+    through the shared rate limiter, and throttling, server and network
+    errors are retried with backoff before giving up.
+    """
+    from gtts import gTTS
+    tts = gTTS(text=text, lang=language, slow=False)
+    bodies = tts.get_bodies()
+
+    # Once one part has failed for good the chunk is lost; stop sending the rest
+    failed = threading.Event()
+    errors = []
+
+    def fetch(body):
+        def attempt():
+            if failed.is_set():
+                raise RuntimeError("Another part of the chunk failed")
+            tts_rate_limiter.acquire()
+            try:
+                audio = _request_gtts_part(body, tts.GOOGLE_TTS_HEADERS)
+            except Exception as e:
+                if is_throttled(e):
+                    tts_rate_limiter.throttled()
+                raise
+            tts_rate_limiter.succeeded()
+            return audio
+
+        def on_retry(error, delay):
+            tts_rate_limiter.retried()
+            print(f"gTTS request failed ({error}); retrying in {delay:.1f}s")
+
+        try:
+            return call_with_backoff(attempt, on_retry=on_retry)
+        except Exception as e:
+            if not failed.is_set():
+                errors.append(e)
+            failed.set()
+            raise
+
+    workers = max(1, min(GTTS_PARALLEL_REQUESTS, len(bodies)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, body) for body in bodies]
+        try:
+            parts = [future.result() for future in futures]
+        except Exception:
+            # Report the part that failed, not the parts stopped because of it
+            if errors:
+                raise errors[0]
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    # Write under a temporary name so a failed chunk never leaves a partial file
+    temp_path = f"{output_path}.part"
+    with open(temp_path, 'wb') as f:
+        for audio in parts:
+            f.write(audio)
+    os.replace(temp_path, output_path)
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's TTS service, through the gTTS library (needs the network)."""
+
+    name = 'gtts'
+    label = "Google Text-to-Speech (gTTS)"
+
+    @property
+    def version(self) -> str:
+        try:
+            from gtts.version import __version__
+        except Exception:
+            __version__ = 'unknown'
+        return __version__
+
+    @property
+    def capabilities(self) -> TTSCapabilities:
+        from gtts.lang import tts_langs
+        return TTSCapabilities(MAX_AUDIO_CHUNK_SIZE, MAX_TTS_WORKERS, frozenset(tts_langs()))
+
+    def synthesize(self, text: str, language: str, output_path: str) -> None:
+        _save_with_gtts(text, language, output_path)
+
+# MPEG-2 Layer III, 24 kHz, 32 kbps mono: the stream configuration gTTS returns
+_OFFLINE_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC4])
+
+class OfflineBackend(TTSBackend):
+    """
+    Deterministic stand-in for a TTS service, for benchmarks and load tests.
+
+    Writes silence as long as the text would take to read at
+    `words_per_minute`, in the MP3 format gTTS produces, after sleeping
+    `latency + seconds_per_1000_chars * len(text) / 1000` to simulate the
+    service. The same text always gives the same bytes.
+    """
+
+    name = 'offline'
+    label = "Offline (silent audio, for testing)"
+
+    def __init__(self, latency: float = OFFLINE_TTS_LATENCY_SECONDS,
+                 seconds_per_1000_chars: float = OFFLINE_TTS_SECONDS_PER_1000_CHARS,
+                 words_per_minute: float = OFFLINE_TTS_WORDS_PER_MINUTE,
+                 max_concurrency: int = OFFLINE_TTS_MAX_CONCURRENCY):
+        self.latency = latency
+        self.seconds_per_1000_chars = seconds_per_1000_chars
+        self.words_per_minute = words_per_minute
+        self.capabilities = TTSCapabilities(MAX_AUDIO_CHUNK_SIZE, max_concurrency)
+
+    def duration_ms(self, text: str) -> int:
+        """Length of the audio produced for a text."""
+        return max(100, round(len(text.split()) * 60000 / self.words_per_minute))
+
+    def synthesize(self, text: str, language: str, output_path: str) -> None:
+        delay = self.latency + self.seconds_per_1000_chars * len(text) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        audio = make_silence(parse_frame_header(_OFFLINE_HEADER), self.duration_ms(text))
+        temp_path = f"{output_path}.part"
+        with open(temp_path, 'wb') as f:
+            f.write(audio)
+        os.replace(temp_path, output_path)
+
+register_backend(GTTSBackend())
+register_backend(OfflineBackend())
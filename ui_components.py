@@ -5,6 +5,9 @@ Reusable UI components for Streamlit application.
 import streamlit as st
 from typing import Optional
 import os
+from config import AUDIO_BITRATES, AUDIO_FORMAT, AUDIO_QUALITY, TTS_BACKEND
+from progress import ProgressEvent, PLANNED, SYNTHESIZED, MERGING, PROCESSING, ENCODING, DONE
+from tts_backends import available_backends, get_backend
 
 def display_progress_bar(message: str, progress: float = 0.0):
     """Display a progress bar with message."""
@@ -12,6 +15,25 @@ def display_progress_bar(message: str, progress: float = 0.0):
         st.progress(progress)
     st.info(message)
 
+_PROGRESS_LABELS = {
+    PLANNED: "Planned {total} chunks",
+    SYNTHESIZED: "Synthesized {completed} of {total} chunks",
+    MERGING: "Merging audio...",
+    PROCESSING: "Processing audio...",
+    ENCODING: "Encoding podcast...",
+    DONE: "Done"
+}
+
+def display_generation_progress():
+    """Display a progress bar and return a callback that updates it from progress events."""
+    bar = st.progress(0.0, text="Starting...")
+    
+    def update(event: ProgressEvent):
+        label = _PROGRESS_LABELS.get(event.stage, event.stage)
+        bar.progress(event.fraction, text=label.format(completed=event.completed, total=event.total))
+    
+    return update
+
 def display_result_card(title: Optional[str], content: any, file_path: Optional[str] = None,
                        download_label: Optional[str] = None, file_type: Optional[str] = None):
     """Display a result card with download option."""
@@ -22,7 +44,8 @@ def display_result_card(title: Optional[str], content: any, file_path: Optional[
         if file_type == 'audio':
             audio_file = open(file_path, 'rb')
             audio_bytes = audio_file.read()
-            st.audio(audio_bytes, format='audio/mp3')
+            mime = 'audio/ogg' if file_path.endswith('.ogg') else 'audio/mp3'
+            st.audio(audio_bytes, format=mime)
             audio_file.close()
         elif file_type == 'image':
             st.image(file_path, use_container_width=True)
@@ -104,11 +127,25 @@ def create_sidebar_settings():
         language = st.selectbox("Language", 
                                ["en", "es", "fr", "de", "it", "pt", "zh", "ja"],
                                index=0)
-        st.info("Using Google Text-to-Speech (gTTS)")
+        backends = available_backends()
+        tts_backend = st.selectbox("TTS Engine", backends,
+                                   index=backends.index(TTS_BACKEND) if TTS_BACKEND in backends else 0,
+                                   format_func=lambda name: get_backend(name).label or name)
+        
+        formats = list(AUDIO_BITRATES)
+        audio_format = st.selectbox("Output Format", formats, index=formats.index(AUDIO_FORMAT),
+                                    help="Opus files are smaller; MP3 plays everywhere and keeps chapters")
+        qualities = list(AUDIO_BITRATES[audio_format])
+        quality = st.selectbox("Audio Quality", qualities,
+                               index=qualities.index(AUDIO_QUALITY) if AUDIO_QUALITY in qualities else 0,
+                               format_func=lambda q: f"{q} ({AUDIO_BITRATES[audio_format][q]} kbps mono)")
         
         return {
             'voice_speed': voice_speed,
-            'language': language
+            'language': language,
+            'audio_format': audio_format,
+            'quality': quality,
+            'tts_backend': tts_backend
         }
 
 def display_loading_spinner(message: str):
@@ -0,0 +1,166 @@
+"""
+Worker processes that run podcast jobs from the job queue.
+
+Run alongside the Streamlit app (with ENABLE_JOB_QUEUE set in config.py);
+the number of workers is independent of the number of app replicas:
+
+    python worker.py --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import (
+    DEFAULT_LANGUAGE, DEFAULT_VOICE_SPEED, AUDIO_FORMAT, AUDIO_QUALITY,
+    JOB_QUEUE_DB, JOB_WORKERS, JOB_POLL_SECONDS, JOB_HEARTBEAT_SECONDS
+)
+from job_queue import JobQueue, CANCELLED
+from blog_fetcher import fetch_blog_content, fetch_from_text
+from legal_compliance import apply_excerpt_limits
+from podcast_generator import generate_podcast
+from progress import CancellationToken, ProgressCallback
+
+def run_job(job_id: str, params: Dict[str, Any],
+            progress: Optional[ProgressCallback] = None,
+            cancel: Optional[CancellationToken] = None) -> Dict[str, Any]:
+    """
+    Fetch a blog post and generate its podcast.
+
+    Args:
+        job_id: Job ID, used for the job's workspace and output file
+        params: 'url' or 'text', plus optional 'language', 'speed',
+            'audio_format', 'quality', 'tts_backend' and 'allow_partial'
+        progress: Called with generation progress events
+        cancel: Token that stops the generation
+
+    Returns:
+        Dictionary with 'podcast_path', 'content' and 'metadata'
+
+    Raises:
+        RuntimeError: If the content cannot be fetched or no audio is generated
+    """
+    if params.get('url'):
+        blog_data = fetch_blog_content(params['url'])
+    else:
+        blog_data = fetch_from_text(params.get('text') or '')
+    if not blog_data or not blog_data.get('content'):
+        raise RuntimeError("Failed to fetch or process blog content")
+
+    content = apply_excerpt_limits(blog_data['content'])
+    metadata = blog_data.get('metadata', {})
+    podcast_path = generate_podcast(
+        content,
+        language=params.get('language', DEFAULT_LANGUAGE),
+        speed=params.get('speed', DEFAULT_VOICE_SPEED),
+        title=metadata.get('title'),
+        author=metadata.get('author'),
+        metadata=metadata,
+        audio_format=params.get('audio_format', AUDIO_FORMAT),
+        quality=params.get('quality', AUDIO_QUALITY),
+        job_id=job_id,
+        progress=progress,
+        cancel=cancel,
+        tts_backend=params.get('tts_backend'),
+        allow_partial=params.get('allow_partial', False)
+    )
+    if cancel and cancel.cancelled:
+        raise RuntimeError("Cancelled")
+    if not podcast_path:
+        raise RuntimeError("Podcast generation failed. Note: gTTS requires an internet connection.")
+
+    return {
+        'podcast_path': os.path.abspath(podcast_path),
+        'content': content,
+        'metadata': metadata
+    }
+
+def work(queue: JobQueue, worker_id: str, stop: Optional[threading.Event] = None,
+         poll_seconds: float = JOB_POLL_SECONDS, max_jobs: Optional[int] = None) -> int:
+    """
+    Claim and run jobs until stopped.
+
+    Args:
+        queue: Job queue to take jobs from
+        worker_id: Name recorded on claimed jobs
+        stop: Event that ends the loop once set
+        poll_seconds: Wait between checks of an empty queue
+        max_jobs: Return after running this many jobs (default: run forever)
+
+    Returns:
+        Number of jobs run
+    """
+    stop = stop or threading.Event()
+    done = 0
+    while not stop.is_set() and (max_jobs is None or done < max_jobs):
+        queue.requeue_stale()
+        job = queue.claim(worker_id)
+        if not job:
+            stop.wait(poll_seconds)
+            continue
+
+        # Keep the job's heartbeat fresh so other workers don't recover it,
+        # and stop the job once it is cancelled
+        finished = threading.Event()
+        cancel = CancellationToken()
+
+        def beat():
+            while not finished.wait(JOB_HEARTBEAT_SECONDS):
+                queue.heartbeat(job['id'])
+                status = queue.status(job['id'])
+                if status and status['status'] == CANCELLED:
+                    cancel.cancel()
+
+        def progress(event):
+            queue.set_progress(job['id'], event.stage, event.fraction)
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            queue.complete(job['id'], run_job(job['id'], job['params'], progress, cancel))
+        except Exception as e:
+            print(f"Job {job['id']} failed: {e}")
+            queue.fail(job['id'], str(e) or type(e).__name__)
+        finally:
+            finished.set()
+            heartbeat.join()
+        done += 1
+    return done
+
+def _worker_main(db_path: str) -> None:
+    """Entry point of a worker process."""
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"Worker {worker_id} started")
+    try:
+        work(JobQueue(db_path), worker_id)
+    except KeyboardInterrupt:
+        pass
+
+def main(argv: Optional[list] = None) -> None:
+    """Start a pool of worker processes and wait for them."""
+    parser = argparse.ArgumentParser(description="Run podcast generation workers.")
+    parser.add_argument('--workers', type=int, default=JOB_WORKERS,
+                        help="number of worker processes")
+    parser.add_argument('--db', default=JOB_QUEUE_DB, help="job queue database")
+    args = parser.parse_args(argv)
+
+    # Create the schema once before the workers race to open the database
+    JobQueue(args.db)
+    processes = [multiprocessing.Process(target=_worker_main, args=(args.db,), daemon=True)
+                 for _ in range(max(1, args.workers))]
+    for process in processes:
+        process.start()
+    try:
+        while any(process.is_alive() for process in processes):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    for process in processes:
+        process.join()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Per-job working directories so concurrent generations never share files.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Optional, Set
+from config import (
+    WORKSPACE_DIR, OUTPUT_DIR, WORKSPACE_MAX_AGE_HOURS, OUTPUT_MAX_AGE_HOURS,
+    WORKSPACE_GC_INTERVAL_SECONDS
+)
+from utils import ensure_directory
+
+_HEARTBEAT = '.heartbeat'
+_TRASH_PREFIX = '.deleted-'
+
+class JobWorkspace:
+    """
+    Private directory for the intermediate files of one job.
+
+    Every file a job writes (chunk audio, renders, spill files) goes in its
+    workspace; finished outputs are moved to a per-job path in OUTPUT_DIR.
+    The workspace is removed atomically when the job ends: it is renamed out
+    of the way first, so a half-deleted workspace is never seen as a live
+    one. Workspaces whose job died without cleaning up are removed by
+    collect_garbage once their heartbeat is older than WORKSPACE_MAX_AGE_HOURS.
+
+    Example:
+        with JobWorkspace() as workspace:
+            chunk_path = workspace.path("chunk_0.mp3")
+    """
+
+    def __init__(self, job_id: Optional[str] = None, root: str = WORKSPACE_DIR):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.root = root
+        self.dir = os.path.join(root, self.job_id)
+        ensure_directory(self.dir)
+        self.touch()
+        start_garbage_collector()
+
+    def __enter__(self) -> 'JobWorkspace':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.cleanup()
+
+    def path(self, name: str) -> str:
+        """Path of a file inside the workspace."""
+        self.touch()
+        return os.path.join(self.dir, name)
+
+    def touch(self) -> None:
+        """Record that the job is still alive."""
+        try:
+            with open(os.path.join(self.dir, _HEARTBEAT), 'a'):
+                pass
+            os.utime(os.path.join(self.dir, _HEARTBEAT), None)
+        except OSError:
+            pass
+
+    def output_path(self, extension: str, output_dir: str = OUTPUT_DIR) -> str:
+        """Path of this job's finished output, outside the workspace."""
+        return output_path_for(self.job_id, extension, output_dir)
+
+    def cleanup(self) -> None:
+        """Remove the workspace and everything in it."""
+        _remove_atomically(self.dir)
+
+def output_path_for(job_id: str, extension: str, output_dir: str = OUTPUT_DIR) -> str:
+    """Path of a job's finished output."""
+    ensure_directory(output_dir)
+    return os.path.join(output_dir, f"podcast_{job_id}.{extension}")
+
+def _remove_atomically(path: str) -> None:
+    """Rename a directory out of the way, then delete it."""
+    parent, name = os.path.split(path)
+    trash = os.path.join(parent, f"{_TRASH_PREFIX}{name}-{uuid.uuid4().hex[:8]}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        # Already removed (or never created)
+        return
+    shutil.rmtree(trash, ignore_errors=True)
+
+def _age_hours(path: str, now: float) -> float:
+    return (now - os.stat(path).st_mtime) / 3600
+
+def _playlist_segments(playlist_path: str) -> Set[str]:
+    """Paths of the files an m3u8 playlist refers to."""
+    directory = os.path.dirname(playlist_path)
+    with open(playlist_path, 'r', encoding='utf-8') as f:
+        return {os.path.normpath(os.path.join(directory, line.strip())) for line in f
+                if line.strip() and not line.startswith('#')}
+
+def collect_garbage(root: str = WORKSPACE_DIR, output_dir: str = OUTPUT_DIR,
+                    max_age_hours: float = WORKSPACE_MAX_AGE_HOURS,
+                    output_max_age_hours: float = OUTPUT_MAX_AGE_HOURS) -> int:
+    """
+    Remove abandoned workspaces and expired outputs.
+
+    HLS playlists expire with their segments: a segment is kept as long as
+    a playlist that has not expired refers to it, however old it is.
+
+    Args:
+        root: Directory holding the job workspaces
+        output_dir: Directory holding finished outputs
+        max_age_hours: Age of the last heartbeat after which a workspace is abandoned
+        output_max_age_hours: Age after which a finished output is removed
+
+    Returns:
+        Number of workspaces and outputs removed
+    """
+    now = time.time()
+    removed = 0
+
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        entries = []
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        if entry.name.startswith(_TRASH_PREFIX):
+            # Left behind by a cleanup that was interrupted
+            shutil.rmtree(entry.path, ignore_errors=True)
+            continue
+        try:
+            heartbeat = os.path.join(entry.path, _HEARTBEAT)
+            age = _age_hours(heartbeat if os.path.exists(heartbeat) else entry.path, now)
+        except OSError:
+            continue
+        if age > max_age_hours:
+            _remove_atomically(entry.path)
+            removed += 1
+
+    for dirpath, _, filenames in os.walk(output_dir):
+        in_use: Set[str] = set()
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                if filename.endswith('.m3u8') and _age_hours(path, now) <= output_max_age_hours:
+                    in_use |= _playlist_segments(path)
+            except OSError:
+                continue
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.normpath(path) in in_use:
+                continue
+            try:
+                if _age_hours(path, now) > output_max_age_hours:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+
+    return removed
+
+_collector: Optional[threading.Thread] = None
+_collector_lock = threading.Lock()
+
+def start_garbage_collector(interval_seconds: float = WORKSPACE_GC_INTERVAL_SECONDS) -> None:
+    """Run collect_garbage periodically in a daemon thread (once per process)."""
+    global _collector
+    with _collector_lock:
+        if _collector is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    collect_garbage()
+                except Exception as e:
+                    print(f"Error collecting job workspaces: {e}")
+                time.sleep(interval_seconds)
+
+        _collector = threading.Thread(target=run, name='workspace-gc', daemon=True)
+        _collector.start()